@@ -1,4 +1,30 @@
 import streamlit as st
+from core.registry import registry, start_warmup
+
+# 공유 자원(spaCy, Chat 모델, HTTP 세션)을 백그라운드에서 미리 로드
+start_warmup()
 
 st.title("메인 페이지")
 st.write("이곳은 메인 앱입니다.")
+
+# 자원 로드 현황 (최초 로드 시간과 이후 요청의 대기 시간 비교)
+with st.expander("공유 자원 로드 현황"):
+    resource_stats = registry.stats()
+    if resource_stats:
+        st.dataframe(
+            [
+                {
+                    "자원": stats["name"],
+                    "상태": stats["status"],
+                    "최초 로드(초)": stats["load_seconds"],
+                    "사용 횟수": stats["hits"],
+                    "마지막 대기(초)": stats["last_wait_seconds"],
+                    "오류": stats["error"],
+                }
+                for stats in resource_stats
+            ],
+            use_container_width=True,
+        )
+    else:
+        st.write("아직 로드된 자원이 없습니다.")
+    st.button("새로고침")
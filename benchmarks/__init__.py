@@ -0,0 +1 @@
+"""DT_LAB 성능 측정 스크립트 모음입니다."""
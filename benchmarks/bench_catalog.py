@@ -0,0 +1,109 @@
+"""
+역량 카탈로그 크기에 따른 로드/조회 시간을 측정합니다.
+임시 디렉터리에 합성 역량 파일을 만들어 카탈로그 크기별로 비교합니다.
+- 첫 로드: 카탈로그를 만들고 역량 코드 목록과 역량 하나를 읽는 시간 (페이지 첫 실행)
+- 역량 전환: 아직 읽지 않은 역량 하나를 찾는 시간 (페이지에서 역량을 바꿀 때)
+- 재조회: 이미 읽은 역량을 다시 찾는 시간 (재실행)
+- 요인 검색: find(factor=...) 첫 호출(색인 생성)과 이후 호출 시간
+
+실행 예: python -m benchmarks.bench_catalog --sizes 10 100 1000 5000
+"""
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from core.catalog import CompetencyCatalog, card_image, get_competency
+
+
+def write_catalog(directory, size, seed=0):
+    """
+    합성 역량 파일 size개를 만듭니다 (요인묶음 10개, 대요인 5개에 나누어 배정).
+    """
+    rng = random.Random(seed)
+    template = get_competency("P4-3-1").to_dict()
+    for i in range(size):
+        code = f"P{i // 100}-{(i // 10) % 10}-{i % 10}"
+        entry = {
+            **template,
+            "code": code,
+            "id": i % 10,
+            "factor": f"대요인 {i % 5}",
+            "sub_factor": f"중요인 {i}",
+            "learning_object": template["learning_object"] + f" ({rng.random():.6f})",
+        }
+        with open(Path(directory) / f"{code}.json", "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+
+
+def measure(directory, samples=200):
+    """
+    카탈로그 하나의 로드/조회 시간(ms)을 측정합니다.
+    """
+    started = time.perf_counter()
+    catalog = CompetencyCatalog(directory)
+    codes = catalog.codes()
+    catalog.get(codes[0])
+    first_load = time.perf_counter() - started
+
+    switch, lookup = [], []
+    for code in random.Random(1).sample(codes, min(samples, len(codes))):
+        started = time.perf_counter()
+        catalog.get(code)
+        switch.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        catalog.get(code)
+        lookup.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    catalog.find(factor="대요인 1")
+    index_build = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(100):
+        catalog.find(factor="대요인 2", id=2)
+    search = (time.perf_counter() - started) / 100
+
+    return {
+        "first_load_ms": first_load * 1000,
+        "switch_ms": statistics.mean(switch) * 1000,
+        "lookup_us": statistics.mean(lookup) * 1e6,
+        "index_build_ms": index_build * 1000,
+        "search_ms": search * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="역량 카탈로그 로드/조회 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000], help="카탈로그 크기 목록")
+    args = parser.parse_args()
+
+    print(f"{'역량 수':>8}{'첫 로드(ms)':>14}{'역량 전환(ms)':>15}{'재조회(us)':>12}{'색인 생성(ms)':>15}{'요인 검색(ms)':>15}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            write_catalog(directory, size)
+            result = measure(directory)
+        print(
+            f"{size:>8}{result['first_load_ms']:>14.2f}{result['switch_ms']:>15.3f}{result['lookup_us']:>12.2f}"
+            f"{result['index_build_ms']:>15.1f}{result['search_ms']:>15.3f}"
+        )
+
+    # 카드 이미지: 첫 표시(읽기 + 크기 조정)와 이후 표시
+    competency = get_competency("P4-3-1")
+    started = time.perf_counter()
+    image = card_image(competency)
+    first = time.perf_counter() - started
+    started = time.perf_counter()
+    card_image(competency)
+    cached = time.perf_counter() - started
+    original = competency.image_path.stat().st_size
+    print(
+        f"카드 이미지: 첫 표시 {first * 1000:.1f}ms, 이후 {cached * 1e6:.1f}us / "
+        f"{original / 1024:.0f}KB → {len(image) / 1024:.0f}KB"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+근사 중복 색인(core.dedup.DuplicateIndex)의 조회 시간과 재현율을 측정합니다.
+
+실행 예: python -m benchmarks.bench_dedup --items 100000 --queries 2000
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from core.dedup import DuplicateIndex
+
+
+_SUBJECTS = ["데이터 분석팀", "인사팀", "마케팅팀", "DT 전략 기획팀", "진단평가팀", "사업팀", "교육 컨설팅 팀"]
+_SYLLABLES = "가나다라마바사아자차카타파하거너더러머버서어저처커터퍼허고노도로모보소오조초코토포호구누두루무부수우주추"
+
+
+def _make_vocabulary(size, seed=0):
+    # 실제 문항처럼 어휘가 다양하도록 2~4음절 단어를 무작위로 생성
+    rng = random.Random(seed)
+    return ["".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(size)]
+
+
+_WORDS = _make_vocabulary(5000)
+
+
+def make_question(rng):
+    """
+    서로 겹치지 않는 무작위 문항 텍스트를 만듭니다.
+    """
+    words = rng.sample(_WORDS, 12)
+    body = " ".join(words)
+    options = "\n".join(f"선지 {i}) " + " ".join(rng.sample(_WORDS, 5)) for i in range(1, 5))
+    return f"{rng.choice(_SUBJECTS)}은 {body} 과제를 진행한다. 다음 중 가장 적절한 것은?\n{options}"
+
+
+def near_duplicate(text, rng):
+    """
+    일부 글자만 바꾼 근사 중복 문항을 만듭니다.
+    """
+    chars = list(text)
+    for _ in range(max(1, len(chars) // 60)):
+        chars[rng.randrange(len(chars))] = " "
+    return "".join(chars) + " 다음 중"
+
+
+def percentile_ms(samples, q):
+    return float(np.percentile(samples, q)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="근사 중복 색인 벤치마크")
+    parser.add_argument("--items", type=int, default=100000, help="색인에 넣을 문항 수")
+    parser.add_argument("--queries", type=int, default=2000, help="조회 횟수")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    texts = [make_question(rng) for _ in range(args.items)]
+
+    index = DuplicateIndex()
+    started = time.perf_counter()
+    for i, text in enumerate(texts):
+        index.add(i, text)
+    build_seconds = time.perf_counter() - started
+    print(f"색인 구축: {args.items}개 {build_seconds:.1f}초 ({build_seconds / args.items * 1e6:.0f}µs/개)")
+
+    # 절반은 저장된 문항의 근사 중복, 절반은 새 문항으로 조회
+    targets = [rng.randrange(args.items) for _ in range(args.queries // 2)]
+    duplicate_queries = [(near_duplicate(texts[i], rng), i) for i in targets]
+    fresh_queries = [(make_question(rng), None) for _ in range(args.queries - len(duplicate_queries))]
+
+    timings, found, false_hits = [], 0, 0
+    for text, expected in duplicate_queries + fresh_queries:
+        started = time.perf_counter()
+        matches = index.query(text)
+        timings.append(time.perf_counter() - started)
+        ids = [match["id"] for match in matches]
+        if expected is not None and expected in ids:
+            found += 1
+        elif expected is None and ids:
+            false_hits += 1
+
+    print(
+        f"조회: 평균 {np.mean(timings) * 1000:.3f}ms / p50 {percentile_ms(timings, 50):.3f}ms / "
+        f"p99 {percentile_ms(timings, 99):.3f}ms"
+    )
+    print(
+        f"근사 중복 검출률 {found / len(duplicate_queries):.1%}, "
+        f"새 문항 오검출률 {false_hits / max(1, len(fresh_queries)):.1%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
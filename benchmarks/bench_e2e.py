@@ -0,0 +1,392 @@
+"""
+로컬 대체 서버(core.standins)로 세 페이지의 주요 흐름을 네트워크 없이 끝까지 실행해 성능 회귀를 확인합니다.
+- ingest-<N>p (Pn-1): 합성 교안 PDF(N페이지) 업로드 → PDF 처리 작업 → 캐시 조회 → 키워드 가중치 → 결과 표
+- question (P4-3-1): 직무 키워드 → 뉴스 검색 → 뉴스 키워드 요약 → 교안 검색 → 문항 생성 작업 → 구역 분리/중복 검사
+- passage (P4-1-1): 교안 검색 → 지문 생성 작업
+모델은 Chat Completions 대체 서버(지연/생성 속도 지정), 뉴스는 DeepSearch 대체 서버가 응답하며 둘 다 결정적입니다.
+문항/지문 흐름은 세션 여러 개가 동시에 반복합니다. 흐름별 응답 시간 백분위수, 처리량(흐름/초),
+최대 메모리(tracemalloc 기준 전체/흐름 중 증가량, PDF 처리 프로세스 풀은 제외)를 출력하고 저장된 기준값과 비교합니다.
+캐시/저장소/작업 대기열은 모두 임시 디렉터리를 사용하므로 매 실행이 빈 캐시에서 시작합니다.
+작업 진행 상황은 --poll-seconds 간격으로 확인합니다 (페이지는 0.5~1초 간격이므로 화면 표시는 그만큼 늦을 수 있음).
+
+실행 예: python -m benchmarks.bench_e2e
+기준값 갱신: python -m benchmarks.bench_e2e --save-baseline
+기준값은 측정한 기계에 따라 다르므로 같은 기계에서 기록한 값과 비교하세요.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.synthetic_pdf import make_lecture_pdf
+from core.standins.chat import chat_standin
+from core.standins.deepsearch import deepsearch_standin
+
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baselines" / "e2e.json"
+
+# pages/Pn-1.py와 같은 분할기 설정 (spaCy 모델 내려받기 없이 실행하도록 기본 파이프라인은 sentencizer)
+CHUNK_SIZE = 350
+
+QUESTION_COMPETENCY = "P4-3-1"
+PASSAGE_COMPETENCY = "P4-1-1"
+
+ROLES = [
+    "고객 문의 데이터를 분석해 상담 품질을 개선하는 업무",
+    "사내 문서를 정리해 LLM 학습 데이터를 구축하는 업무",
+    "생산 설비 점검 보고서를 작성하고 관리하는 업무",
+    "채용 공고 작성과 지원자 서류 검토 업무",
+]
+
+# 대체 서버가 요청 한도를 두지 않으므로 속도 제한이 측정을 막지 않도록 넉넉한 한도 사용
+BENCH_LLM_LIMITS = "gpt-4=100000:100000000,gpt-4-turbo=100000:100000000"
+
+
+def configure_environment(directory, chat_url, news_url, llm_limits):
+    """
+    캐시/저장소/작업 대기열 경로와 외부 API 주소를 대체 서버와 임시 디렉터리로 바꿉니다.
+    core 모듈은 import 시점에 이 값을 읽으므로 core를 불러오기 전에 호출해야 합니다.
+    """
+    os.environ.update({
+        "DTLAB_CACHE_DIR": str(Path(directory) / "cache"),
+        "DTLAB_QUESTION_DB": str(Path(directory) / "questions.sqlite3"),
+        "DTLAB_LLM_LIMITS": llm_limits,
+        "DEEPSEARCH_BASE_URL": news_url,
+        "DEEPSEARCH_API_KEY": "standin",
+        "OPENAI_API_BASE": f"{chat_url}/v1",
+        "OPENAI_API_KEY": "standin",
+    })
+
+
+def wait_for_job(job_id, poll_seconds):
+    """
+    작업이 끝날 때까지 기다린 뒤 작업 정보를 반환합니다.
+    """
+    from core.jobs import FINISHED_STATUSES, job_queue
+
+    while True:
+        job = job_queue().get(job_id)
+        if job["status"] in FINISHED_STATUSES:
+            return job
+        time.sleep(poll_seconds)
+
+
+def ingest_flow(pdf_path, args):
+    """
+    Pn-1 페이지의 업로드 처리: 작업 제출 → 완료 대기 → 캐시 조회 → 검색 색인 → 가중치 → 결과 표
+    반환값: 단계별 소요 시간 (초)
+    """
+    from core.jobs import job_queue
+    from core.pdf_cache import PdfCache, make_cache_key
+    from core.pdf_pipeline import DEFAULT_WORKERS, reweight
+    from core.results_view import results_table
+    from core.retrieval import retrieval_index
+
+    stages = {}
+    started = time.perf_counter()
+    pdf_bytes = pdf_path.read_bytes()
+    cache_key = make_cache_key(pdf_bytes, chunk_size=CHUNK_SIZE, pipeline=args.pipeline)
+    job_id = job_queue().submit("pdf", {
+        "cache_key": cache_key,
+        "source": pdf_path.name,
+        "chunk_size": CHUNK_SIZE,
+        "pipeline": args.pipeline,
+        "workers": DEFAULT_WORKERS,
+    }, dedupe_key=cache_key, input=(f"{cache_key}.pdf", pdf_bytes))
+    job = wait_for_job(job_id, args.poll_seconds)
+    if job["status"] != "done":
+        raise RuntimeError(f"PDF 처리 작업 실패: {job['status']} {job.get('error')}")
+    stages["처리"] = time.perf_counter() - started
+
+    stage_started = time.perf_counter()
+    result = PdfCache().get(cache_key)
+    index = retrieval_index()
+    if cache_key not in index:
+        index.add_document(cache_key, pdf_path.name, result["chunks"])
+    results_table(reweight(result, "count"))
+    stages["결과 표시"] = time.perf_counter() - stage_started
+    return stages
+
+
+def question_flow(session, iteration, args):
+    """
+    P4-3-1 흐름: 키워드/뉴스 파이프라인 → 교안 검색 → 문항 생성 작업 → 구역 분리/중복 검사
+    반환값: 단계별 소요 시간 (초)
+    """
+    from core.catalog import get_competency
+    from core.dedup import duplicate_index, question_text
+    from core.jobs import job_queue
+    from core.news_pipeline import run_keyword_news_pipeline
+    from core.question_parser import parse_structured
+    from core.question_prompts import companies, departments, difficulties
+    from core.ratelimit import rate_limit_session
+    from core.retrieval import retrieve_context
+
+    competency = get_competency(QUESTION_COMPETENCY)
+    # 세션/반복마다 입력을 바꿔 모델/뉴스 캐시에 걸리지 않게 함
+    role = f"{ROLES[(session + iteration) % len(ROLES)]} {session}{iteration}차"
+    stages = {}
+
+    started = time.perf_counter()
+    with rate_limit_session(f"session-{session}"):
+        pipeline_result = asyncio.run(run_keyword_news_pipeline(role))
+    topic = pipeline_result["news_keywords"] or " OR ".join(f'"{kw}"' for kw in pipeline_result["role_keywords"])
+    stages["키워드/뉴스"] = time.perf_counter() - started
+
+    stage_started = time.perf_counter()
+    context, _ = retrieve_context(f"{topic} {competency.sub_factor}")
+    job_id = job_queue().submit("question", {
+        "company": companies[session % len(companies)],
+        "department": departments[iteration % len(departments)],
+        "topic": topic,
+        "difficulty": difficulties[iteration % len(difficulties)],
+        "competency": competency.code,
+        "context": context,
+        "bypass_cache": False,
+    }, owner=f"session-{session}")
+    job = wait_for_job(job_id, args.poll_seconds)
+    if job["status"] != "done":
+        raise RuntimeError(f"문항 생성 작업 실패: {job['status']} {job.get('error')}")
+    stages["생성"] = time.perf_counter() - stage_started
+
+    stage_started = time.perf_counter()
+    parsed = parse_structured(job["result"]["text"])
+    duplicate_index().query(question_text(parsed.to_dict()))
+    if not parsed.is_valid:
+        raise RuntimeError(f"문항 형식 오류: {parsed.problems()}")
+    # 대체 서버의 해설은 항상 정답 문장으로 끝나므로, 이 문장이 없으면 여러 문단 해설이 중간에 잘린 것
+    if f"따라서 정답은 {parsed.answer}번입니다." not in parsed.explanation:
+        raise RuntimeError(f"해설이 중간에 잘렸습니다 (max_tokens {job['result']['timing']['max_tokens']})")
+    stages["검수 준비"] = time.perf_counter() - stage_started
+    return stages
+
+
+def passage_flow(session, iteration, args):
+    """
+    P4-1-1 흐름: 교안 검색 → 지문 생성 작업
+    반환값: 단계별 소요 시간 (초)
+    """
+    from core.catalog import get_competency
+    from core.jobs import job_queue
+    from core.passage_prompts import build_passage_input, companies, departments
+    from core.retrieval import retrieve_context
+
+    competency = get_competency(PASSAGE_COMPETENCY)
+    role = f"{ROLES[(session + iteration) % len(ROLES)]} {session}{iteration}차"
+    started = time.perf_counter()
+    context, _ = retrieve_context(f"{role} {competency.sub_factor}")
+    job_id = job_queue().submit("passage", {
+        "user_input": build_passage_input(
+            companies[session % len(companies)], departments[iteration % len(departments)], role, competency.code
+        ),
+        "competency": competency.code,
+        "context": context,
+        "bypass_cache": False,
+    }, owner=f"session-{session}")
+    job = wait_for_job(job_id, args.poll_seconds)
+    if job["status"] != "done":
+        raise RuntimeError(f"지문 생성 작업 실패: {job['status']} {job.get('error')}")
+    return {"생성": time.perf_counter() - started}
+
+
+def measure(name, runs):
+    """
+    흐름 실행 목록을 실행하고 응답 시간, 처리량, 최대 메모리를 반환합니다.
+    - runs: 세션별 [인자 없이 호출하면 단계별 소요 시간을 반환하는 함수 목록] (세션끼리는 동시에 실행)
+    """
+    latencies, stage_samples, errors = [], {}, []
+    lock = threading.Lock()
+
+    def session_worker(calls):
+        for call in calls:
+            started = time.perf_counter()
+            try:
+                stages = call()
+            except Exception as e:
+                with lock:
+                    errors.append(str(e))
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - started)
+                for stage, seconds in stages.items():
+                    stage_samples.setdefault(stage, []).append(seconds)
+
+    tracemalloc.reset_peak()
+    start_memory = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    threads = [threading.Thread(target=session_worker, args=(calls,)) for calls in runs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+
+    percentiles = np.percentile(latencies, [50, 95, 99]) if latencies else [float("nan")] * 3
+    return {
+        "flow": name,
+        "runs": len(latencies),
+        "errors": errors,
+        "p50": float(percentiles[0]),
+        "p95": float(percentiles[1]),
+        "p99": float(percentiles[2]),
+        "throughput": len(latencies) / elapsed,
+        "peak_mb": peak / 2 ** 20,
+        "growth_mb": (peak - start_memory) / 2 ** 20,
+        "stages": {stage: float(np.median(samples)) for stage, samples in stage_samples.items()},
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    기준값과 비교해 흐름별 변화율과 회귀 여부를 반환합니다.
+    응답 시간 p95/최대 메모리가 tolerance보다 늘거나 처리량이 tolerance보다 줄면 회귀로 봅니다.
+    """
+    rows = []
+    for result in results:
+        base = baseline["flows"].get(result["flow"])
+        if base is None:
+            continue
+        changes = {
+            "p95": result["p95"] / base["p95"] - 1,
+            "throughput": result["throughput"] / base["throughput"] - 1,
+            "peak_mb": result["peak_mb"] / base["peak_mb"] - 1,
+        }
+        regressed = [
+            metric for metric, change in changes.items()
+            if (change < -tolerance if metric == "throughput" else change > tolerance)
+        ]
+        rows.append({"flow": result["flow"], "changes": changes, "regressed": regressed})
+    return rows
+
+
+def warm_up(pdf_dir, args):
+    """
+    앱 시작 시와 같이 공유 자원을 미리 불러오고 흐름마다 한 번씩 실행합니다 (측정에서 제외).
+    """
+    from core.registry import start_warmup
+
+    start_warmup().join()
+    path = pdf_dir / "warmup.pdf"
+    make_lecture_pdf(str(path), pages=1, seed=-1)
+    ingest_flow(path, args)
+    question_flow(-1, 0, args)
+    passage_flow(-1, 0, args)
+
+
+def run_suite(args):
+    """
+    흐름 전체를 순서대로 측정합니다 (교안을 먼저 처리해 문항/지문 흐름에서 교안 검색이 동작하도록 함).
+    """
+    from core.jobs import job_queue
+
+    results = []
+    pdf_dir = Path(args.workdir) / "pdfs"
+    pdf_dir.mkdir()
+    warm_up(pdf_dir, args)
+    for pages in args.pdf_pages:
+        pdfs = []
+        for repeat in range(args.pdf_repeats):
+            # 매번 다른 파일을 올려 처리 캐시에 걸리지 않게 함
+            path = pdf_dir / f"lecture_{pages}p_{repeat}.pdf"
+            make_lecture_pdf(str(path), pages=pages, seed=pages * 1000 + repeat)
+            pdfs.append(path)
+        results.append(measure(f"ingest-{pages}p", [[lambda path=path: ingest_flow(path, args) for path in pdfs]]))
+
+    for name, flow in (("question", question_flow), ("passage", passage_flow)):
+        runs = [
+            [lambda session=session, iteration=iteration: flow(session, iteration, args)
+             for iteration in range(args.iterations)]
+            for session in range(args.sessions)
+        ]
+        results.append(measure(name, runs))
+    job_queue().stop()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대체 서버를 사용한 페이지 흐름 종단 간 벤치마크")
+    parser.add_argument("--pdf-pages", type=int, nargs="+", default=[5, 20, 60], help="합성 교안 PDF 페이지 수")
+    parser.add_argument("--pdf-repeats", type=int, default=3, help="PDF 크기별 업로드 횟수")
+    parser.add_argument("--pipeline", default="sentencizer", help="spaCy 파이프라인 (페이지 기본값: ko_core_news_sm)")
+    parser.add_argument("--sessions", type=int, default=4, help="문항/지문 흐름을 동시에 실행할 세션 수")
+    parser.add_argument("--iterations", type=int, default=5, help="세션별 반복 횟수")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="모델 대체 서버의 첫 토큰까지 지연 (초)")
+    parser.add_argument("--tokens-per-second", type=float, default=200, help="모델 대체 서버의 생성 속도 (토큰/초)")
+    parser.add_argument("--news-latency", type=float, default=0.2, help="뉴스 대체 서버의 응답 지연 (초)")
+    parser.add_argument("--poll-seconds", type=float, default=0.05, help="작업 진행 상황 확인 간격 (초)")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="기준값 JSON 파일")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준값으로 저장")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="회귀로 판단할 변화율 (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    config = {
+        key: getattr(args, key) for key in (
+            "pdf_pages", "pdf_repeats", "pipeline", "sessions", "iterations",
+            "llm_latency", "tokens_per_second", "news_latency", "poll_seconds",
+        )
+    }
+    tracemalloc.start()
+    with tempfile.TemporaryDirectory() as directory, \
+            chat_standin(latency=args.llm_latency, tokens_per_second=args.tokens_per_second) as chat_server, \
+            deepsearch_standin(latency=args.news_latency) as news_server:
+        configure_environment(directory, chat_server.base_url, news_server.base_url, BENCH_LLM_LIMITS)
+        args.workdir = directory
+        results = run_suite(args)
+        llm_requests, news_requests = chat_server.request_count, news_server.request_count
+    tracemalloc.stop()
+
+    print(
+        f"{'흐름':>12}{'실행':>6}{'오류':>6}{'p50/p95/p99(초)':>24}{'처리량(흐름/초)':>16}{'최대 메모리/증가(MB)':>20}"
+    )
+    for result in results:
+        print(
+            f"{result['flow']:>12}{result['runs']:>6}{len(result['errors']):>6}"
+            f"{result['p50']:>10.2f} /{result['p95']:>6.2f} /{result['p99']:>6.2f}"
+            f"{result['throughput']:>16.2f}{result['peak_mb']:>13.1f} /{result['growth_mb']:>5.1f}"
+        )
+        print(" " * 12 + "단계 p50: " + ", ".join(f"{stage} {seconds:.2f}초" for stage, seconds in result["stages"].items()))
+        for error in result["errors"][:3]:
+            print(" " * 12 + f"오류: {error}")
+    print(f"대체 서버 요청: 모델 {llm_requests}회, 뉴스 {news_requests}회")
+
+    regressions = []
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("config") != config:
+            print(f"주의: 기준값과 실행 설정이 다릅니다 (기준값 설정: {baseline.get('config')})")
+        print(f"\n기준값 비교 ({args.baseline.name}, 허용 변화율 {args.tolerance:.0%})")
+        for row in compare(results, baseline, args.tolerance):
+            changes = row["changes"]
+            print(
+                f"{row['flow']:>12}  p95 {changes['p95']:+.1%}  처리량 {changes['throughput']:+.1%}  "
+                f"메모리 {changes['peak_mb']:+.1%}" + (f"  회귀: {', '.join(row['regressed'])}" if row["regressed"] else "")
+            )
+            if row["regressed"]:
+                regressions.append(row["flow"])
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        flows = {
+            result["flow"]: {key: round(result[key], 4) for key in ("p50", "p95", "p99", "throughput", "peak_mb", "growth_mb")}
+            for result in results
+        }
+        args.baseline.write_text(
+            json.dumps({"config": config, "flows": flows}, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+        )
+        print(f"기준값을 저장했습니다: {args.baseline}")
+
+    if regressions or any(result["errors"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+문항 생성의 조기 종료(정지 시퀀스 + 스트리밍 완료 감지)와 학습한 max_tokens 상한의 효과를 측정합니다.
+openai.ChatCompletion.create를 모의 스트리밍 모델로 바꿔 실행하므로 네트워크가 필요 없습니다.
+모의 모델은 문항([질문]~해설)을 쓴 뒤 일부 응답에서 few-shot 형식을 이어 다음 예제("Input: ...")나
+덧붙이는 설명을 계속 생성하며, stop과 max_tokens를 OpenAI와 같은 방식으로 따릅니다.
+- baseline: 기존 방식 (난이도와 상관없이 max_tokens=1500, 정지 조건 없음)
+- static: 프롬프트의 난이도별 기본 max_tokens + 정지 시퀀스 + 완료 감지
+- learned: 저장된 문항으로 학습한 max_tokens + 정지 시퀀스 + 완료 감지 (stream_question과 같은 경로)
+출력: 난이도별 평균 응답 토큰 수, 요청 시 예약한 토큰 수(프롬프트 + max_tokens), 응답 시간, 형식이 올바른 비율,
+문항을 해설 끝까지 받은 비율 (여러 문단 해설이 잘리지 않았는지)
+
+실행 예: python -m benchmarks.bench_early_stop --requests 30 --tokens-per-second 60
+"""
+import argparse
+import random
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+import openai
+
+from core.generation import (
+    QUESTION_MAX_TOKENS, QUESTION_MODEL, QUESTION_STOP, QUESTION_TEMPERATURE, question_end_detector, stream_question,
+)
+from core.llm import ChatStream
+from core.llm_cache import LlmCache
+from core.question_parser import parse_structured
+from core.question_prompts import build_question_messages, companies, departments
+from core.question_store import QuestionStore
+from core.ratelimit import RateLimiter
+from core.registry import registry
+from core.standins.chat import fake_explanation, split_tokens
+from core.token_caps import TokenCaps
+
+
+COMPETENCY = "P4-3-1"
+DIFFICULTIES = ("하", "중", "상")
+
+# 난이도별 모의 문항 길이 (상황 설명 문장 수, 해설 문장 수)
+QUESTION_SHAPES = {"하": (2, 2), "중": (4, 3), "상": (6, 4)}
+
+# 문항 뒤에 이어 생성하는 텍스트 (few-shot 예제 형식, 다음 문항, 덧붙이는 설명)
+TRAILING_TEXTS = (
+    "\n\nInput: {topic}에 대한 다른 문항을 만들어 주세요.\nOutput: [질문]\n",
+    "\n\n[질문]\n{topic}와 관련된 다음 상황을 읽고 물음에 답하시오.\n",
+    "\n\n참고로 이 문항은 {topic}의 실무 적용 능력을 평가하기 위해 작성되었습니다. ",
+)
+
+# 요청과 저장된 문항의 주제 (같은 길이여야 학습한 상한이 요청 응답 길이와 맞음)
+SEED_TOPIC = "LLM 학습 데이터 품질 관리"
+
+SENTENCE = "{topic} 업무를 담당하는 직원이 데이터 품질 문제를 발견하고 원인을 분석하는 상황입니다."
+
+
+def mock_question(topic, difficulty, rng):
+    """
+    난이도에 맞는 길이의 모의 문항 원문을 만듭니다.
+    """
+    situation, explanation = QUESTION_SHAPES[difficulty]
+    sentences = lambda count: " ".join(SENTENCE.format(topic=topic) for _ in range(count + rng.randint(0, 2)))
+    options = "\n".join(f"선지 {i}) {topic}의 {i}번째 처리 방안을 적용한다." for i in range(1, 5))
+    answer = rng.randint(1, 4)
+    # 해설은 여러 문단일 수 있음 (core.standins.chat과 같은 형식)
+    return (
+        f"[질문]\n{sentences(situation)}\n가장 적절한 조치는 무엇인가?\n[선지]\n{options}\n\n"
+        f"[정답 및 해설]\n정답) {answer}\n해설) {sentences(explanation)}\n\n{fake_explanation(topic, answer, rng)}"
+    )
+
+
+class MockModel:
+    """
+    openai.ChatCompletion.create(stream=True)를 흉내 내는 모의 모델입니다.
+    같은 요청(request: 주제, 난이도)에는 같은 응답을 만들어 방식별로 같은 출력을 비교합니다.
+    - first_token_seconds: 첫 토큰까지의 지연 (초)
+    - tokens_per_second: 응답 생성 속도
+    - trailing_rate: 문항 뒤에 텍스트를 이어 생성하는 응답의 비율
+    """
+
+    def __init__(self, first_token_seconds, tokens_per_second, trailing_rate):
+        self.first_token_seconds = first_token_seconds
+        self.tokens_per_second = tokens_per_second
+        self.trailing_rate = trailing_rate
+        self.request = None
+        self.question = None
+
+    def response_text(self):
+        topic, difficulty = self.request
+        rng = random.Random(zlib.crc32(f"{topic}:{difficulty}".encode("utf-8")))
+        text = self.question = mock_question(topic, difficulty, rng)
+        if rng.random() < self.trailing_rate:
+            trailing = rng.choice(TRAILING_TEXTS).format(topic=topic)
+            # 상한에 걸릴 때까지 이어 쓰는 응답을 흉내 냄
+            text += trailing + mock_question(topic, difficulty, rng) * 4
+        return text
+
+    def create(self, model, messages, stream=False, max_tokens=None, stop=None, **params):
+        text = self.response_text()
+        for sequence in stop or ():
+            position = text.find(sequence)
+            if position >= 0:
+                text = text[:position]
+        tokens = split_tokens(text)[:max_tokens]
+
+        def _chunks():
+            time.sleep(self.first_token_seconds)
+            for token in tokens:
+                yield {"choices": [{"delta": {"content": token}}]}
+                time.sleep(1 / self.tokens_per_second)
+
+        return _chunks()
+
+
+def seed_store(store, samples, rng):
+    """
+    난이도별로 모의 문항을 저장해 상한 학습에 사용할 응답 길이 분포를 만듭니다.
+    """
+    for difficulty in DIFFICULTIES:
+        for i in range(samples):
+            store.save({
+                "page": COMPETENCY, "difficulty": difficulty, "topic": f"{SEED_TOPIC} {i}",
+                "raw": mock_question(f"{SEED_TOPIC} {i}", difficulty, rng),
+            })
+
+
+def run_variant(variant, model, requests):
+    """
+    한 가지 방식으로 요청을 실행하고 난이도별 결과를 반환합니다.
+    """
+    results = {difficulty: [] for difficulty in DIFFICULTIES}
+    for company, department, topic, difficulty in requests:
+        model.request = (topic, difficulty)
+        messages, default_max_tokens = build_question_messages(
+            company, department, topic, difficulty, competency=COMPETENCY
+        )
+        if variant == "baseline":
+            stream = ChatStream(
+                QUESTION_MODEL, messages, bypass_cache=True,
+                temperature=QUESTION_TEMPERATURE, max_tokens=QUESTION_MAX_TOKENS,
+            )
+        elif variant == "static":
+            stream = ChatStream(
+                QUESTION_MODEL, messages, bypass_cache=True, stop_when=question_end_detector(),
+                temperature=QUESTION_TEMPERATURE, max_tokens=default_max_tokens, stop=list(QUESTION_STOP),
+            )
+        else:
+            stream = stream_question(company, department, topic, difficulty, bypass_cache=True, competency=COMPETENCY)
+        for _ in stream:
+            pass
+        max_tokens = stream.params["max_tokens"]
+        results[difficulty].append({
+            "completion_tokens": stream.completion_tokens,
+            "reserved_tokens": stream.prompt_tokens + max_tokens,
+            "max_tokens": max_tokens,
+            "seconds": stream.total_seconds,
+            "valid": parse_structured(stream.text).is_valid,
+            # 뒤쪽 텍스트만 잘라내고 문항(여러 문단 해설 포함)은 끝까지 받았는지
+            "complete": stream.text.startswith(model.question),
+            "stopped_early": stream.stopped_early,
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="문항 생성 조기 종료 / max_tokens 상한 벤치마크")
+    parser.add_argument("--requests", type=int, default=30, help="난이도별 요청 수")
+    parser.add_argument("--samples", type=int, default=60, help="상한 학습용으로 저장할 난이도별 문항 수")
+    parser.add_argument("--first-token-seconds", type=float, default=0.3, help="첫 토큰까지의 지연 (초)")
+    parser.add_argument("--tokens-per-second", type=float, default=60, help="응답 생성 속도 (토큰/초)")
+    parser.add_argument("--trailing-rate", type=float, default=0.5, help="문항 뒤에 텍스트를 이어 생성하는 응답의 비율")
+    parser.add_argument("--variants", nargs="+", default=["baseline", "static", "learned"], help="실행할 방식")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    model = MockModel(args.first_token_seconds, args.tokens_per_second, args.trailing_rate)
+    openai.ChatCompletion.create = model.create
+
+    with tempfile.TemporaryDirectory() as directory:
+        # 캐시, 속도 제한, 문항 저장소를 벤치마크 전용으로 교체
+        registry.register("llm_cache", lambda: LlmCache(Path(directory) / "llm_cache.sqlite3"))
+        registry.register(f"rate_limiter:{QUESTION_MODEL}", lambda: RateLimiter(100000, 100000000))
+        store = QuestionStore(Path(directory) / "questions.sqlite3")
+        seed_store(store, args.samples, rng)
+        caps = TokenCaps(store, QUESTION_MODEL)
+        caps.refresh()
+        registry.register("token_caps", lambda: caps)
+
+        combos = [(c, d) for d in departments for c in companies]
+        requests = [
+            (*combos[i % len(combos)], f"{SEED_TOPIC} {1000 + i}", difficulty)
+            for difficulty in DIFFICULTIES for i in range(args.requests)
+        ]
+
+        print("학습한 상한: " + ", ".join(
+            f"{difficulty} {caps.cap(COMPETENCY, difficulty, None)} "
+            f"(p50 {summary['p50']:.0f} / p99 {summary['p99']:.0f}토큰)"
+            for (_, difficulty), summary in sorted(caps.summary().items(), key=lambda item: DIFFICULTIES.index(item[0][1]))
+        ))
+        print(
+            f"{'방식':>9}{'난이도':>5}{'max_tokens':>12}{'응답 토큰':>10}{'예약 토큰':>10}"
+            f"{'응답 시간 p50/p95(초)':>22}{'조기 종료':>9}{'형식 정상':>9}{'해설 완전':>9}"
+        )
+        totals = {}
+        for variant in args.variants:
+            results = run_variant(variant, model, requests)
+            for difficulty, rows in results.items():
+                seconds = np.percentile([row["seconds"] for row in rows], [50, 95])
+                print(
+                    f"{variant:>9}{difficulty:>5}{np.mean([row['max_tokens'] for row in rows]):>12.0f}"
+                    f"{np.mean([row['completion_tokens'] for row in rows]):>10.0f}"
+                    f"{np.mean([row['reserved_tokens'] for row in rows]):>10.0f}"
+                    f"{seconds[0]:>14.2f} /{seconds[1]:>6.2f}"
+                    f"{np.mean([row['stopped_early'] for row in rows]):>9.0%}"
+                    f"{np.mean([row['valid'] for row in rows]):>9.0%}"
+                    f"{np.mean([row['complete'] for row in rows]):>9.0%}"
+                )
+            rows = [row for rows in results.values() for row in rows]
+            totals[variant] = {
+                key: np.mean([row[key] for row in rows]) for key in ("completion_tokens", "reserved_tokens", "seconds")
+            }
+
+    if "baseline" in totals:
+        base = totals["baseline"]
+        for variant, total in totals.items():
+            if variant == "baseline":
+                continue
+            print(
+                f"{variant}: 문항당 응답 {base['completion_tokens'] - total['completion_tokens']:.0f}토큰 "
+                f"({1 - total['completion_tokens'] / base['completion_tokens']:.0%}), "
+                f"예약 {base['reserved_tokens'] - total['reserved_tokens']:.0f}토큰 "
+                f"({1 - total['reserved_tokens'] / base['reserved_tokens']:.0%}), "
+                f"응답 시간 {base['seconds'] - total['seconds']:.2f}초 "
+                f"({1 - total['seconds'] / base['seconds']:.0%}) 절약"
+            )
+
+
+if __name__ == "__main__":
+    main()
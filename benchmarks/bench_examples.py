@@ -0,0 +1,78 @@
+"""
+few-shot 예제 선택 전후의 문항 생성 프롬프트 토큰 수와 생성 시간을 비교합니다.
+- all: 라이브러리의 모든 예제를 넣던 기존 방식
+- selected: 관련 예제만 토큰 예산 안에서 고르는 방식
+
+실행 예: python -m benchmarks.bench_examples
+생성 시간까지 측정 (모델 호출, 캐시 우회): python -m benchmarks.bench_examples --live 3
+"""
+import argparse
+import statistics
+
+from core.generation import QUESTION_MAX_TOKENS, QUESTION_MODEL, QUESTION_TEMPERATURE
+from core.llm import ChatStream
+from core.question_prompts import build_question_messages, companies, departments
+from core.tokens import count_message_tokens
+
+
+TOPICS = [
+    "LLM 파인튜닝 데이터 전처리",
+    "학습 데이터 레이블링 품질 관리",
+    "프롬프트 엔지니어링과 파인튜닝 비교",
+    "JSONL 학습 데이터 구조 설계",
+    "사내 문서 기반 학습 데이터 수집",
+]
+
+VARIANTS = {"all": None, "selected": 2}
+
+
+def requests_for(count):
+    """
+    벤치마크에 사용할 (기업, 부서, 주제) 조합을 만듭니다.
+    """
+    combos = [(c, d, t) for t in TOPICS for d in departments for c in companies]
+    return combos[:count]
+
+
+def measure_live(messages, samples):
+    # 캐시를 우회해 실제 생성 시간을 측정
+    ttft, total = [], []
+    for _ in range(samples):
+        stream = ChatStream(
+            QUESTION_MODEL, messages, bypass_cache=True,
+            temperature=QUESTION_TEMPERATURE, max_tokens=QUESTION_MAX_TOKENS,
+        )
+        for _ in stream:
+            pass
+        ttft.append(stream.time_to_first_token or 0.0)
+        total.append(stream.total_seconds)
+    return statistics.mean(ttft), statistics.mean(total)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="few-shot 예제 선택 벤치마크")
+    parser.add_argument("--requests", type=int, default=40, help="토큰 수를 비교할 요청 조합 수")
+    parser.add_argument("--difficulty", default="상", help="난이도")
+    parser.add_argument("--live", type=int, default=0, help="변형별 실제 생성 횟수 (0이면 생성 시간 측정 안 함)")
+    args = parser.parse_args()
+
+    combos = requests_for(args.requests)
+    for name, example_count in VARIANTS.items():
+        tokens = [
+            count_message_tokens(
+                build_question_messages(company, department, topic, args.difficulty, example_count=example_count)[0],
+                QUESTION_MODEL,
+            )
+            for company, department, topic in combos
+        ]
+        line = f"{name:>8}: 프롬프트 평균 {statistics.mean(tokens):.0f}토큰 (최소 {min(tokens)}, 최대 {max(tokens)})"
+        if args.live:
+            company, department, topic = combos[0]
+            messages, _ = build_question_messages(company, department, topic, args.difficulty, example_count=example_count)
+            ttft, total = measure_live(messages, args.live)
+            line += f" / 첫 토큰 {ttft:.2f}초, 전체 {total:.2f}초 (평균 {args.live}회)"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
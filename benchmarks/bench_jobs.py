@@ -0,0 +1,120 @@
+"""
+작업 대기열(core.jobs.JobQueue)의 작업자 수별 처리량과 페이지 쪽 응답 시간을 측정합니다.
+작업은 모델 호출처럼 응답 대기 시간(--latency)을 여러 조각으로 나누어 기다리면서
+조각마다 중간 결과를 기록합니다 (스트리밍 생성과 같은 진행 기록 부하).
+- 처리량: 초당 완료한 작업 수 (작업자 수에 비례해 늘어야 함)
+- 대기: 제출부터 실행 시작까지 걸린 시간 백분위수
+- 제출/조회: 페이지가 작업을 제출하고 진행 상황을 조회하는 시간 (작업자가 바쁠 때도 짧아야 함)
+
+실행 예: python -m benchmarks.bench_jobs --workers 1 2 4 8 16 --jobs 64 --latency 0.5
+"""
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from core.jobs import FINISHED_STATUSES, JobQueue
+
+
+def simulated_job(payload, job):
+    """
+    응답 대기 시간을 조각으로 나누어 기다리며 조각마다 중간 결과를 기록하는 작업입니다.
+    """
+    steps = payload["steps"]
+    text = ""
+    for i in range(steps):
+        time.sleep(payload["latency"] / steps)
+        text += "가나다라마바사 "
+        job.progress((i + 1) / steps, partial=text)
+    return {"text": text}
+
+
+def percentiles_ms(samples):
+    return {q: float(np.percentile(samples, q)) * 1000 for q in (50, 95, 99)}
+
+
+def run(workers, args, directory):
+    """
+    작업자 수 하나로 작업 전체를 처리하며 처리량, 대기 시간, 제출/조회 시간을 측정합니다.
+    """
+    queue = JobQueue(Path(directory) / f"jobs-{workers}.sqlite3", workers=workers,
+                     handlers={"simulated": simulated_job}).start()
+    payload = {"latency": args.latency, "steps": args.steps}
+
+    # 페이지처럼 주기적으로 진행 상황을 조회하는 폴러
+    job_ids, get_latencies, stop = [], [], threading.Event()
+
+    def poll():
+        while not stop.is_set():
+            for job_id in list(job_ids[-args.pollers:]):
+                started = time.perf_counter()
+                queue.get(job_id)
+                get_latencies.append(time.perf_counter() - started)
+            time.sleep(args.poll_interval)
+
+    poller = threading.Thread(target=poll, daemon=True)
+    poller.start()
+
+    submit_latencies = []
+    started_all = time.perf_counter()
+    for _ in range(args.jobs):
+        started = time.perf_counter()
+        job_ids.append(queue.submit("simulated", payload))
+        submit_latencies.append(time.perf_counter() - started)
+
+    while True:
+        jobs = [queue.get(job_id) for job_id in job_ids]
+        if all(job["status"] in FINISHED_STATUSES for job in jobs):
+            break
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - started_all
+    stop.set()
+    poller.join()
+    queue.stop()
+
+    return {
+        "workers": workers,
+        "seconds": elapsed,
+        "jobs_per_second": args.jobs / elapsed,
+        "done": sum(job["status"] == "done" for job in jobs),
+        "wait": percentiles_ms([job["started_at"] - job["created_at"] for job in jobs]),
+        "submit": percentiles_ms(submit_latencies),
+        "get": percentiles_ms(get_latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="작업 대기열 벤치마크")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16], help="측정할 작업자 수")
+    parser.add_argument("--jobs", type=int, default=64, help="제출할 작업 수")
+    parser.add_argument("--latency", type=float, default=0.5, help="작업 하나의 응답 대기 시간 (초)")
+    parser.add_argument("--steps", type=int, default=20, help="작업 하나의 진행 기록 횟수")
+    parser.add_argument("--pollers", type=int, default=8, help="동시에 진행 상황을 조회하는 페이지 수")
+    parser.add_argument("--poll-interval", type=float, default=0.05, help="조회 간격 (초)")
+    args = parser.parse_args()
+
+    ideal = args.jobs * args.latency
+    print(
+        f"{'작업자':>6}{'소요(초)':>10}{'처리량(작업/초)':>16}{'속도 향상':>10}{'완료':>6}"
+        f"{'대기 p50/p95(ms)':>20}{'제출 p50/p99(ms)':>20}{'조회 p50/p99(ms)':>20}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        baseline = None
+        for workers in args.workers:
+            result = run(workers, args, directory)
+            baseline = baseline or result["jobs_per_second"] / workers
+            wait, submit, get = result["wait"], result["submit"], result["get"]
+            print(
+                f"{workers:>6}{result['seconds']:>10.2f}{result['jobs_per_second']:>16.1f}"
+                f"{result['jobs_per_second'] / baseline:>9.1f}x{result['done']:>6}"
+                f"{wait[50]:>11.0f} /{wait[95]:>6.0f}{submit[50]:>12.2f} /{submit[99]:>6.2f}"
+                f"{get[50]:>12.2f} /{get[99]:>6.2f}"
+            )
+    print(f"(작업자 1개 기준 이론 소요 {ideal:.1f}초)")
+
+
+if __name__ == "__main__":
+    main()
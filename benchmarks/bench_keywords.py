@@ -0,0 +1,76 @@
+"""
+청크별 키워드 추출 속도를 비교합니다.
+- legacy: 청크마다 CountVectorizer를 새로 학습하던 기존 방식
+- engine: 전체 청크에 대해 한 번만 학습하는 KeywordEngine
+
+실행 예: python -m benchmarks.bench_keywords --chunks 3000
+"""
+import argparse
+import random
+import time
+
+from sklearn.feature_extraction.text import CountVectorizer
+
+from core.keywords import KeywordEngine, clean_text
+
+
+WORDS = [
+    "생성형", "인공지능", "서비스", "업무", "데이터", "파인튜닝", "프롬프트", "학습",
+    "모델", "전처리", "평가", "역량", "분석", "model", "data", "prompt", "training",
+    "pipeline", "token", "embedding", "vector", "search", "retrieval", "quality",
+]
+
+
+def synthetic_chunks(n_chunks, words_per_chunk=60, seed=0):
+    """
+    벤치마크용 임의 청크를 생성합니다.
+    - n_chunks: 청크 개수
+    - words_per_chunk: 청크당 단어 수
+    """
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(WORDS, k=words_per_chunk)) for _ in range(n_chunks)]
+
+
+def legacy_extract_keywords(text, top_n=5):
+    # 기존 pages/Pn-1.py 구현 (청크마다 새 벡터라이저 학습)
+    vectorizer = CountVectorizer(ngram_range=(1, 2), stop_words="english")
+    vectorizer.fit_transform([clean_text(text)])
+    return vectorizer.get_feature_names_out()[:top_n]
+
+
+def run_legacy(chunks):
+    return [legacy_extract_keywords(chunk) for chunk in chunks]
+
+
+def run_engine(chunks, weighting="count"):
+    engine = KeywordEngine(weighting=weighting).fit(chunks)
+    return engine.top_terms_per_chunk(top_n=5), engine.top_terms_for_document(top_n=30)
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="키워드 추출 벤치마크")
+    parser.add_argument("--chunks", type=int, default=3000, help="청크 개수")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (최솟값 사용)")
+    args = parser.parse_args()
+
+    chunks = synthetic_chunks(args.chunks)
+    results = {
+        "legacy": min(timed(run_legacy, chunks) for _ in range(args.repeat)),
+        "engine(count)": min(timed(run_engine, chunks) for _ in range(args.repeat)),
+        "engine(tfidf)": min(timed(run_engine, chunks, "tfidf") for _ in range(args.repeat)),
+    }
+
+    print(f"청크 수: {args.chunks}")
+    for name, seconds in results.items():
+        print(f"{name:>15}: {seconds:8.3f}s  {args.chunks / seconds:10.1f} chunks/sec")
+    print(f"속도 향상: {results['legacy'] / results['engine(count)']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+페이지 구간 병렬 처리의 작업자 수별 속도 향상을 측정합니다.
+순차 처리(작업자 1명)와 청크 순서 및 키워드가 같은지도 함께 확인합니다.
+
+실행 예: python -m benchmarks.bench_parallel --pages 300 --workers 1 2 4 8
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic_pdf import make_lecture_pdf
+from core.pdf_pipeline import process_pdf_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF 병렬 처리 벤치마크")
+    parser.add_argument("--pdf", help="측정할 PDF 파일 (없으면 임의 교안 생성)")
+    parser.add_argument("--pages", type=int, default=300, help="임의 교안 페이지 수")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="작업자 수 목록")
+    parser.add_argument("--pipeline", default="ko_core_news_sm", help="spaCy 파이프라인")
+    args = parser.parse_args()
+
+    path = args.pdf
+    if path is None:
+        path = os.path.join(tempfile.mkdtemp(), "lecture.pdf")
+        make_lecture_pdf(path, pages=args.pages)
+
+    baseline = None
+    for workers in args.workers:
+        # 프로세스 풀과 spaCy 로드 비용을 제외하기 위해 한 번 먼저 실행
+        process_pdf_file(path, pipeline=args.pipeline, workers=workers)
+        start = time.perf_counter()
+        result = process_pdf_file(path, pipeline=args.pipeline, workers=workers)
+        seconds = time.perf_counter() - start
+
+        if baseline is None:
+            baseline = (seconds, result)
+        same = (
+            result["chunks"] == baseline[1]["chunks"]
+            and result["chunk_keywords"] == baseline[1]["chunk_keywords"]
+        )
+        print(
+            f"workers={workers:>2}  {seconds:8.3f}s  "
+            f"{len(result['chunks']) / seconds:10.1f} chunks/sec  "
+            f"speedup={baseline[0] / seconds:5.2f}x  identical={same}"
+        )
+
+
+if __name__ == "__main__":
+    main()
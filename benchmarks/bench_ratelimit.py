@@ -0,0 +1,186 @@
+"""
+공유 속도 제한기(core.ratelimit)를 분당 한도가 있는 모의 모델 서버에 대고 측정합니다.
+일괄 생성 스레드 여러 개가 쉬지 않고 호출하는 동안 검수자 세션 몇 개가 가끔 호출하는 상황을
+두 가지 방식으로 실행해 비교합니다.
+- direct: 제한 없이 호출하고 429를 받으면 langchain처럼 4~10초 대기 후 다시 시도
+- limiter: call_with_limit()로 호출 (토큰 버킷 + AIMD 동시 호출 수 + 세션별 번갈아 허가)
+
+모의 서버는 OpenAI처럼 요청 시점에 (프롬프트 + max_tokens) 토큰을 차감하고, 한도를 넘으면 429를 반환하며,
+동시 처리 수가 많아지면 응답이 느려집니다.
+출력: 완료/실패 호출 수, 429 횟수, 한도 대비 사용률, 세션 종류별 응답 시간(대기 포함) 백분위수
+
+실행 예: python -m benchmarks.bench_ratelimit --seconds 60 --batch-threads 24 --reviewers 3
+"""
+import argparse
+import random
+import threading
+import time
+
+import numpy as np
+
+from core.ratelimit import RateLimiter, TokenBucket, call_with_limit, rate_limit_session
+from core.registry import registry
+
+
+class RateLimitError(Exception):
+    """
+    모의 서버의 429 응답입니다 (openai.error.RateLimitError와 같은 이름과 http_status).
+    """
+    http_status = 429
+    headers = {}
+
+
+class SimulatedServer:
+    """
+    분당 요청 수/토큰 수 한도와 부하에 따른 응답 지연을 흉내 내는 모델 서버입니다.
+    - rpm, tpm: 분당 한도
+    - burst_seconds: 서버가 한 번에 허용하는 양 (초 단위 한도)
+    - base_latency: 첫 토큰까지의 지연 (초)
+    - tokens_per_second: 응답 생성 속도
+    - knee: 이보다 많이 동시에 처리하면 지연이 비례해서 늘어나는 동시 처리 수
+    """
+
+    def __init__(self, rpm, tpm, burst_seconds, base_latency, tokens_per_second, knee):
+        self.requests = TokenBucket(rpm, burst_seconds)
+        self.tokens = TokenBucket(tpm, burst_seconds)
+        self.base_latency = base_latency
+        self.tokens_per_second = tokens_per_second
+        self.knee = knee
+        self.in_flight = 0
+        self.rate_limited = 0
+        self.charged_tokens = 0
+        self._lock = threading.Lock()
+
+    def call(self, prompt_tokens, max_tokens, completion_tokens):
+        with self._lock:
+            now = time.monotonic()
+            charged = prompt_tokens + max_tokens
+            if self.requests.wait_time(1, now) > 0 or self.tokens.wait_time(charged, now) > 0:
+                self.rate_limited += 1
+                raise RateLimitError("Rate limit reached")
+            self.requests.take(1, now)
+            self.tokens.take(charged, now)
+            self.charged_tokens += charged
+            self.in_flight += 1
+            slowdown = 1 + max(0, self.in_flight - self.knee) / self.knee
+        try:
+            time.sleep((self.base_latency + completion_tokens / self.tokens_per_second) * slowdown)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        return completion_tokens
+
+
+def direct_call(server, request):
+    # langchain ChatOpenAI 기본 재시도와 같은 방식 (지수 대기 4~10초, 최대 6번 시도)
+    for attempt in range(6):
+        try:
+            return server.call(*request)
+        except RateLimitError:
+            if attempt == 5:
+                raise
+            time.sleep(min(10.0, max(4.0, 2 ** attempt)) * random.uniform(0.8, 1.0))
+
+
+def make_request(rng):
+    # 문항 생성 프롬프트와 비슷한 크기: 프롬프트 600~1400, max_tokens 500~1500, 실제 응답은 그 절반 정도
+    max_tokens = rng.choice([500, 1000, 1500])
+    return rng.randint(600, 1400), max_tokens, int(max_tokens * rng.uniform(0.3, 0.7))
+
+
+def run(mode, args):
+    """
+    한 가지 방식으로 부하를 실행하고 결과를 반환합니다.
+    - mode: "direct" 또는 "limiter"
+    """
+    server = SimulatedServer(args.rpm, args.tpm, args.server_burst, args.base_latency, args.tokens_per_second, args.knee)
+    model = f"bench-{mode}"
+    registry.register(f"rate_limiter:{model}", lambda: RateLimiter(args.rpm, args.tpm))
+    deadline = time.monotonic() + args.seconds
+    latencies = {"batch": [], "reviewer": []}
+    counts = {"ok": 0, "failed": 0}
+    lock = threading.Lock()
+
+    def one_call(kind, rng):
+        request = make_request(rng)
+        started = time.monotonic()
+        try:
+            if mode == "direct":
+                direct_call(server, request)
+            else:
+                call_with_limit(model, request[0] + request[1], lambda: server.call(*request))
+            ok = True
+        except RateLimitError:
+            ok = False
+        with lock:
+            counts["ok" if ok else "failed"] += 1
+            if ok:
+                latencies[kind].append(time.monotonic() - started)
+
+    def batch_worker(seed):
+        rng = random.Random(seed)
+        with rate_limit_session("batch"):
+            while time.monotonic() < deadline:
+                one_call("batch", rng)
+
+    def reviewer(seed):
+        rng = random.Random(seed)
+        with rate_limit_session(f"reviewer-{seed}"):
+            while time.monotonic() < deadline:
+                one_call("reviewer", rng)
+                time.sleep(rng.uniform(1.0, 3.0))
+
+    threads = [threading.Thread(target=batch_worker, args=(i,)) for i in range(args.batch_threads)]
+    threads += [threading.Thread(target=reviewer, args=(1000 + i,)) for i in range(args.reviewers)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    limiter = registry.get(f"rate_limiter:{model}").stats() if mode == "limiter" else None
+    return {
+        "mode": mode,
+        **counts,
+        "rate_limited": server.rate_limited,
+        "utilization": server.charged_tokens / (args.tpm * elapsed / 60),
+        "latency": {
+            kind: (np.percentile(samples, [50, 95]) if samples else [float("nan")] * 2)
+            for kind, samples in latencies.items()
+        },
+        "limit": limiter["limit"] if limiter else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모델 호출 속도 제한기 벤치마크")
+    parser.add_argument("--seconds", type=float, default=60, help="방식별 실행 시간 (초)")
+    parser.add_argument("--rpm", type=int, default=600, help="모의 서버 분당 요청 수 한도")
+    parser.add_argument("--tpm", type=int, default=400000, help="모의 서버 분당 토큰 수 한도")
+    parser.add_argument("--server-burst", type=float, default=5.0, help="모의 서버가 한 번에 허용하는 양 (초 단위 한도)")
+    parser.add_argument("--base-latency", type=float, default=0.5, help="첫 토큰까지의 지연 (초)")
+    parser.add_argument("--tokens-per-second", type=float, default=400, help="응답 생성 속도 (토큰/초)")
+    parser.add_argument("--knee", type=int, default=24, help="지연이 늘어나기 시작하는 동시 처리 수")
+    parser.add_argument("--batch-threads", type=int, default=24, help="일괄 생성 스레드 수")
+    parser.add_argument("--reviewers", type=int, default=3, help="검수자 세션 수")
+    parser.add_argument("--modes", nargs="+", default=["direct", "limiter"], help="실행할 방식")
+    args = parser.parse_args()
+
+    print(
+        f"{'방식':>8}{'완료':>7}{'실패':>6}{'429':>7}{'한도 사용률':>12}"
+        f"{'일괄 p50/p95(초)':>19}{'검수자 p50/p95(초)':>20}{'동시 호출 한도':>14}"
+    )
+    for mode in args.modes:
+        result = run(mode, args)
+        batch, reviewer = result["latency"]["batch"], result["latency"]["reviewer"]
+        limit = f"{result['limit']:.1f}" if result["limit"] is not None else "-"
+        print(
+            f"{mode:>8}{result['ok']:>7}{result['failed']:>6}{result['rate_limited']:>7}"
+            f"{result['utilization']:>12.1%}"
+            f"{batch[0]:>11.2f} /{batch[1]:>6.2f}{reviewer[0]:>12.2f} /{reviewer[1]:>6.2f}{limit:>14}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+페이지 스크립트의 재실행(rerun) 시간을 측정합니다.
+Streamlit은 위젯을 조작할 때마다 페이지 스크립트 전체를 다시 실행하므로,
+첫 실행(import 포함)과 이후 재실행 시간을 나누어 보고합니다.
+페이지마다 새 프로세스에서 측정하므로 첫 실행 시간에 import 비용이 그대로 포함됩니다.
+
+실행 예: python -m benchmarks.bench_rerun --runs 30
+특정 페이지만: python -m benchmarks.bench_rerun --page "pages/Generator.py?competency=P4-3-1"
+생성된 문항이 있는 검수 화면 기준: python -m benchmarks.bench_rerun --generated
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import parse_qsl
+
+import numpy as np
+
+
+DEFAULT_PAGES = ["pages/Pn-1.py", "pages/Generator.py?competency=P4-1-1", "pages/Generator.py?competency=P4-3-1"]
+
+# --generated 측정 시 세션에 넣어 둘 생성 문항 (검수 화면까지 그려지도록)
+SAMPLE_QUESTION = (
+    "[질문]\nA 기업의 데이터 분석팀은 사내 문서로 LLM 파인튜닝용 학습 데이터를 만들고 있다. "
+    "다음 중 가장 적절한 전처리 방법은?\n\n"
+    "[선지]\n선지 1) 원문을 그대로 사용한다\n선지 2) 개인정보를 제거하고 형식을 통일한다\n"
+    "선지 3) 중복 문서를 늘린다\n선지 4) 레이블 없이 저장한다\n\n"
+    "[정답 및 해설]\n정답) 2\n해설) 개인정보 제거와 형식 통일은 학습 데이터 품질을 높인다."
+)
+
+
+def measure_page(page, runs, generated=False):
+    """
+    AppTest로 페이지를 한 번 실행한 뒤 runs번 다시 실행하며 시간을 잽니다.
+    - page: 페이지 스크립트 경로 (?이름=값 형식의 주소 파라미터 포함 가능)
+    - runs: 재실행 횟수
+    - generated: True면 생성된 문항이 있는 상태(검수 화면)에서 측정
+    반환값: {"page", "first_ms", "rerun_mean_ms", "rerun_p50_ms", "rerun_p95_ms"}
+    """
+    import streamlit.testing.v1.local_script_runner as local_script_runner
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import AppTest
+
+    # 실제 서버는 컴파일된 페이지 스크립트를 재실행 간에 재사용하지만 AppTest는 매번 새로 컴파일하므로,
+    # 서버와 같도록 스크립트 캐시를 공유
+    script_cache = ScriptCache()
+    local_script_runner.ScriptCache = lambda: script_cache
+
+    path, _, query = page.partition("?")
+    app = AppTest.from_file(path, default_timeout=120)
+    app.query_params.update(parse_qsl(query))
+    if generated:
+        competency = app.query_params.get("competency", "P4-3-1")
+        app.session_state[f"generator:{competency}"] = {
+            "generated_question": SAMPLE_QUESTION,
+            "generated_difficulty": "상",
+            "generation_notice": None,
+            "generation_timings": [],
+            "news_keywords": "파인튜닝 데이터 전처리",
+            "discarded_question": None,
+            "review": None,
+        }
+    started = time.perf_counter()
+    app.run()
+    first = time.perf_counter() - started
+    if app.exception:
+        raise RuntimeError(f"{page} 실행 오류: {app.exception[0].value}")
+
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        app.run()
+        timings.append(time.perf_counter() - started)
+    timings = np.array(timings) * 1000
+    return {
+        "page": page,
+        "first_ms": first * 1000,
+        "rerun_mean_ms": float(timings.mean()),
+        "rerun_p50_ms": float(np.percentile(timings, 50)),
+        "rerun_p95_ms": float(np.percentile(timings, 95)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="페이지 재실행 시간 벤치마크")
+    parser.add_argument("--page", help="측정할 페이지 (생략하면 모든 페이지를 각각 새 프로세스에서 측정)")
+    parser.add_argument("--runs", type=int, default=30, help="재실행 횟수")
+    parser.add_argument("--generated", action="store_true", help="생성된 문항이 있는 검수 화면 기준으로 측정")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    if args.page:
+        result = measure_page(args.page, args.runs, args.generated)
+        if args.json:
+            print(json.dumps(result))
+        else:
+            print(result)
+        return
+
+    # 측정 중 만들어지는 캐시/저장소 파일은 임시 디렉터리에 둠
+    with tempfile.TemporaryDirectory() as workdir:
+        env = {
+            **os.environ,
+            "DTLAB_CACHE_DIR": os.path.join(workdir, "cache"),
+            "DTLAB_QUESTION_DB": os.path.join(workdir, "questions.sqlite3"),
+            "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "sk-benchmark"),
+        }
+        print(f"{'페이지':<40}{'첫 실행':>10}{'재실행 평균':>12}{'p50':>10}{'p95':>10}  (ms)")
+        for page in DEFAULT_PAGES:
+            command = [sys.executable, "-m", "benchmarks.bench_rerun", "--page", page, "--runs", str(args.runs), "--json"]
+            if args.generated:
+                command.append("--generated")
+            output = subprocess.run(
+                command,
+                env=env, capture_output=True, text=True, check=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{page:<40}{result['first_ms']:>10.1f}{result['rerun_mean_ms']:>12.1f}"
+                f"{result['rerun_p50_ms']:>10.1f}{result['rerun_p95_ms']:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
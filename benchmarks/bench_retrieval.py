@@ -0,0 +1,155 @@
+"""
+교안 검색 색인(core.retrieval.RetrievalIndex)의 추가/열기/검색 시간을 측정합니다.
+임시 디렉터리에 합성 교안 청크를 문서 단위로 계속 추가하면서, 지정한 크기에 도달할 때마다 측정합니다.
+- 추가: 초당 색인한 청크 수 (문서를 추가할 때마다 세그먼트 생성, 필요하면 병합)
+- 열기: 저장된 색인을 새로 여는 시간 (메모리 매핑이므로 크기와 관계없이 일정해야 함)
+- 검색: 흔한 단어 위주의 무작위 질의(3~6단어)와 키워드 질의의 검색 시간 백분위수
+- 재현율: 청크 하나의 드문 단어 5개(키워드)로 검색했을 때 그 청크가 상위 k개 안에 드는 비율
+
+실행 예: python -m benchmarks.bench_retrieval --checkpoints 10000 100000 1000000
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from core.retrieval import RetrievalIndex, retrieve_context
+
+
+def make_vocabulary(size, syllables=1200, seed=0):
+    """
+    실제 교안처럼 음절과 어휘가 다양하도록 2~4음절 단어를 무작위로 만듭니다.
+    """
+    rng = random.Random(seed)
+    hangul = [chr(code) for code in rng.sample(range(0xAC00, 0xD7A4), syllables)]
+    return ["".join(rng.choice(hangul) for _ in range(rng.randint(2, 4))) for _ in range(size)]
+
+
+class ChunkGenerator:
+    """
+    Zipf 분포로 단어를 뽑아 교안 청크 길이(약 350자)의 합성 청크를 만듭니다.
+    """
+
+    def __init__(self, vocabulary_size=50000, words_per_chunk=90, seed=0):
+        self.words = make_vocabulary(vocabulary_size, seed=seed)
+        ranks = np.arange(1, vocabulary_size + 1)
+        self.probabilities = 1 / ranks ** 1.1
+        self.probabilities /= self.probabilities.sum()
+        self.rank = {word: i for i, word in enumerate(self.words)}
+        self.words_per_chunk = words_per_chunk
+        self.rng = np.random.default_rng(seed)
+
+    def chunks(self, count):
+        picks = self.rng.choice(len(self.words), size=(count, self.words_per_chunk), p=self.probabilities)
+        return [" ".join(self.words[i] for i in row) for row in picks.tolist()]
+
+    def keywords(self, text, count=5):
+        # 청크에 나온 단어 중 가장 드문 단어 (Pn-1 페이지의 청크별 키워드에 해당)
+        return sorted(set(text.split()), key=self.rank.__getitem__, reverse=True)[:count]
+
+    def query(self):
+        picks = self.rng.choice(len(self.words), size=self.rng.integers(3, 7), p=self.probabilities)
+        return " ".join(self.words[i] for i in picks)
+
+
+def percentiles_ms(samples):
+    return {q: float(np.percentile(samples, q)) * 1000 for q in (50, 95, 99)}
+
+
+def measure(index, directory, generator, queries, k, probes):
+    """
+    현재 색인의 열기 시간, 검색 시간, 재현율을 측정합니다.
+    - probes: 재현율 확인용 (청크 본문, 질의) 목록
+    """
+    started = time.perf_counter()
+    reopened = RetrievalIndex(directory)
+    open_seconds = time.perf_counter() - started
+
+    query_texts = [generator.query() for _ in range(queries)]
+    reopened.search(query_texts[0], k)  # 첫 검색의 페이지 읽기는 제외
+    latencies = []
+    for query in query_texts:
+        started = time.perf_counter()
+        reopened.search(query, k)
+        latencies.append(time.perf_counter() - started)
+
+    context_latencies = []
+    for query in query_texts[:100]:
+        started = time.perf_counter()
+        retrieve_context(query, k=k, index=reopened)
+        context_latencies.append(time.perf_counter() - started)
+
+    hits, keyword_latencies = 0, []
+    for text, query in probes:
+        started = time.perf_counter()
+        passages = reopened.search(query, k)
+        keyword_latencies.append(time.perf_counter() - started)
+        hits += any(passage.text == text for passage in passages)
+    return {
+        "chunks": len(index),
+        "segments": index.segment_count,
+        "open_ms": open_seconds * 1000,
+        "search": percentiles_ms(latencies),
+        "keyword_search": percentiles_ms(keyword_latencies),
+        "context": percentiles_ms(context_latencies),
+        "recall": hits / len(probes) if probes else None,
+        "disk_mb": sum(f.stat().st_size for f in Path(directory).rglob("*") if f.is_file()) / 1024 / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="교안 검색 색인 벤치마크")
+    parser.add_argument("--checkpoints", type=int, nargs="+", default=[10000, 100000, 1000000], help="측정할 청크 수")
+    parser.add_argument("--chunks-per-document", type=int, default=200, help="문서(PDF) 하나의 청크 수")
+    parser.add_argument("--batch-chunks", type=int, default=50000, help="한 번에 생성해 추가할 청크 수")
+    parser.add_argument("--queries", type=int, default=500, help="측정할 검색 수")
+    parser.add_argument("--top-k", type=int, default=3, help="검색 결과 수")
+    parser.add_argument("--probes", type=int, default=200, help="재현율 확인 질의 수")
+    args = parser.parse_args()
+
+    generator = ChunkGenerator()
+    rng = random.Random(1)
+    print(
+        f"{'청크 수':>10}{'세그먼트':>8}{'추가(청크/초)':>14}{'열기(ms)':>10}"
+        f"{'검색 p50/p95/p99(ms)':>24}{'키워드 검색 p50/p95(ms)':>22}{'예산 선택 p50(ms)':>18}"
+        f"{'재현율':>8}{'디스크(MB)':>11}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        index = RetrievalIndex(directory)
+        probes, document_no, build_seconds = [], 0, 0.0
+        for checkpoint in sorted(args.checkpoints):
+            while len(index) < checkpoint:
+                count = min(args.batch_chunks, checkpoint - len(index))
+                texts = generator.chunks(count)
+                documents = []
+                for start in range(0, count, args.chunks_per_document):
+                    chunks = [
+                        {"page_content": text, "metadata": {"page": i}}
+                        for i, text in enumerate(texts[start:start + args.chunks_per_document])
+                    ]
+                    documents.append((f"doc-{document_no}", f"lecture-{document_no}.pdf", chunks))
+                    document_no += 1
+                started = time.perf_counter()
+                for document in documents:
+                    index.add_documents([document])
+                build_seconds += time.perf_counter() - started
+                # 청크의 키워드를 재현율 확인 질의로 사용
+                for text in rng.sample(texts, min(len(texts), max(1, args.probes // 10))):
+                    probes.append((text, " ".join(generator.keywords(text))))
+
+            result = measure(index, directory, generator, args.queries, args.top_k, rng.sample(probes, min(args.probes, len(probes))))
+            search, keyword, context = result["search"], result["keyword_search"], result["context"]
+            print(
+                f"{result['chunks']:>10,}{result['segments']:>8}{result['chunks'] / build_seconds:>14,.0f}"
+                f"{result['open_ms']:>10.2f}"
+                f"{search[50]:>10.2f} /{search[95]:>6.2f} /{search[99]:>6.2f}"
+                f"{keyword[50]:>14.2f} /{keyword[95]:>6.2f}"
+                f"{context[50]:>18.2f}{result['recall']:>8.1%}{result['disk_mb']:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
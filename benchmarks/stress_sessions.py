@@ -0,0 +1,210 @@
+"""
+여러 세션이 동시에 업로드, 결과 기록, 문항 저장을 할 때 파일이 섞이거나 기록이 사라지지 않는지 확인합니다.
+세션마다 스레드 하나를 만들어 동시에 시작시키고, 끝난 뒤 다음을 검사합니다.
+- 업로드(작업 입력 파일): 각 세션이 같은 이름으로 올려도 자기 업로드만 읽는지, 처리가 끝나면 파일이 남지 않는지,
+  비정상 종료로 남은 파일만 시작 시 정리되고 대기 중인 작업의 파일은 남는지
+- 줄 덧붙이기: 공유 JSON Lines 파일에 모든 줄이 한 번씩, 세션별 순서대로 온전히 기록되는지
+- 문항 저장: 고유 문항은 모두 저장되고, 여러 세션이 동시에 저장한 같은 문항은 한 번만 저장되는지
+--compare-direct를 주면 같은 부하를 잠금 없는 open(..., "a") 기록으로 실행해 깨진 줄 수를 비교합니다.
+
+실행 예: python -m benchmarks.stress_sessions --sessions 64 --rows 500
+"""
+import argparse
+import json
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from benchmarks.bench_dedup import make_question
+from core.dedup import DuplicateIndex, save_unique_question
+from core.jobs import cleanup_job_inputs, write_job_input
+from core.question_store import QuestionStore
+from core.storage import AppendWriter
+
+
+def _row(session_id, seq, rng, max_payload):
+    return {"session": session_id, "seq": seq, "payload": "가" * rng.randint(1, max_payload)}
+
+
+def run_session(session_id, args, input_root, writer, log_path, store, index, shared_question, barrier, report):
+    """
+    세션 하나의 작업(업로드 기록/읽기, 결과 줄 덧붙이기, 문항 저장)을 실행하고 결과를 report에 기록합니다.
+    """
+    rng = random.Random(session_id)
+    barrier.wait()
+
+    # 세션마다 같은 파일 이름으로 업로드해도 서로의 파일을 덮어쓰지 않아야 함
+    upload = f"session-{session_id}:".encode() + rng.randbytes(rng.randint(1_000, 200_000))
+    path = write_job_input("uploaded_file.pdf", upload, root=input_root)
+    mismatched = 0
+
+    futures = []
+    for seq in range(args.rows):
+        row = _row(session_id, seq, rng, args.max_payload)
+        if writer is None:
+            with open(log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        else:
+            futures.append(writer.append_json(log_path, row))
+        if seq % 50 == 0 and path.read_bytes() != upload:
+            mismatched += 1
+
+    saved = 0
+    for i in range(args.questions):
+        record = {"page": "stress", "reviewer": f"session-{session_id}", **_question(rng)}
+        question_id, _ = save_unique_question(record, store, index)
+        saved += question_id is not None
+    shared_saved = save_unique_question({"page": "stress", **shared_question}, store, index)[0] is not None
+
+    for future in futures:
+        future.result()
+    if path.read_bytes() != upload:
+        mismatched += 1
+    # 처리 함수(core.tasks.pdf_job)처럼 사용이 끝난 입력 파일을 삭제
+    path.unlink()
+    report[session_id] = {"mismatched": mismatched, "saved": saved, "shared_saved": shared_saved}
+
+
+def _question(rng):
+    question, options = make_question(rng).split("\n", 1)
+    return {"question": question, "options": options}
+
+
+def check_log(log_path, sessions, rows):
+    """
+    공유 로그를 읽어 (깨진 줄 수, 빠진 줄 수, 중복 줄 수, 순서가 바뀐 세션 수)를 반환합니다.
+    """
+    seen = {session_id: [] for session_id in range(sessions)}
+    broken = 0
+    with open(log_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+                seen[row["session"]].append(row["seq"])
+            except (ValueError, KeyError):
+                broken += 1
+    missing = duplicated = reordered = 0
+    for seqs in seen.values():
+        missing += rows - len(set(seqs))
+        duplicated += len(seqs) - len(set(seqs))
+        reordered += seqs != sorted(seqs)
+    return broken, missing, duplicated, reordered
+
+
+def check_input_cleanup(input_root):
+    """
+    비정상 종료로 남은 입력 파일과 대기 중인 작업의 입력 파일을 두고 시작 시 정리를 실행합니다.
+    반환값: (삭제된 남은 파일 수, 삭제된 대기 중인 작업의 파일 수)
+    """
+    stale = write_job_input("crashed.pdf", b"stale", root=input_root)
+    queued = write_job_input("queued.pdf", b"queued", root=input_root)
+    cleanup_job_inputs(input_root, keep=[queued])
+    return int(not stale.exists()), int(not queued.exists())
+
+
+def run(args, mode):
+    """
+    한 가지 기록 방식으로 전체 세션을 실행하고 검사 결과를 반환합니다.
+    - mode: "writer" (AppendWriter) 또는 "direct" (잠금 없는 open(..., "a"))
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        writer = AppendWriter(batch_size=args.batch_size) if mode == "writer" else None
+        log_path = directory / "results.jsonl"
+        store = QuestionStore(directory / "questions.sqlite3")
+        index = DuplicateIndex()
+        shared_question = _question(random.Random(-1))
+        barrier = threading.Barrier(args.sessions)
+        report = {}
+
+        threads = [
+            threading.Thread(
+                target=run_session,
+                args=(i, args, directory / "job_inputs", writer, log_path, store, index, shared_question, barrier, report),
+            )
+            for i in range(args.sessions)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if writer is not None:
+            writer.flush()
+        elapsed = time.perf_counter() - started
+
+        broken, missing, duplicated, reordered = check_log(log_path, args.sessions, args.rows)
+        leftover_inputs = len(list((directory / "job_inputs").iterdir()))
+        stale_removed, queued_removed = check_input_cleanup(directory / "job_inputs")
+        stats = writer.stats() if writer is not None else {}
+        if writer is not None:
+            writer.close()
+        return {
+            "mode": mode,
+            "seconds": elapsed,
+            "rows_per_second": args.sessions * args.rows / elapsed,
+            "broken": broken,
+            "missing": missing,
+            "duplicated": duplicated,
+            "reordered": reordered,
+            "fsyncs": stats.get("fsyncs"),
+            "max_batch": stats.get("max_batch"),
+            "questions_saved": sum(r["saved"] for r in report.values()),
+            "questions_expected": args.sessions * args.questions,
+            "shared_saved": sum(r["shared_saved"] for r in report.values()),
+            "upload_mismatches": sum(r["mismatched"] for r in report.values()),
+            "leftover_inputs": leftover_inputs,
+            "stale_removed": stale_removed,
+            "queued_removed": queued_removed,
+            "store_count": store.count(),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동시 세션 저장 스트레스 테스트")
+    parser.add_argument("--sessions", type=int, default=32, help="동시 세션 수")
+    parser.add_argument("--rows", type=int, default=300, help="세션마다 덧붙일 줄 수")
+    parser.add_argument("--questions", type=int, default=5, help="세션마다 저장할 고유 문항 수")
+    parser.add_argument("--max-payload", type=int, default=6000, help="줄 하나의 최대 글자 수")
+    parser.add_argument("--batch-size", type=int, default=512, help="작성기가 한 번에 모아 기록할 최대 줄 수")
+    parser.add_argument("--compare-direct", action="store_true", help="잠금 없는 직접 기록과 비교")
+    args = parser.parse_args()
+
+    modes = ["writer", "direct"] if args.compare_direct else ["writer"]
+    failed = False
+    for mode in modes:
+        result = run(args, mode)
+        writer_stats = f", fsync {result['fsyncs']}회, 최대 묶음 {result['max_batch']}" if mode == "writer" else ""
+        print(
+            f"[{mode}] 세션 {args.sessions}개 × {args.rows}줄: {result['seconds']:.2f}초 "
+            f"({result['rows_per_second']:,.0f}줄/초{writer_stats})"
+        )
+        print(
+            f"  로그: 깨진 줄 {result['broken']}, 빠진 줄 {result['missing']}, "
+            f"중복 줄 {result['duplicated']}, 순서가 바뀐 세션 {result['reordered']}"
+        )
+        print(
+            f"  업로드: 다른 업로드를 읽은 횟수 {result['upload_mismatches']}, "
+            f"처리 후 남은 파일 {result['leftover_inputs']}, "
+            f"시작 시 정리: 남은 파일 {result['stale_removed']}/1, 대기 중인 작업의 파일 {result['queued_removed']}/0"
+        )
+        print(
+            f"  문항 저장: 고유 {result['questions_saved']}/{result['questions_expected']}, "
+            f"같은 문항 {result['shared_saved']}회 저장, 저장소 {result['store_count']}건"
+        )
+        if mode == "writer":
+            failed = any(result[key] for key in ("broken", "missing", "duplicated", "reordered",
+                                                 "upload_mismatches", "leftover_inputs", "queued_removed")) \
+                or result["stale_removed"] != 1 \
+                or result["questions_saved"] != result["questions_expected"] \
+                or result["shared_saved"] != 1 \
+                or result["store_count"] != result["questions_expected"] + 1
+    print("실패" if failed else "통과")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
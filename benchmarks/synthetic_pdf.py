@@ -0,0 +1,54 @@
+"""
+벤치마크용 한국어 강의 교안 PDF를 생성합니다.
+
+실행 예: python -m benchmarks.synthetic_pdf --pages 300 --output lecture_300.pdf
+"""
+import argparse
+import random
+
+
+SENTENCES = [
+    "생성형 인공지능 서비스는 단계별로 정의된 업무를 지원할 수 있습니다.",
+    "LLM 파인튜닝을 위해서는 학습용 데이터를 수집하고 전처리해야 합니다.",
+    "프롬프트 엔지니어링은 모델을 수정하지 않고 입력을 최적화하는 방법입니다.",
+    "JSONL 형식은 각 줄에 하나의 JSON 객체를 저장합니다.",
+    "데이터 레이블링 과정에서는 일관성을 유지하는 것이 가장 중요합니다.",
+    "업무에 적합한 AI 서비스를 선정하려면 요구사항을 먼저 정리해야 합니다.",
+    "모델의 출력 품질은 학습 데이터의 품질에 크게 좌우됩니다.",
+    "Retrieval augmented generation combines search results with the prompt.",
+    "평가 문항은 학습 목표와 성취 기준을 측정할 수 있어야 합니다.",
+    "토큰 사용량과 응답 지연 시간은 서비스 비용에 직접 영향을 줍니다.",
+]
+
+
+def make_lecture_pdf(path, pages=10, sentences_per_page=25, seed=0):
+    """
+    무작위 한국어 문장으로 채운 PDF 파일을 만듭니다.
+    - path: 저장할 파일 경로
+    - pages: 페이지 수
+    - sentences_per_page: 페이지당 문장 수
+    - seed: 난수 시드 (같은 값이면 같은 PDF 생성)
+    """
+    import fitz
+
+    rng = random.Random(seed)
+    doc = fitz.open()
+    for page_no in range(pages):
+        page = doc.new_page()
+        text = f"{page_no + 1}강. " + " ".join(rng.choices(SENTENCES, k=sentences_per_page))
+        page.insert_textbox(fitz.Rect(50, 50, 550, 800), text, fontname="korea", fontsize=10)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크용 PDF 생성")
+    parser.add_argument("--pages", type=int, default=10, help="페이지 수")
+    parser.add_argument("--output", default="synthetic_lecture.pdf", help="저장할 파일 경로")
+    args = parser.parse_args()
+    print(make_lecture_pdf(args.output, pages=args.pages))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+"""
+DT_LAB 페이지들이 공유하는 핵심 모듈 모음입니다.
+무거운 의존성은 각 하위 모듈에서 필요할 때 불러옵니다.
+"""
@@ -0,0 +1,288 @@
+"""
+기업 × 부서 × 난이도 조합의 문항 은행을 일괄 생성하는 명령입니다.
+생성이 끝난 문항부터 JSON Lines 파일에 바로 기록하며,
+중단 후 다시 실행하면 이미 성공한 작업은 건너뜁니다.
+저장된 문항이나 앞서 생성한 문항과 거의 같은 문항은 "duplicate"로 기록하고,
+중복을 낸 프롬프트의 반복 생성은 "likely_duplicate"로 건너뛰어 비용을 아낍니다.
+"likely_duplicate"는 생성하지 않고 추정한 결과이므로 다시 실행하면 다시 생성합니다.
+
+실행 예: python -m core.batch jobs.json --concurrency 8
+
+작업 명세 예 (역량을 생략하면 P4-3-1, 주제를 생략하면 역량의 중요인 사용):
+{
+    "competency": "P4-3-1",
+    "companies": ["SK하이닉스", "KCC"],
+    "departments": ["데이터 분석팀"],
+    "difficulties": ["중", "상"],
+    "topics": ["LLM 파인튜닝 데이터 전처리"],
+    "repeats": 2,
+    "concurrency": 4,
+    "output": "question_bank.jsonl",
+    "skip_duplicates": true,
+    "max_duplicate_hits": 1
+}
+"""
+import argparse
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from core.dedup import DuplicateIndex, question_text
+from core.generation import generate_parsed_question
+from core.catalog import get_competency
+from core.question_prompts import DEFAULT_COMPETENCY, companies, departments, difficulties
+from core.question_store import question_store
+from core.ratelimit import rate_limit_session
+from core.storage import append_writer
+
+
+DEFAULT_SPEC = {
+    "competency": DEFAULT_COMPETENCY,
+    "companies": companies,
+    "departments": departments,
+    "difficulties": list(difficulties),
+    # None이면 역량의 중요인(sub_factor) 하나를 주제로 사용
+    "topics": None,
+    "repeats": 1,
+    "concurrency": 4,
+    "output": "question_bank.jsonl",
+    "skip_duplicates": True,
+    "max_duplicate_hits": 1,
+}
+
+# 모델 호출 속도 제한기(core.ratelimit)에서 일괄 생성 호출을 묶는 세션 이름
+BATCH_SESSION = "batch"
+
+# 다시 실행할 때 건너뛰는 작업 상태. "likely_duplicate"는 근사 중복 검사의 오탐으로 생략되었을 수 있으므로
+# 다시 생성 (완료로 세면 문항 은행이 명세보다 적은 채로 남음)
+DONE_STATUSES = ("ok", "duplicate")
+
+
+def load_job_spec(path):
+    """
+    작업 명세 JSON 파일을 읽고 기본값을 채웁니다. 카탈로그에 없는 역량이면 CatalogError가 발생합니다.
+    - path: 작업 명세 파일 경로
+    """
+    with open(path, encoding="utf-8") as f:
+        spec = {**DEFAULT_SPEC, **json.load(f)}
+    get_competency(spec["competency"])
+    return spec
+
+
+def job_id(company, department, topic, difficulty, repeat, competency=DEFAULT_COMPETENCY):
+    """
+    작업 조합별로 항상 같은 ID를 만듭니다 (이어서 실행할 때 사용).
+    기본 역량은 역량을 넣기 전과 같은 ID를 만들어, 이전 결과 파일도 이어서 실행할 수 있습니다.
+    """
+    fields = [company, department, topic, difficulty, repeat]
+    if competency != DEFAULT_COMPETENCY:
+        fields.append(competency)
+    payload = json.dumps(fields, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def expand_jobs(spec):
+    """
+    작업 명세를 개별 생성 작업 목록으로 펼칩니다.
+    - spec: 작업 명세
+    """
+    competency = spec["competency"]
+    topics = spec["topics"] or [get_competency(competency).sub_factor]
+    jobs = []
+    for company in spec["companies"]:
+        for department in spec["departments"]:
+            for topic in topics:
+                for difficulty in spec["difficulties"]:
+                    for repeat in range(spec["repeats"]):
+                        jobs.append({
+                            "id": job_id(company, department, topic, difficulty, repeat, competency),
+                            "competency": competency,
+                            "company": company,
+                            "department": department,
+                            "topic": topic,
+                            "difficulty": difficulty,
+                            "repeat": repeat,
+                        })
+    return jobs
+
+
+def _read_records(output_path):
+    path = Path(output_path)
+    if not path.exists():
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # 중단으로 잘린 마지막 줄은 무시
+                continue
+            yield record
+
+
+def completed_job_ids(output_path):
+    """
+    결과 파일에서 이미 끝난 작업 ID를 읽습니다 (오류로 끝난 작업과 중복 예상으로 생략한 작업 제외).
+    - output_path: 결과 JSON Lines 파일 경로
+    """
+    return {record["id"] for record in _read_records(output_path) if record.get("status") in DONE_STATUSES}
+
+
+class DuplicateGuard:
+    """
+    일괄 생성 중 근사 중복 문항을 걸러내고, 중복을 낸 프롬프트의 반복 생성을 건너뜁니다.
+    - index: 저장된 문항과 이전 결과로 만든 DuplicateIndex
+    - max_hits: 같은 프롬프트가 이 횟수만큼 중복을 내면 남은 반복을 건너뜀
+    """
+
+    def __init__(self, index, max_hits=1):
+        self.index = index
+        self.max_hits = max_hits
+        self._lock = threading.Lock()
+        self._hits = {}
+
+    @staticmethod
+    def _prompt(job):
+        return job["competency"], job["company"], job["department"], job["topic"], job["difficulty"]
+
+    def should_skip(self, job):
+        """
+        같은 프롬프트가 이미 중복을 여러 번 냈으면 True를 반환합니다.
+        """
+        with self._lock:
+            return self._hits.get(self._prompt(job), 0) >= self.max_hits
+
+    def check(self, job, parsed):
+        """
+        생성된 문항의 근사 중복을 찾습니다. 새 문항이면 색인에 추가합니다.
+        반환값: 중복 문항 목록 (없으면 빈 목록)
+        """
+        text = question_text(parsed)
+        with self._lock:
+            duplicates = self.index.query(text)
+            if duplicates:
+                prompt = self._prompt(job)
+                self._hits[prompt] = self._hits.get(prompt, 0) + 1
+            else:
+                self.index.add(job["id"], text)
+        return duplicates
+
+    @classmethod
+    def for_output(cls, output_path, max_hits=1):
+        """
+        문항 저장소의 문항과 결과 파일의 성공 문항으로 색인을 만들어 반환합니다.
+        - output_path: 결과 JSON Lines 파일 경로
+        """
+        index = DuplicateIndex.from_records(question_store().query())
+        for record in _read_records(output_path):
+            if record.get("status") == "ok":
+                index.add(record["id"], question_text(record))
+        return cls(index, max_hits=max_hits)
+
+
+def _run_job(job, generate, guard=None):
+    started = time.perf_counter()
+    try:
+        if guard is not None and guard.should_skip(job):
+            record = {**job, "status": "likely_duplicate"}
+        else:
+            # 항상 캐시를 우회해 새로 생성 (캐시된 응답은 페이지에서 이미 저장한 문항일 수 있어 중복으로 판정되고,
+            # 그러면 같은 프롬프트의 남은 반복까지 생성 없이 건너뛰게 됨)
+            # (일괄 생성 전체를 세션 하나로 묶어 페이지 사용자의 호출과 번갈아 허가받음)
+            with rate_limit_session(BATCH_SESSION):
+                parsed = generate(
+                    job["company"], job["department"], job["topic"], job["difficulty"],
+                    bypass_cache=True, competency=job["competency"],
+                )
+            duplicates = guard.check(job, parsed) if guard is not None else []
+            if duplicates:
+                record = {**job, "status": "duplicate", "duplicate_of": duplicates, **parsed}
+            else:
+                record = {**job, "status": "ok", **parsed}
+    except Exception as e:
+        record = {**job, "status": "error", "error": str(e)}
+    record["seconds"] = round(time.perf_counter() - started, 3)
+    record["created_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    return record
+
+
+def run_batch(spec, generate=generate_parsed_question, on_result=None):
+    """
+    작업 명세의 모든 문항을 동시 실행 수 제한 안에서 생성합니다.
+    - spec: 작업 명세
+    - generate: 문항 생성 함수 (기본값: generate_parsed_question)
+    - on_result: 작업이 끝날 때마다 (결과, 진행 요약)으로 호출되는 함수
+    반환값: {"total", "skipped", "ok", "error", "duplicate", "likely_duplicate", "seconds", "questions_per_minute"}
+    """
+    output_path = Path(spec["output"])
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    done = completed_job_ids(output_path)
+    jobs = [job for job in expand_jobs(spec) if job["id"] not in done]
+    # 모든 프롬프트의 첫 생성을 먼저 실행해야 중복을 낸 프롬프트의 반복을 건너뛸 수 있음
+    jobs.sort(key=lambda job: job["repeat"])
+    guard = DuplicateGuard.for_output(output_path, spec["max_duplicate_hits"]) if spec["skip_duplicates"] else None
+    summary = {
+        "total": len(jobs) + len(done), "skipped": len(done),
+        "ok": 0, "error": 0, "duplicate": 0, "likely_duplicate": 0,
+    }
+
+    started = time.perf_counter()
+    writer = append_writer()
+    writes = []
+    with ThreadPoolExecutor(max_workers=spec["concurrency"]) as executor:
+        futures = [executor.submit(_run_job, job, generate, guard) for job in jobs]
+        for future in as_completed(futures):
+            record = future.result()
+            # 끝난 순서대로 작성기에 넘겨 묶음마다 fsync 하여 중단되어도 결과가 남도록 함
+            writes.append(writer.append_json(output_path, record))
+            summary[record["status"]] += 1
+            elapsed = time.perf_counter() - started
+            summary["seconds"] = elapsed
+            summary["questions_per_minute"] = summary["ok"] / elapsed * 60 if elapsed else 0.0
+            if on_result is not None:
+                on_result(record, summary)
+
+    # 이 실행의 결과가 모두 기록될 때까지 기다리고, 기록하지 못한 결과가 있으면 오류를 발생시킴
+    # (공유 작성기의 flush()는 다른 호출자의 실패도 보고하므로 사용하지 않음)
+    for write in writes:
+        write.result()
+    summary["seconds"] = time.perf_counter() - started
+    summary["questions_per_minute"] = summary["ok"] / summary["seconds"] * 60 if summary["seconds"] else 0.0
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="문항 은행 일괄 생성")
+    parser.add_argument("spec", help="작업 명세 JSON 파일")
+    parser.add_argument("--concurrency", type=int, help="동시 생성 수 (명세 값보다 우선)")
+    parser.add_argument("--output", help="결과 JSON Lines 파일 (명세 값보다 우선)")
+    args = parser.parse_args()
+
+    spec = load_job_spec(args.spec)
+    if args.concurrency:
+        spec["concurrency"] = args.concurrency
+    if args.output:
+        spec["output"] = args.output
+
+    def report(record, summary):
+        finished = sum(summary[key] for key in ("skipped", "ok", "error", "duplicate", "likely_duplicate"))
+        message = record.get("error", "")
+        print(
+            f"[{finished}/{summary['total']}] {record['competency']} / {record['company']} / {record['department']} / "
+            f"{record['difficulty']} → {record['status']} ({record['seconds']:.1f}s, "
+            f"{summary['questions_per_minute']:.1f} 문항/분) {message}"
+        )
+
+    summary = run_batch(spec, on_result=report)
+    print(
+        f"완료: 성공 {summary['ok']}, 실패 {summary['error']}, 건너뜀 {summary['skipped']}, "
+        f"중복 {summary['duplicate']}, 중복 예상으로 생략 {summary['likely_duplicate']} / "
+        f"{summary['seconds']:.1f}초, {summary['questions_per_minute']:.1f} 문항/분"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+역량(학습 맵) 카탈로그입니다.
+역량 하나는 data/competencies/<코드>.json 파일 하나로 정의하며, 코드로 찾을 때는 해당 파일만 읽으므로
+카탈로그가 커져도 페이지 전환 시간은 일정합니다. 요인(id/factor/sub_factor)별 색인은
+처음 검색할 때 한 번만 만듭니다. 카드 이미지는 처음 표시할 때 읽어 크기를 줄인 뒤 재사용합니다.
+
+역량 파일 예:
+{
+  "code": "P4-3-1",
+  "id": 4,
+  "area": "생성형 AI",
+  "factor": "생성형 인공지능",
+  "sub_factor": "LLM 파인튜닝 역량",
+  "achievement_standard": "...",
+  "learning_object": "...",
+  "learning_target_note": "...",
+  "image": "P4_card.png",
+  "generator": "question"
+}
+"""
+import io
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from core.registry import registry
+
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+CATALOG_DIR = Path(os.environ.get("DTLAB_CATALOG_DIR", REPO_DIR / "data" / "competencies"))
+IMAGE_CARD_DIR = Path(os.environ.get("DTLAB_IMAGE_CARD_DIR", REPO_DIR / "image_card"))
+
+# 사이드바에 표시할 카드 이미지 최대 너비 (px)
+CARD_IMAGE_WIDTH = int(os.environ.get("DTLAB_CARD_IMAGE_WIDTH", "480"))
+
+# 생성기 종류: passage(지문만 생성, P4-1-1), question(뉴스 키워드 기반 객관식 문항, P4-3-1)
+GENERATORS = ("passage", "question")
+
+
+class CatalogError(Exception):
+    """
+    역량을 찾을 수 없거나 역량 파일 형식이 잘못된 경우 발생하는 오류입니다.
+    """
+
+
+@dataclass(frozen=True)
+class Competency:
+    """
+    역량 하나의 학습 맵 정보입니다.
+    - code: 역량 코드 (예: "P4-3-1", 파일 이름과 같음)
+    - id: 요인묶음 ID (같은 요인묶음의 역량은 같은 ID)
+    - factor, sub_factor: 대요인, 중요인
+    - achievement_standard, learning_object, learning_target_note: 성취기준, 학습목표, 문항 개발 시 측정할 부분
+    - area: 화면에 표시할 영역 이름 (예: "생성형 AI")
+    - image: image_card 디렉터리 기준 카드 이미지 파일 이름
+    - generator: 생성기 종류 ("passage" 또는 "question")
+    - examples: few-shot 예제 라이브러리 이름 (생략하면 역량 코드)
+    - request: 지문 생성기에서 요청 문장 끝에 붙일 안내
+    """
+
+    code: str
+    id: int
+    factor: str
+    sub_factor: str
+    achievement_standard: str
+    learning_object: str
+    learning_target_note: str
+    area: str = ""
+    image: str = None
+    generator: str = "question"
+    examples: str = None
+    request: str = ""
+
+    @property
+    def example_library(self):
+        return self.examples or self.code
+
+    @property
+    def image_path(self):
+        return IMAGE_CARD_DIR / self.image if self.image else None
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def load_competency(path):
+    """
+    역량 파일 하나를 읽습니다.
+    - path: 역량 JSON 파일 경로
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    try:
+        competency = Competency(**data)
+    except TypeError as e:
+        raise CatalogError(f"역량 파일 형식 오류 ({path}): {e}") from e
+    if competency.generator not in GENERATORS:
+        raise CatalogError(f"알 수 없는 생성기 ({path}): {competency.generator}")
+    return competency
+
+
+class CompetencyCatalog:
+    """
+    역량 파일 디렉터리를 읽는 카탈로그입니다.
+    get()은 요청한 역량 파일만 읽어 보관하고, find()는 처음 호출될 때 전체 색인을 만듭니다.
+    - directory: 역량 파일 디렉터리
+    """
+
+    def __init__(self, directory=CATALOG_DIR):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self._codes = None
+        self._competencies = {}
+        self._index = None
+
+    def codes(self):
+        """
+        역량 코드 목록을 정렬해 반환합니다 (파일 이름만 확인).
+        """
+        if self._codes is None:
+            self._codes = sorted(name[:-5] for name in os.listdir(self.directory) if name.endswith(".json"))
+        return self._codes
+
+    def __len__(self):
+        return len(self.codes())
+
+    def __contains__(self, code):
+        return code in self._competencies or (self.directory / f"{code}.json").exists()
+
+    def get(self, code):
+        """
+        역량 코드로 역량을 찾습니다.
+        - code: 역량 코드
+        """
+        competency = self._competencies.get(code)
+        if competency is None:
+            path = self.directory / f"{code}.json"
+            if not path.exists():
+                raise CatalogError(f"역량을 찾을 수 없습니다: {code}")
+            competency = load_competency(path)
+            with self._lock:
+                competency = self._competencies.setdefault(code, competency)
+        return competency
+
+    def _build_index(self):
+        index = {"id": {}, "factor": {}, "sub_factor": {}}
+        for code in self.codes():
+            competency = self.get(code)
+            for field, values in index.items():
+                values.setdefault(getattr(competency, field), []).append(competency)
+        return index
+
+    def find(self, id=None, factor=None, sub_factor=None):
+        """
+        요인 정보로 역량을 찾습니다. 여러 조건을 주면 모두 만족하는 역량만 반환합니다.
+        - id: 요인묶음 ID
+        - factor: 대요인
+        - sub_factor: 중요인
+        반환값: 역량 코드 순 목록
+        """
+        if self._index is None:
+            index = self._build_index()
+            with self._lock:
+                if self._index is None:
+                    self._index = index
+        matches = None
+        for field, value in (("id", id), ("factor", factor), ("sub_factor", sub_factor)):
+            if value is None:
+                continue
+            found = {competency.code: competency for competency in self._index[field].get(value, [])}
+            matches = found if matches is None else {code: matches[code] for code in matches if code in found}
+        if matches is None:
+            return [self.get(code) for code in self.codes()]
+        return [matches[code] for code in sorted(matches)]
+
+
+def competency_catalog():
+    """
+    프로세스 전체에서 공유하는 역량 카탈로그를 반환합니다.
+    """
+    return registry.get("competency_catalog", CompetencyCatalog)
+
+
+def get_competency(code):
+    """
+    공유 카탈로그에서 역량 코드로 역량을 찾습니다.
+    - code: 역량 코드
+    """
+    return competency_catalog().get(code)
+
+
+@lru_cache(maxsize=256)
+def _card_image(path, width):
+    from PIL import Image
+
+    with Image.open(path) as image:
+        if image.width > width:
+            image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+        # Streamlit은 PNG/JPEG 바이트는 그대로 전송하지만 다른 형식은 매번 다시 인코딩하므로 PNG로 저장
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def card_image(competency, width=CARD_IMAGE_WIDTH):
+    """
+    역량의 카드 이미지를 표시용 크기로 줄인 PNG 바이트를 반환합니다.
+    처음 요청할 때만 파일을 읽고, 최근 사용한 이미지는 메모리에 보관합니다.
+    - competency: Competency
+    - width: 최대 너비 (px)
+    반환값: PNG 바이트 (이미지가 없으면 None)
+    """
+    path = competency.image_path
+    if path is None or not path.exists():
+        return None
+    return _card_image(str(path), width)
@@ -0,0 +1,179 @@
+"""
+저장된 문항과 거의 같은 문항을 찾는 MinHash/LSH 색인입니다.
+문항(질문 + 선지)을 글자 3-gram 집합으로 보고 Jaccard 유사도를 MinHash 서명으로 근사하며,
+서명을 band로 나눈 해시 버킷으로 후보만 골라 비교하므로 저장된 문항 수와 관계없이
+조회 시간이 거의 일정합니다.
+"""
+import os
+import re
+import threading
+
+import numpy as np
+
+from core.question_store import question_store
+from core.registry import registry
+from core.tracing import span
+
+
+# 이 값 이상의 추정 유사도를 가진 문항을 중복으로 판단 (환경 변수로 변경 가능)
+DEFAULT_THRESHOLD = float(os.environ.get("DTLAB_DUPLICATE_THRESHOLD", "0.7"))
+
+# 서명 길이 = BANDS × ROWS_PER_BAND. 유사도 0.7인 문항이 후보에 오를 확률은 약 99%
+NUM_PERM = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+
+
+def question_text(record):
+    """
+    중복 비교에 사용할 문항 텍스트(질문 + 선지)를 만듭니다.
+    - record: "question", "options" 키를 가진 dict
+    """
+    return "\n".join(part for part in (record.get("question"), record.get("options")) if part)
+
+
+def _normalize(text):
+    # 모든 문항에 공통으로 들어가는 선지 번호는 비교에서 제외
+    text = re.sub(r"선지\s*\d+\)", " ", text)
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+class DuplicateIndex:
+    """
+    MinHash 서명과 LSH 버킷으로 근사 중복 문항을 찾는 메모리 색인입니다.
+    - threshold: 중복으로 판단할 추정 Jaccard 유사도
+    - seed: 해시 함수 생성용 시드 (같은 시드면 같은 서명)
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, seed=1):
+        self.threshold = threshold
+        rng = np.random.RandomState(seed)
+        # multiply-shift 해시 함수 계수 (a는 홀수)
+        self._a = rng.randint(0, 1 << 62, size=(NUM_PERM, 1), dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.randint(0, 1 << 62, size=(NUM_PERM, 1), dtype=np.uint64)
+        self._lock = threading.Lock()
+        self._ids = []
+        self._signatures = np.empty((1024, NUM_PERM), dtype=np.uint32)
+        # band별 {버킷 해시: 행 번호 또는 행 번호 목록}
+        self._buckets = [{} for _ in range(BANDS)]
+
+    def __len__(self):
+        return len(self._ids)
+
+    def signature(self, text):
+        """
+        텍스트의 MinHash 서명을 계산합니다.
+        - text: 문항 텍스트
+        """
+        text = _normalize(text)
+        if len(text) < SHINGLE_SIZE:
+            text = text.ljust(SHINGLE_SIZE)
+        # 유니코드 코드 포인트(21비트) 3개를 64비트 정수 하나로 묶어 3-gram 집합을 만듦
+        codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+        shingles = np.unique((codes[:-2] << np.uint64(42)) | (codes[1:-1] << np.uint64(21)) | codes[2:])
+        # (a·x + b)의 상위 32비트를 해시 값으로 하는 함수 NUM_PERM개를 한 번에 적용한 뒤 최솟값
+        return ((self._a * shingles + self._b) >> np.uint64(32)).min(axis=1).astype(np.uint32)
+
+    @staticmethod
+    def _band_keys(signature):
+        return [hash(band.tobytes()) for band in signature.reshape(BANDS, ROWS_PER_BAND)]
+
+    def add(self, item_id, text):
+        """
+        문항을 색인에 추가합니다.
+        - item_id: 문항 ID
+        - text: 문항 텍스트
+        """
+        signature = self.signature(text)
+        with self._lock:
+            row = len(self._ids)
+            if row == len(self._signatures):
+                self._signatures = np.concatenate([self._signatures, np.empty_like(self._signatures)])
+            self._signatures[row] = signature
+            self._ids.append(item_id)
+            for buckets, key in zip(self._buckets, self._band_keys(signature)):
+                current = buckets.get(key)
+                if current is None:
+                    buckets[key] = row
+                elif isinstance(current, list):
+                    current.append(row)
+                else:
+                    buckets[key] = [current, row]
+
+    def query(self, text, threshold=None, limit=5):
+        """
+        텍스트와 거의 같은 문항을 유사도가 높은 순으로 반환합니다.
+        - text: 문항 텍스트
+        - threshold: 중복 판단 기준 (None이면 색인 기본값)
+        - limit: 최대 반환 개수
+        반환값: [{"id", "similarity"}]
+        """
+        threshold = self.threshold if threshold is None else threshold
+        if not text.strip():
+            return []
+        signature = self.signature(text)
+        with self._lock:
+            candidates = set()
+            for buckets, key in zip(self._buckets, self._band_keys(signature)):
+                rows = buckets.get(key)
+                if rows is None:
+                    continue
+                if isinstance(rows, list):
+                    candidates.update(rows)
+                else:
+                    candidates.add(rows)
+            if not candidates:
+                return []
+            rows = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            similarity = (self._signatures[rows] == signature).mean(axis=1)
+            ids = [self._ids[row] for row in rows]
+
+        order = np.argsort(-similarity, kind="stable")
+        return [
+            {"id": ids[i], "similarity": float(similarity[i])}
+            for i in order[:limit] if similarity[i] >= threshold
+        ]
+
+    @classmethod
+    def from_records(cls, records, threshold=DEFAULT_THRESHOLD):
+        """
+        문항 목록으로 색인을 만듭니다.
+        - records: "id", "question", "options" 키를 가진 dict 목록
+        """
+        index = cls(threshold=threshold)
+        for record in records:
+            index.add(record["id"], question_text(record))
+        return index
+
+
+def duplicate_index():
+    """
+    문항 저장소의 모든 문항(채택 + 폐기)으로 만든, 프로세스 전체에서 공유하는 색인을 반환합니다.
+    """
+    return registry.get("duplicate_index", lambda: DuplicateIndex.from_records(question_store().query()))
+
+
+_save_lock = threading.Lock()
+
+
+def save_unique_question(record, store=None, index=None):
+    """
+    거의 같은 문항이 저장되어 있지 않을 때만 문항을 저장합니다.
+    - record: QuestionStore.save()에 전달할 문항
+    - store, index: 문항 저장소와 중복 색인 (None이면 공유 인스턴스)
+    반환값: (저장한 문항 ID 또는 None, 중복 문항 목록)
+    """
+    # 빈 색인도 len()이 0이라 거짓이므로 None인지로 확인
+    store = question_store() if store is None else store
+    index = duplicate_index() if index is None else index
+    text = question_text(record)
+    # 여러 세션이 같은 문항을 동시에 저장하지 않도록 확인과 저장을 함께 잠금
+    with span("question.save", status=record.get("status", "accepted")) as s, _save_lock:
+        duplicates = index.query(text)
+        s.set(duplicate=bool(duplicates))
+        if duplicates:
+            return None, duplicates
+        question_id = store.save(record)
+        index.add(question_id, text)
+    return question_id, []
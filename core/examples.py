@@ -0,0 +1,112 @@
+"""
+few-shot 예제 라이브러리와 예제 선택용 유사도 색인입니다.
+예제는 data/examples/<이름>.json 파일에서 읽으며, 요청마다 가장 관련 있는 예제만
+토큰 예산 안에서 골라 프롬프트에 넣습니다.
+"""
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+
+from core.registry import registry
+from core.tokens import count_tokens
+
+
+EXAMPLES_DIR = Path(__file__).resolve().parent.parent / "data" / "examples"
+
+# 요청당 예제 수와 예제에 쓸 최대 토큰 수 (환경 변수로 변경 가능)
+DEFAULT_EXAMPLE_COUNT = int(os.environ.get("DTLAB_EXAMPLE_COUNT", "2"))
+DEFAULT_EXAMPLE_TOKEN_BUDGET = int(os.environ.get("DTLAB_EXAMPLE_TOKEN_BUDGET", "800"))
+
+
+# langchain FewShotPromptTemplate과 같은 예제 형식과 구분자
+EXAMPLE_TEMPLATE = "Input: {input}\nOutput: {output}\n"
+EXAMPLE_SEPARATOR = "\n\n"
+
+
+def format_example(example):
+    """
+    예제 하나를 프롬프트에 들어갈 텍스트로 만듭니다.
+    - example: {"input", "output"}
+    """
+    return EXAMPLE_TEMPLATE.format(input=example["input"], output=example["output"])
+
+
+def join_few_shot(prefix, example_texts, suffix):
+    """
+    FewShotPromptTemplate.format()과 같은 방식으로 접두어, 예제, 접미어를 이어 붙입니다.
+    - prefix: 접두어
+    - example_texts: format_example()로 만든 예제 텍스트 목록
+    - suffix: 변수를 채운 접미어
+    """
+    return EXAMPLE_SEPARATOR.join(piece for piece in (prefix, *example_texts, suffix) if piece)
+
+
+def load_examples(name, directory=EXAMPLES_DIR):
+    """
+    예제 라이브러리 파일을 읽습니다.
+    - name: 라이브러리 이름 (예: "P4-3-1")
+    - directory: 예제 파일 디렉터리
+    반환값: [{"id", "input", "output"}]
+    """
+    with open(Path(directory) / f"{name}.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def formatted_examples(name):
+    """
+    예제 라이브러리의 모든 예제를 프롬프트 텍스트로 만들어 반환합니다 (라이브러리별로 한 번만 생성).
+    - name: 라이브러리 이름
+    """
+    return tuple(format_example(example) for example in load_examples(name))
+
+
+class ExampleIndex:
+    """
+    글자 n-gram TF-IDF로 예제와 요청의 유사도를 계산하는 색인입니다.
+    예제 벡터와 토큰 수는 만들 때 한 번만 계산합니다.
+    - examples: [{"id", "input", "output"}]
+    - model: 토큰 수 계산 기준 모델
+    """
+
+    def __init__(self, examples, model="gpt-4"):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        self.examples = list(examples)
+        # 한국어는 띄어쓰기 단위가 일정하지 않아 단어 대신 글자 n-gram 사용
+        self._vectorizer = TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 4), sublinear_tf=True)
+        self._matrix = self._vectorizer.fit_transform(
+            f"{example['input']}\n{example['output']}" for example in self.examples
+        )
+        # 예제 텍스트와 토큰 수는 미리 계산 (요청마다 다시 만들지 않음)
+        self.formatted = [format_example(example) for example in self.examples]
+        self.token_counts = [count_tokens(text, model) for text in self.formatted]
+
+    def select(self, query, k=DEFAULT_EXAMPLE_COUNT, token_budget=DEFAULT_EXAMPLE_TOKEN_BUDGET):
+        """
+        요청과 가장 관련 있는 예제를 토큰 예산 안에서 최대 k개 고릅니다.
+        예산을 넘는 예제는 건너뛰고 다음으로 관련 있는 예제를 확인합니다.
+        - query: 요청 내용 (부서, 주제 등)
+        - k: 최대 예제 수
+        - token_budget: 선택한 예제의 토큰 수 합계 상한
+        반환값: 관련도 순 예제 번호 목록 (self.examples / self.formatted의 위치)
+        """
+        scores = (self._matrix @ self._vectorizer.transform([query]).T).toarray().ravel()
+        selected, used = [], 0
+        for i in sorted(range(len(self.examples)), key=lambda i: -scores[i]):
+            if len(selected) == k:
+                break
+            if used + self.token_counts[i] > token_budget:
+                continue
+            selected.append(i)
+            used += self.token_counts[i]
+        return selected
+
+
+def example_index(name):
+    """
+    프로세스 전체에서 공유하는 예제 색인을 반환합니다.
+    - name: 라이브러리 이름 (예: "P4-3-1")
+    """
+    return registry.get(f"examples:{name}", lambda: ExampleIndex(load_examples(name)))
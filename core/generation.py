@@ -0,0 +1,199 @@
+import dataclasses
+import logging
+import sqlite3
+
+from core.llm import ChatStream, chat_completion, chat_with_client
+from core.passage_prompts import DEFAULT_COMPETENCY as DEFAULT_PASSAGE_COMPETENCY, build_passage_messages
+from core.question_parser import StreamingQuestionParser, parse_answer, parse_options, parse_structured
+from core.question_prompts import DEFAULT_COMPETENCY, build_question_messages
+from core.registry import chat_client
+from core.token_caps import token_caps
+from core.tracing import span
+
+
+_log = logging.getLogger(__name__)
+
+# 문항 생성 모델 설정 (QUESTION_MAX_TOKENS는 상한 계산 전의 최댓값)
+QUESTION_MODEL = "gpt-4-turbo"
+QUESTION_TEMPERATURE = 0.5
+QUESTION_MAX_TOKENS = 1500
+
+# 해설 뒤에 few-shot 예제 형식을 이어 쓰거나 다음 문항을 시작하면 생성을 멈추는 정지 시퀀스
+QUESTION_STOP = ("\nInput:", "\n\n[질문]")
+
+# 지문 생성(passage 생성기) 모델 설정
+PASSAGE_MODEL = "gpt-4-turbo"
+PASSAGE_TEMPERATURE = 0.4
+PASSAGE_MAX_TOKENS = 500
+
+# 이 개수 이하의 구역만 잘못되었을 때 전체 재생성 대신 해당 구역만 보완
+MAX_REPAIR_SECTIONS = 1
+
+# 구역별 보완 요청 설정: (표시, 출력 형식, max_tokens)
+REPAIR_SETTINGS = {
+    "question": ("[질문]", "상황 설명과 객관식 질문 문장 (표시 없이 본문만)", 600),
+    "options": ("[선지]", "선지 1) 내용\n선지 2) 내용\n선지 3) 내용\n선지 4) 내용", 400),
+    "answer": ("정답)", "정답 선지 번호 숫자 하나 (1~4)", 5),
+    "explanation": ("해설)", "정답인 이유를 설명하는 2~3문장 (표시 없이 본문만)", 400),
+}
+
+
+def question_max_tokens(competency, difficulty, default):
+    """
+    문항 생성 요청의 max_tokens를 반환합니다.
+    저장된 문항이 충분하면 (역량, 난이도)별 응답 길이 분포로 정한 상한을, 아니면 default를 사용합니다.
+    - competency: 역량 코드
+    - difficulty: 난이도
+    - default: 프롬프트의 난이도별 기본값 (build_question_messages() 반환값)
+    """
+    try:
+        return token_caps().cap(competency, difficulty, default)
+    except (sqlite3.Error, OSError):
+        # 문항 저장소를 열지 못해도 생성은 기본값으로 진행
+        return default
+    except Exception:
+        # 예상하지 못한 오류는 기록하고 기본값으로 진행 (상한 계산 때문에 생성이 실패하지 않도록)
+        _log.exception("max_tokens 상한을 계산하지 못해 기본값을 사용합니다.")
+        return default
+
+
+def question_end_detector():
+    """
+    스트리밍 중 구조화된 문항([질문]~해설)이 끝난 위치를 찾는 함수를 반환합니다 (ChatStream의 stop_when).
+    """
+    parser = StreamingQuestionParser()
+
+    def _detect(delta):
+        parser.feed(delta)
+        return parser.end()
+
+    return _detect
+
+
+def generate_question(company, department, topic, difficulty, bypass_cache=False, competency=DEFAULT_COMPETENCY,
+                      context=""):
+    """
+    객관식 문항 하나를 생성합니다.
+    - company: 기업명
+    - department: 부서명
+    - topic: 문항 주제 (뉴스 기반 키워드 등)
+    - difficulty: 난이도 ("하", "중", "상")
+    - bypass_cache: True면 캐시된 응답을 사용하지 않고 새로 생성
+    - competency: 역량 코드
+    - context: 프롬프트에 넣을 교안 내용 (core.retrieval.retrieve_context() 결과)
+    반환값: 생성된 문항 원문
+    """
+    messages, default_max_tokens = build_question_messages(
+        company, department, topic, difficulty, competency=competency, context=context
+    )
+    max_tokens = question_max_tokens(competency, difficulty, default_max_tokens)
+    chat = chat_client(model=QUESTION_MODEL, temperature=QUESTION_TEMPERATURE, max_tokens=max_tokens)
+    raw = chat_with_client(chat, messages, bypass_cache=bypass_cache, stop=QUESTION_STOP).content
+    # 정지 시퀀스로 잡지 못한 뒤쪽 텍스트는 스트리밍과 같은 기준으로 잘라냄
+    end = question_end_detector()(raw)
+    return raw[:end] if end is not None else raw
+
+
+def stream_question(company, department, topic, difficulty, bypass_cache=False, competency=DEFAULT_COMPETENCY,
+                    context=""):
+    """
+    객관식 문항 하나를 토큰 단위로 스트리밍하며 생성합니다.
+    인자는 generate_question()과 같고, generate_question()과 캐시를 공유합니다.
+    반환값: ChatStream (반복하면 텍스트 조각 반환, 완료 후 text/time_to_first_token/total_seconds 확인)
+    문항이 끝나면(해설 뒤 다음 예제나 다음 문항 표시) 남은 생성을 받지 않고 스트림을 닫습니다.
+    """
+    messages, default_max_tokens = build_question_messages(
+        company, department, topic, difficulty, competency=competency, context=context
+    )
+    # langchain 클라이언트 없이 같은 설정으로 스트리밍 (캐시 키 동일)
+    return ChatStream(
+        QUESTION_MODEL, messages, bypass_cache=bypass_cache, stop_when=question_end_detector(),
+        temperature=QUESTION_TEMPERATURE, max_tokens=question_max_tokens(competency, difficulty, default_max_tokens),
+        stop=list(QUESTION_STOP),
+    )
+
+
+def stream_passage(user_input, bypass_cache=False, competency=DEFAULT_PASSAGE_COMPETENCY, context=""):
+    """
+    지문 하나를 토큰 단위로 스트리밍하며 생성합니다 (passage 생성기 역량).
+    - user_input: build_passage_input()으로 만든 요청 문장
+    - bypass_cache: True면 캐시된 응답을 사용하지 않고 새로 생성
+    - competency: 역량 코드
+    - context: 프롬프트에 넣을 교안 내용 (core.retrieval.retrieve_context() 결과)
+    반환값: ChatStream
+    """
+    return ChatStream(
+        PASSAGE_MODEL, build_passage_messages(user_input, competency, context), bypass_cache=bypass_cache,
+        temperature=PASSAGE_TEMPERATURE, max_tokens=PASSAGE_MAX_TOKENS,
+    )
+
+
+def _repair_value(section, text):
+    # 보완 응답에서 해당 구역 값만 읽음 (모델이 표시를 붙여 답해도 처리)
+    label = REPAIR_SETTINGS[section][0]
+    text = text.strip()
+    if text.startswith(label):
+        text = text[len(label):].strip()
+    if section == "options":
+        return parse_options(text)
+    if section == "answer":
+        return parse_answer(text)
+    return text
+
+
+def repair_question(parsed, topic, bypass_cache=False):
+    """
+    잘못된 구역이 MAX_REPAIR_SECTIONS개 이하이면 그 구역만 짧은 후속 요청으로 다시 작성합니다.
+    - parsed: parse_structured() 결과
+    - topic: 문항 주제
+    - bypass_cache: True면 캐시된 응답을 사용하지 않음
+    반환값: (보완한 ParsedQuestion 또는 None, 보완을 시도한 구역 목록)
+    None이면 잘못된 구역이 너무 많거나 보완 후에도 형식이 맞지 않으므로 전체를 다시 생성해야 합니다.
+    """
+    problems = parsed.problems()
+    if not problems or len(problems) > MAX_REPAIR_SECTIONS:
+        return (parsed if not problems else None), problems
+
+    repaired = parsed
+    for section in problems:
+        label, output_format, max_tokens = REPAIR_SETTINGS[section]
+        prompt = (
+            f"아래 객관식 문항에서 {label} 부분이 누락되었거나 형식이 맞지 않습니다.\n"
+            f"'{topic}' 주제와 나머지 부분에 맞게 {label} 부분만 다시 작성하세요. 다른 부분은 출력하지 마세요.\n\n"
+            f"출력 형식:\n{output_format}\n\n"
+            f"문항:\n{repaired.to_text()}"
+        )
+        with span("question.repair", section=section):
+            response = chat_completion(
+                model=QUESTION_MODEL,
+                messages=[
+                    {"role": "system", "content": "당신은 시험 문제의 형식 오류를 고치는 AI 비서입니다."},
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=0.2,
+                max_tokens=max_tokens,
+                bypass_cache=bypass_cache,
+            )
+        value = _repair_value(section, response["choices"][0]["message"]["content"])
+        repaired = dataclasses.replace(repaired, **{section: value})
+
+    return (repaired if repaired.is_valid else None), problems
+
+
+def generate_parsed_question(company, department, topic, difficulty, bypass_cache=False, competency=DEFAULT_COMPETENCY,
+                             context=""):
+    """
+    문항을 생성하고 구역별로 분리한 결과를 함께 반환합니다.
+    한 구역만 잘못되었으면 그 구역만 보완합니다.
+    인자는 generate_question()과 같습니다.
+    반환값: {"raw", "question", "options", "answer", "explanation", "repaired"}
+    ("repaired"는 보완한 구역 목록, 보완하지 못하면 "raw"는 원래 응답)
+    """
+    raw = generate_question(
+        company, department, topic, difficulty, bypass_cache=bypass_cache, competency=competency, context=context
+    )
+    parsed = parse_structured(raw)
+    repaired, problems = repair_question(parsed, topic, bypass_cache=bypass_cache)
+    if repaired is not None and problems:
+        return {"raw": repaired.to_text(), **repaired.to_dict(), "repaired": problems}
+    return {"raw": raw, **parsed.to_dict(), "repaired": []}
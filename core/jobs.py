@@ -0,0 +1,415 @@
+"""
+오래 걸리는 작업(문항/지문 생성, PDF 처리)을 페이지 실행과 분리해 처리하는 작업 대기열입니다.
+작업 상태, 진행률, 중간 결과, 최종 결과를 SQLite(WAL)에 저장하므로 사용자가 다른 페이지로 이동해도
+작업은 계속 진행되고, 페이지는 작업 ID로 진행 상황과 결과를 다시 조회합니다.
+
+작업은 같은 프로세스의 작업자 스레드 풀에서 실행합니다. 모델 호출은 대부분 응답 대기 시간이므로
+스레드로 충분하며, PDF 분할처럼 CPU를 쓰는 처리는 작업 함수 안에서 프로세스 풀을 사용합니다.
+작업 종류별 처리 함수는 job_handler()로 등록합니다 (기본 작업은 core.tasks).
+작업 저장소 하나는 앱 프로세스 하나만 사용한다고 가정하며, 시작할 때 이전 프로세스가 실행하다 중단된 작업을 다시 대기시킵니다.
+작업 입력 파일(submit()의 input)은 대기열이 관리합니다. 새 작업을 추가할 때만 기록하고, 처리 함수가 사용 후 삭제하며,
+대기 중에 취소되거나 보관 기간이 지나 정리된 작업의 파일과 어느 작업도 가리키지 않는 파일은 대기열이 삭제합니다.
+
+환경 변수:
+- DTLAB_JOB_DB: 작업 저장소 경로 (기본값 .cache/jobs.sqlite3)
+- DTLAB_JOB_WORKERS: 작업자 스레드 수 (기본값 4)
+- DTLAB_JOB_RETENTION_DAYS: 끝난 작업을 보관할 기간 (기본값 7)
+- DTLAB_JOB_INPUT_DIR: 작업 입력 파일(업로드한 PDF 등) 디렉터리 (기본값 .cache/job_inputs)
+"""
+import importlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from core.ratelimit import rate_limit_session
+from core.registry import registry
+from core.tracing import span
+
+
+_CACHE_DIR = Path(os.environ.get("DTLAB_CACHE_DIR", ".cache"))
+DEFAULT_JOB_DB = Path(os.environ.get("DTLAB_JOB_DB", _CACHE_DIR / "jobs.sqlite3"))
+JOB_INPUT_DIR = Path(os.environ.get("DTLAB_JOB_INPUT_DIR", _CACHE_DIR / "job_inputs"))
+DEFAULT_WORKERS = int(os.environ.get("DTLAB_JOB_WORKERS", "4"))
+RETENTION_SECONDS = float(os.environ.get("DTLAB_JOB_RETENTION_DAYS", "7")) * 86400
+
+ACTIVE_STATUSES = ("queued", "running")
+FINISHED_STATUSES = ("done", "error", "cancelled")
+
+# 진행 상황을 저장소에 기록하는 최소 간격 (초). 스트리밍 토큰마다 기록하지 않도록 제한
+PROGRESS_INTERVAL = 0.25
+
+# 새 작업 알림이 없을 때 대기열을 다시 확인하는 간격 (초)
+POLL_SECONDS = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    owner TEXT,
+    dedupe_key TEXT,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    partial TEXT,
+    result TEXT,
+    error TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    input_path TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+CREATE INDEX IF NOT EXISTS jobs_dedupe ON jobs (kind, dedupe_key, status);
+CREATE INDEX IF NOT EXISTS jobs_owner ON jobs (owner, id);
+"""
+
+# 조회 시 반환하는 열 (요청 내용은 크기가 클 수 있어 제외)
+_JOB_COLUMNS = (
+    "id", "kind", "owner", "status", "progress", "message", "partial", "result", "error",
+    "created_at", "started_at", "finished_at",
+)
+
+_HANDLERS = {}
+
+
+def job_handler(kind):
+    """
+    작업 종류의 처리 함수를 등록하는 데코레이터입니다.
+    처리 함수는 (요청 내용 dict, JobContext)를 받아 JSON으로 저장할 수 있는 결과를 반환합니다.
+    - kind: 작업 종류 이름
+    """
+    def decorator(func):
+        _HANDLERS[kind] = func
+        return func
+    return decorator
+
+
+class JobCancelled(Exception):
+    """
+    실행 중인 작업이 취소 요청을 받았을 때 처리 함수 안에서 발생하는 예외입니다.
+    """
+
+
+class JobContext:
+    """
+    처리 함수에 전달되는 실행 중인 작업 정보입니다. progress()로 진행 상황을 기록하며,
+    취소 요청이 있으면 progress()에서 JobCancelled가 발생합니다.
+    """
+
+    def __init__(self, queue, job_id):
+        self.queue = queue
+        self.job_id = job_id
+        self._last_write = 0.0
+
+    def progress(self, fraction=None, message=None, partial=None, force=False):
+        """
+        진행 상황을 기록합니다. PROGRESS_INTERVAL보다 자주 호출하면 force가 아닌 한 건너뜁니다.
+        - fraction: 진행률 (0~1, None이면 유지)
+        - message: 진행 상황 안내 (None이면 유지)
+        - partial: 지금까지 만든 중간 결과 (스트리밍 중인 텍스트 등, None이면 유지)
+        """
+        now = time.monotonic()
+        if not force and now - self._last_write < PROGRESS_INTERVAL:
+            return
+        self._last_write = now
+        if self.queue._update_progress(self.job_id, fraction, message, partial):
+            raise JobCancelled()
+
+
+class JobQueue:
+    """
+    SQLite에 작업을 저장하고 작업자 스레드 풀에서 실행하는 대기열입니다.
+    - path: 작업 저장소 경로
+    - workers: 작업자 스레드 수
+    - handlers: {작업 종류: 처리 함수} (None이면 job_handler()로 등록한 함수와 core.tasks 사용)
+    - input_dir: 작업 입력 파일 디렉터리
+    """
+
+    def __init__(self, path=DEFAULT_JOB_DB, workers=DEFAULT_WORKERS, handlers=None, input_dir=JOB_INPUT_DIR):
+        self.path = Path(path)
+        self.workers = workers
+        self.input_dir = Path(input_dir)
+        self._handlers = handlers
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition()
+        self._stopping = threading.Event()
+        self._threads = []
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "input_path" not in columns:
+            # 입력 파일 경로 열이 없던 저장소
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN input_path TEXT")
+
+    def start(self):
+        """
+        중단된 작업을 다시 대기시키고 오래된 작업과 그 입력 파일, 어느 작업도 가리키지 않는 입력 파일을
+        정리한 뒤 작업자 스레드를 시작합니다.
+        반환값: self
+        """
+        if self._handlers is None:
+            # 기본 작업 처리 함수 등록 (모델/PDF 모듈은 작업자를 시작할 때만 불러옴)
+            importlib.import_module("core.tasks")
+            self._handlers = _HANDLERS
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'queued', started_at = NULL, progress = 0 WHERE status = 'running'"
+            )
+            purged = self._conn.execute(
+                f"DELETE FROM jobs WHERE status IN ({', '.join('?' for _ in FINISHED_STATUSES)}) AND finished_at < ? "
+                "RETURNING input_path",
+                (*FINISHED_STATUSES, time.time() - RETENTION_SECONDS),
+            ).fetchall()
+            active = {
+                row["input_path"] for row in self._conn.execute(
+                    "SELECT input_path FROM jobs WHERE status IN (?, ?) AND input_path IS NOT NULL", ACTIVE_STATUSES
+                )
+            }
+        for row in purged:
+            _remove_input(row["input_path"])
+        # 이전 프로세스가 비정상 종료되어 처리 함수가 지우지 못한 입력 파일 정리 (대기 중인 작업의 파일은 유지)
+        cleanup_job_inputs(self.input_dir, keep=active)
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout=None):
+        """
+        작업자 스레드를 종료합니다. 실행 중인 작업은 끝날 때까지 기다립니다.
+        """
+        self._stopping.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, kind, payload, owner=None, dedupe_key=None, input=None):
+        """
+        작업을 대기열에 추가하고 작업 ID를 반환합니다.
+        - kind: 작업 종류
+        - payload: 처리 함수에 전달할 요청 내용 (JSON으로 저장할 수 있는 dict)
+        - owner: 작업을 요청한 세션 (목록 조회와 모델 호출 속도 제한의 세션 구분에 사용)
+        - dedupe_key: 같은 종류와 키의 작업이 대기 중이거나 실행 중이면 새로 추가하지 않고 그 작업 ID를 반환
+        - input: 작업 입력 파일 (파일 이름, 바이트). 새 작업을 추가할 때만 기록하며 경로는 payload["path"]로 전달
+        """
+        if self._handlers is not None and kind not in self._handlers:
+            raise ValueError(f"알 수 없는 작업 종류입니다: {kind}")
+        with self._lock:
+            if dedupe_key is not None:
+                row = self._conn.execute(
+                    "SELECT id FROM jobs WHERE kind = ? AND dedupe_key = ? AND status IN (?, ?) ORDER BY id LIMIT 1",
+                    (kind, dedupe_key, *ACTIVE_STATUSES),
+                ).fetchone()
+                if row is not None:
+                    return row["id"]
+            # 같은 키의 작업이 이미 끝나 입력 파일을 지웠을 수 있으므로 새 작업마다 파일을 새로 기록
+            input_path = None
+            if input is not None:
+                input_path = str(write_job_input(*input, root=self.input_dir))
+                payload = {**payload, "path": input_path}
+            try:
+                cursor = self._conn.execute(
+                    "INSERT INTO jobs (kind, owner, dedupe_key, payload, status, created_at, input_path) "
+                    "VALUES (?, ?, ?, ?, 'queued', ?, ?)",
+                    (kind, owner, dedupe_key, json.dumps(payload, ensure_ascii=False), time.time(), input_path),
+                )
+            except BaseException:
+                _remove_input(input_path)
+                raise
+            job_id = cursor.lastrowid
+        with self._wakeup:
+            self._wakeup.notify()
+        return job_id
+
+    @staticmethod
+    def _job(row):
+        job = {column: row[column] for column in _JOB_COLUMNS}
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        return job
+
+    def get(self, job_id):
+        """
+        작업의 상태, 진행률, 중간 결과, 결과를 반환합니다. 없는 작업이면 None을 반환합니다.
+        대기 중인 작업은 앞에 있는 대기 작업 수("ahead")를 함께 반환합니다.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_JOB_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            job = self._job(row)
+            if job["status"] == "queued":
+                job["ahead"] = self._conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND id < ?", (job_id,)
+                ).fetchone()[0]
+        return job
+
+    def list(self, owner=None, kind=None, limit=20):
+        """
+        최근 작업 목록을 반환합니다.
+        - owner, kind: 지정하면 해당 요청자/종류의 작업만 반환
+        """
+        clauses, params = [], []
+        for column, value in (("owner", owner), ("kind", kind)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_JOB_COLUMNS)} FROM jobs {where} ORDER BY id DESC LIMIT ?", (*params, limit)
+            ).fetchall()
+        return [self._job(row) for row in rows]
+
+    def cancel(self, job_id):
+        """
+        작업을 취소합니다. 대기 중인 작업은 바로 취소하고 입력 파일을 삭제하며,
+        실행 중인 작업은 다음 진행 기록 때 중단합니다 (입력 파일은 처리 함수가 삭제).
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ? AND status = 'queued' "
+                "RETURNING input_path",
+                (time.time(), job_id),
+            ).fetchone()
+            self._conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = 'running'", (job_id,))
+        if row is not None:
+            _remove_input(row["input_path"])
+
+    def counts(self):
+        """
+        상태별 작업 수를 반환합니다.
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def _claim(self):
+        # 가장 오래 기다린 작업 하나를 실행 중으로 바꾸면서 가져옴 (한 문장이므로 작업자끼리 겹치지 않음)
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE jobs SET status = 'running', started_at = ? "
+                "WHERE id = (SELECT id FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1) "
+                "RETURNING id, kind, owner, payload, created_at, started_at",
+                (time.time(),),
+            ).fetchone()
+
+    def _update_progress(self, job_id, fraction, message, partial):
+        # 진행 상황을 기록하고 취소 요청 여부를 반환
+        with self._lock:
+            row = self._conn.execute(
+                "UPDATE jobs SET progress = COALESCE(?, progress), message = COALESCE(?, message), "
+                "partial = COALESCE(?, partial) WHERE id = ? RETURNING cancel_requested",
+                (fraction, message, partial, job_id),
+            ).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    def _finish(self, job_id, status, result=None, error=None):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, "
+                "progress = CASE WHEN ? = 'done' THEN 1 ELSE progress END WHERE id = ?",
+                (status, json.dumps(result, ensure_ascii=False) if result is not None else None, error,
+                 time.time(), status, job_id),
+            )
+
+    def _work(self):
+        while not self._stopping.is_set():
+            job = self._claim()
+            if job is None:
+                with self._wakeup:
+                    self._wakeup.wait(POLL_SECONDS)
+                continue
+            self._run(job)
+
+    def _run(self, job):
+        handler = self._handlers.get(job["kind"])
+        wait_ms = round((job["started_at"] - job["created_at"]) * 1000, 1)
+        with span("job.run", kind=job["kind"], job_id=job["id"], wait_ms=wait_ms) as s:
+            if handler is None:
+                self._finish(job["id"], "error", error=f"알 수 없는 작업 종류입니다: {job['kind']}")
+                s.set(status="error")
+                return
+            try:
+                # 모델 호출은 요청한 세션 단위로 번갈아 허가받음 (core.ratelimit)
+                with rate_limit_session(job["owner"] or f"job-{job['id']}"):
+                    result = handler(json.loads(job["payload"]), JobContext(self, job["id"]))
+            except JobCancelled:
+                self._finish(job["id"], "cancelled")
+                s.set(status="cancelled")
+            except Exception as e:
+                self._finish(job["id"], "error", error=str(e))
+                s.set(status="error")
+            else:
+                self._finish(job["id"], "done", result=result)
+                s.set(status="done")
+
+
+def write_job_input(name, data, root=JOB_INPUT_DIR):
+    """
+    작업에 넘길 파일(업로드한 PDF 등)을 작업 입력 디렉터리에 기록하고 경로를 반환합니다.
+    세션과 관계없이 작업이 끝날 때까지 남아 있으며, 처리 함수가 사용 후 삭제합니다.
+    호출할 때마다 새 파일을 만드므로 여러 세션이 같은 이름으로 기록해도 서로의 파일을 덮어쓰거나
+    다른 작업이 지운 파일을 가리키지 않습니다.
+    - name: 파일 이름 (디렉터리 부분은 무시하고 앞부분과 확장자만 사용)
+    - data: 파일 바이트
+    - root: 작업 입력 디렉터리
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    name = Path(name)
+    fd, path = tempfile.mkstemp(dir=root, prefix=f"{name.stem}-", suffix=name.suffix)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return Path(path)
+
+
+def cleanup_job_inputs(root=JOB_INPUT_DIR, keep=()):
+    """
+    어느 대기 중이거나 실행 중인 작업도 가리키지 않는 작업 입력 파일(비정상 종료로 남은 파일)을 삭제합니다.
+    작업 저장소를 사용하는 프로세스가 하나뿐이라고 가정하므로 JobQueue.start()에서 작업자를 시작하기 전에 호출합니다.
+    - root: 작업 입력 디렉터리
+    - keep: 남겨 둘 파일 경로 (대기 중이거나 실행 중인 작업의 입력 파일)
+    반환값: 삭제한 파일 수
+    """
+    root = Path(root)
+    if not root.exists():
+        return 0
+    keep = {str(Path(path).resolve()) for path in keep}
+    removed = 0
+    for entry in os.scandir(root):
+        if entry.is_file() and str(Path(entry.path).resolve()) not in keep:
+            Path(entry.path).unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+def _remove_input(path):
+    if path is not None:
+        Path(path).unlink(missing_ok=True)
+
+
+def job_queue():
+    """
+    프로세스 전체에서 공유하는 작업 대기열을 반환합니다 (처음 요청할 때 작업자 시작).
+    """
+    return registry.get("job_queue", lambda: JobQueue().start())
@@ -0,0 +1,129 @@
+import re
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
+
+
+# 특수문자 제거용 패턴 (한국어, 영어, 숫자, 공백만 유지)
+_CLEAN_PATTERN = re.compile(r"[^가-힣a-zA-Z0-9\s]")
+
+WEIGHTINGS = ("count", "tfidf")
+
+
+def clean_text(text):
+    """
+    키워드 추출 전에 특수문자를 제거합니다.
+    - text: 텍스트 (문자열)
+    """
+    return _CLEAN_PATTERN.sub("", text)
+
+
+def top_n_indices_per_row(matrix, top_n):
+    """
+    희소 행렬의 각 행에서 값이 큰 순서대로 열 인덱스 top_n개를 구합니다.
+    행 단위 반복 없이 전체 비영(非零) 원소를 한 번에 정렬합니다.
+    - matrix: scipy 희소 행렬 (문서 x 단어)
+    - top_n: 행마다 추출할 개수
+    동점인 경우 열 인덱스(사전순 단어)가 작은 쪽을 우선합니다.
+    """
+    matrix = sparse.csr_matrix(matrix)
+    matrix.sum_duplicates()
+    n_rows = matrix.shape[0]
+    if matrix.nnz == 0 or top_n <= 0:
+        return [np.empty(0, dtype=matrix.indices.dtype) for _ in range(n_rows)]
+
+    rows = np.repeat(np.arange(n_rows), np.diff(matrix.indptr))
+    # 1순위: 행, 2순위: 값 내림차순, 3순위: 열 인덱스
+    order = np.lexsort((matrix.indices, -matrix.data, rows))
+    rank = np.arange(matrix.nnz) - matrix.indptr[rows]
+    keep = order[rank < top_n]
+
+    counts = np.bincount(rows[keep], minlength=n_rows)
+    return np.split(matrix.indices[keep], np.cumsum(counts)[:-1])
+
+
+class KeywordEngine:
+    """
+    전체 청크에 대해 벡터라이저를 한 번만 학습하고,
+    하나의 희소 문서-단어 행렬에서 청크별/문서별 키워드를 계산합니다.
+    - ngram_range: n-그램 범위
+    - stop_words: 불용어 설정
+    - weighting: "count" (빈도) 또는 "tfidf"
+    """
+
+    def __init__(self, ngram_range=(1, 2), stop_words="english", weighting="count"):
+        if weighting not in WEIGHTINGS:
+            raise ValueError(f"지원하지 않는 가중치 방식입니다: {weighting}")
+        self.ngram_range = ngram_range
+        self.stop_words = stop_words
+        self.weighting = weighting
+        self.vectorizer = None
+        self.matrix = None
+        self.terms = np.empty(0, dtype=object)
+
+    def fit(self, texts):
+        """
+        청크 텍스트 목록으로 벡터라이저를 학습하고 문서-단어 행렬을 만듭니다.
+        - texts: 청크 텍스트 목록
+        """
+        cleaned = [clean_text(text) for text in texts]
+        self.vectorizer = CountVectorizer(
+            ngram_range=self.ngram_range,  # 1-그램과 2-그램 추출
+            stop_words=self.stop_words  # 영어 불용어 제거
+        )
+        try:
+            counts = self.vectorizer.fit_transform(cleaned)
+            self.terms = self.vectorizer.get_feature_names_out()
+        except ValueError:
+            # 모든 청크가 불용어/특수문자로만 이루어진 경우 (빈 어휘집)
+            counts = sparse.csr_matrix((len(cleaned), 0), dtype=np.int64)
+            self.terms = np.empty(0, dtype=object)
+
+        if self.weighting == "tfidf" and counts.shape[1] > 0:
+            self.matrix = TfidfTransformer().fit_transform(counts).tocsr()
+        else:
+            self.matrix = counts.tocsr()
+        return self
+
+    def _check_fitted(self):
+        if self.matrix is None:
+            raise RuntimeError("fit()을 먼저 호출해야 합니다.")
+
+    def top_terms_per_chunk(self, top_n=5):
+        """
+        청크별 상위 키워드 목록을 반환합니다.
+        - top_n: 청크마다 추출할 키워드 개수
+        """
+        self._check_fitted()
+        return [
+            self.terms[indices].tolist()
+            for indices in top_n_indices_per_row(self.matrix, top_n)
+        ]
+
+    def top_terms_for_document(self, top_n=20):
+        """
+        문서 전체에서 가중치 합이 큰 상위 키워드와 점수를 반환합니다.
+        - top_n: 추출할 키워드 개수
+        """
+        self._check_fitted()
+        if self.matrix.shape[1] == 0:
+            return []
+        totals = sparse.csr_matrix(np.asarray(self.matrix.sum(axis=0)))
+        indices = top_n_indices_per_row(totals, top_n)[0]
+        scores = totals.toarray()[0, indices]
+        return list(zip(self.terms[indices].tolist(), scores.tolist()))
+
+    def chunk_keyword_counter(self, top_n=5):
+        """
+        청크별 상위 키워드가 몇 개의 청크에서 등장했는지 집계합니다.
+        - top_n: 청크마다 추출할 키워드 개수
+        """
+        self._check_fitted()
+        indices = top_n_indices_per_row(self.matrix, top_n)
+        if not indices:
+            return Counter()
+        counts = np.bincount(np.concatenate(indices), minlength=len(self.terms))
+        nonzero = np.flatnonzero(counts)
+        return Counter(dict(zip(self.terms[nonzero].tolist(), counts[nonzero].tolist())))
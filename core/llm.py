@@ -0,0 +1,255 @@
+import time
+
+from core.llm_cache import ROLE_ALIASES, LlmCache, make_key
+from core.ratelimit import acall_with_limit, call_with_limit, open_with_limit, request_tokens
+from core.registry import registry
+from core.tokens import count_message_tokens, count_tokens
+from core.tracing import Span, emit, span
+
+
+def llm_cache():
+    """
+    프로세스 전체에서 공유하는 LLM 응답 캐시를 반환합니다.
+    """
+    return registry.get("llm_cache", LlmCache)
+
+
+def to_openai_messages(messages):
+    """
+    langchain 메시지 목록을 OpenAI ChatCompletion 형식으로 변환합니다.
+    - messages: langchain 메시지 또는 {"role", "content"} dict 목록
+    """
+    converted = []
+    for message in messages:
+        if isinstance(message, dict):
+            converted.append(message)
+        else:
+            converted.append({"role": ROLE_ALIASES.get(message.type, message.type), "content": message.content})
+    return converted
+
+
+def to_langchain_messages(messages):
+    """
+    {"role", "content"} 메시지 목록을 langchain 메시지로 변환합니다 (langchain 클라이언트 호출용).
+    - messages: {"role", "content"} dict 또는 langchain 메시지 목록
+    """
+    from langchain.schema import AIMessage, HumanMessage, SystemMessage
+
+    classes = {"system": SystemMessage, "user": HumanMessage, "assistant": AIMessage}
+    return [
+        classes[message["role"]](content=message["content"]) if isinstance(message, dict) else message
+        for message in messages
+    ]
+
+
+def _to_dict(response):
+    # OpenAIObject는 JSON으로 저장할 수 있도록 일반 dict로 변환
+    return response.to_dict_recursive() if hasattr(response, "to_dict_recursive") else response
+
+
+def _usage(response):
+    usage = response.get("usage") or {}
+    return {"prompt_tokens": usage.get("prompt_tokens"), "completion_tokens": usage.get("completion_tokens")}
+
+
+def _cached(model, params, messages, bypass_cache):
+    cache = llm_cache()
+    key = make_key(model, params, messages)
+    if bypass_cache:
+        cache.record_bypass()
+        return cache, key, None
+    return cache, key, cache.get(key)
+
+
+def chat_completion(model, messages, bypass_cache=False, **params):
+    """
+    캐시를 거쳐 openai.ChatCompletion.create를 호출합니다.
+    - model: 모델 이름
+    - messages: 메시지 목록
+    - bypass_cache: True면 캐시를 사용하지 않고 새로 생성 (결과는 캐시에 갱신)
+    - params: temperature, max_tokens 등 생성 파라미터
+    """
+    messages = to_openai_messages(messages)
+    with span("llm.chat", model=model) as s:
+        cache, key, cached = _cached(model, params, messages, bypass_cache)
+        if cached is not None:
+            s.set(cached=True, **_usage(cached))
+            return cached
+        import openai
+
+        # 공유 속도 제한기의 허가를 받아 호출 (429는 대기 후 다시 시도)
+        response = _to_dict(call_with_limit(
+            model, request_tokens(messages, model, params.get("max_tokens")),
+            lambda: openai.ChatCompletion.create(model=model, messages=messages, **params),
+        ))
+        s.set(cached=False, **_usage(response))
+    cache.put(key, model, response)
+    return response
+
+
+async def achat_completion(model, messages, bypass_cache=False, **params):
+    """
+    캐시를 거쳐 openai.ChatCompletion.acreate를 호출합니다.
+    인자는 chat_completion()과 같습니다.
+    """
+    messages = to_openai_messages(messages)
+    with span("llm.chat", model=model) as s:
+        cache, key, cached = _cached(model, params, messages, bypass_cache)
+        if cached is not None:
+            s.set(cached=True, **_usage(cached))
+            return cached
+        import openai
+
+        response = _to_dict(await acall_with_limit(
+            model, request_tokens(messages, model, params.get("max_tokens")),
+            lambda: openai.ChatCompletion.acreate(model=model, messages=messages, **params),
+        ))
+        s.set(cached=False, **_usage(response))
+    cache.put(key, model, response)
+    return response
+
+
+def chat_with_client(chat, messages, bypass_cache=False, stop=None):
+    """
+    캐시를 거쳐 langchain ChatOpenAI 클라이언트를 호출합니다.
+    - chat: ChatOpenAI 클라이언트
+    - messages: langchain 메시지 또는 {"role", "content"} dict 목록
+    - bypass_cache: True면 캐시를 사용하지 않고 새로 생성 (결과는 캐시에 갱신)
+    - stop: 이 문자열이 나오면 생성을 멈추는 정지 시퀀스 목록 (최대 4개)
+    반환값: AIMessage
+    """
+    from langchain.schema import AIMessage
+
+    params = {"temperature": chat.temperature, "max_tokens": chat.max_tokens}
+    if stop:
+        params["stop"] = list(stop)
+    with span("llm.chat", model=chat.model_name) as s:
+        prompt_tokens = count_message_tokens(messages, chat.model_name)
+        s.set(prompt_tokens=prompt_tokens)
+        cache, key, cached = _cached(chat.model_name, params, messages, bypass_cache)
+        if cached is not None:
+            s.set(cached=True, completion_tokens=count_tokens(cached["content"], chat.model_name))
+            return AIMessage(content=cached["content"])
+        response = call_with_limit(
+            chat.model_name, request_tokens(messages, chat.model_name, chat.max_tokens, prompt_tokens),
+            lambda: chat(to_langchain_messages(messages), stop=list(stop) if stop else None),
+        )
+        s.set(cached=False, completion_tokens=count_tokens(response.content, chat.model_name))
+    cache.put(key, chat.model_name, {"content": response.content})
+    return response
+
+
+class ChatStream:
+    """
+    모델 응답을 토큰 단위로 받아오는 스트림입니다.
+    반복하면 텍스트 조각을 순서대로 반환하며, 끝나면 전체 응답을 캐시에 저장합니다.
+    - model: 모델 이름
+    - messages: 메시지 목록
+    - bypass_cache: True면 캐시를 사용하지 않고 새로 생성
+    - stop_when: 텍스트 조각마다 호출해 응답이 끝난 위치(전체 텍스트 기준)를 반환하는 함수.
+      위치를 반환하면 그 앞까지만 남기고 연결을 닫습니다 (None이면 계속 수신)
+    - params: temperature, max_tokens, stop 등 생성 파라미터
+    속성:
+    - text: 지금까지 받은 전체 텍스트
+    - cached: 캐시된 응답이면 True
+    - stopped_early: stop_when으로 응답을 중간에 끊었으면 True
+    - prompt_tokens: 프롬프트 토큰 수
+    - completion_tokens: 응답 토큰 수 (완료 후)
+    - time_to_first_token: 요청부터 첫 토큰까지 걸린 시간 (초)
+    - total_seconds: 요청부터 응답 완료까지 걸린 시간 (초)
+    """
+
+    def __init__(self, model, messages, bypass_cache=False, stop_when=None, **params):
+        self.model = model
+        self.messages = to_openai_messages(messages)
+        self.bypass_cache = bypass_cache
+        self.stop_when = stop_when
+        self.params = params
+        self.text = ""
+        self.cached = False
+        self.stopped_early = False
+        self.prompt_tokens = count_message_tokens(self.messages, model)
+        self.completion_tokens = None
+        self.time_to_first_token = None
+        self.total_seconds = None
+
+    def __iter__(self):
+        # span()은 조각을 반환하는 동안에도 현재 구간으로 남아 호출자가 연 구간이 하위 구간이 되므로,
+        # 구간만 만들어 두고 시간을 직접 재서 스트림이 끝날 때 기록
+        s = Span("llm.stream", {"model": self.model, "prompt_tokens": self.prompt_tokens})
+        started_at = time.time()
+        started = time.perf_counter()
+        try:
+            yield from self._stream()
+        except BaseException as e:
+            emit(s.record(started_at, time.perf_counter() - started, error=f"{type(e).__name__}: {e}"))
+            raise
+        self.completion_tokens = count_tokens(self.text, self.model)
+        s.set(
+            cached=self.cached,
+            stopped_early=self.stopped_early,
+            completion_tokens=self.completion_tokens,
+            time_to_first_token_ms=round((self.time_to_first_token or 0) * 1000, 3),
+        )
+        emit(s.record(started_at, time.perf_counter() - started))
+
+    def _stream(self):
+        started = time.perf_counter()
+        cache, key, cached = _cached(self.model, self.params, self.messages, self.bypass_cache)
+        if cached is not None:
+            self.cached = True
+            self.text = cached["content"]
+            self.time_to_first_token = self.total_seconds = time.perf_counter() - started
+            yield self.text
+            return
+
+        import openai
+
+        # 스트림을 끝까지 읽는 동안 허가를 유지 (동시 호출 수에 포함)
+        response, permit = open_with_limit(
+            self.model, request_tokens(self.messages, self.model, self.params.get("max_tokens"), self.prompt_tokens),
+            lambda: openai.ChatCompletion.create(model=self.model, messages=self.messages, stream=True, **self.params),
+        )
+        try:
+            for chunk in response:
+                delta = chunk["choices"][0]["delta"].get("content")
+                if not delta:
+                    continue
+                if self.time_to_first_token is None:
+                    self.time_to_first_token = time.perf_counter() - started
+                self.text += delta
+                end = self.stop_when(delta) if self.stop_when is not None else None
+                if end is not None:
+                    # 끝난 위치 앞까지만 남기고 나머지 생성은 받지 않음 (이미 반환한 조각은 그대로)
+                    kept = end - (len(self.text) - len(delta))
+                    self.text = self.text[:end]
+                    self.stopped_early = True
+                    if kept > 0:
+                        yield delta[:kept]
+                    break
+                yield delta
+        except BaseException:
+            permit.release()
+            raise
+        finally:
+            close = getattr(response, "close", None)
+            if close is not None:
+                close()
+        permit.release(latency=self.time_to_first_token, first_token=True)
+        self.total_seconds = time.perf_counter() - started
+        cache.put(key, self.model, {"content": self.text})
+
+
+def stream_chat(chat, messages, bypass_cache=False):
+    """
+    langchain ChatOpenAI 클라이언트와 같은 설정으로 응답을 스트리밍합니다.
+    캐시 키가 chat_with_client()와 같으므로 두 방식이 캐시를 공유합니다.
+    - chat: ChatOpenAI 클라이언트 (모델 설정 확인용)
+    - messages: langchain 메시지 목록
+    - bypass_cache: True면 캐시를 사용하지 않고 새로 생성
+    반환값: ChatStream
+    """
+    return ChatStream(
+        chat.model_name, messages, bypass_cache=bypass_cache,
+        temperature=chat.temperature, max_tokens=chat.max_tokens,
+    )
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+# 캐시 위치, 유효 기간, 최대 항목 수 (환경 변수로 변경 가능)
+DEFAULT_CACHE_PATH = Path(os.environ.get("DTLAB_CACHE_DIR", ".cache")) / "llm.sqlite3"
+DEFAULT_TTL_SECONDS = int(os.environ.get("DTLAB_LLM_CACHE_TTL", str(7 * 24 * 3600)))
+DEFAULT_MAX_ENTRIES = int(os.environ.get("DTLAB_LLM_CACHE_MAX_ENTRIES", "5000"))
+
+# langchain 메시지 종류 → OpenAI 역할. 요청 메시지 변환(core.llm)과 캐시 키가 같은 표를 사용해야 서로 맞음
+ROLE_ALIASES = {"human": "user", "ai": "assistant"}
+
+
+def normalize_messages(messages):
+    """
+    캐시 키 계산을 위해 메시지 목록을 {"role", "content"} 형태로 정규화합니다.
+    내용 전체의 앞뒤 공백만 무시합니다 (줄 안의 들여쓰기는 코드나 중첩 목록의 의미가 있으므로 유지).
+    - messages: OpenAI 형식 dict 또는 langchain 메시지 목록
+    """
+    normalized = []
+    for message in messages:
+        if isinstance(message, dict):
+            role, content = message["role"], message["content"]
+        else:
+            role, content = message.type, message.content
+        role = ROLE_ALIASES.get(role, role)
+        content = content.strip()
+        normalized.append({"role": role, "content": content})
+    return normalized
+
+
+def make_key(model, params, messages):
+    """
+    모델, 생성 파라미터, 정규화된 메시지 목록으로 캐시 키를 만듭니다.
+    - model: 모델 이름
+    - params: temperature, max_tokens 등 생성 파라미터
+    - messages: 메시지 목록
+    """
+    payload = json.dumps(
+        {"model": model, "params": params, "messages": normalize_messages(messages)},
+        sort_keys=True, ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LlmCache:
+    """
+    LLM 응답을 SQLite에 저장하는 로컬 캐시입니다.
+    항목은 ttl_seconds가 지나면 만료되고, max_entries를 넘으면
+    가장 오래 사용하지 않은 항목부터 삭제합니다.
+    - path: SQLite 파일 경로
+    - ttl_seconds: 응답 유효 기간 (초)
+    - max_entries: 최대 항목 수
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl_seconds=DEFAULT_TTL_SECONDS, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "bypassed": 0}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " model TEXT NOT NULL,"
+            " response TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)")
+
+    def get(self, key):
+        """
+        저장된 응답을 반환합니다. 없거나 만료되었으면 None을 반환합니다.
+        - key: make_key()로 만든 키
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._counters["misses"] += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._counters["hits"] += 1
+        return json.loads(row[0])
+
+    def put(self, key, model, response):
+        """
+        응답을 저장하고 최대 항목 수를 넘으면 오래된 항목을 삭제합니다.
+        - key: make_key()로 만든 키
+        - model: 모델 이름
+        - response: JSON으로 저장 가능한 응답
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, created_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, model, json.dumps(response, ensure_ascii=False), now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def record_bypass(self):
+        with self._lock:
+            self._counters["bypassed"] += 1
+
+    def stats(self):
+        """
+        캐시 적중/미스/우회 횟수와 저장된 항목 수를 반환합니다.
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            return {**self._counters, "entries": entries}
@@ -0,0 +1,149 @@
+import datetime
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from core.llm_cache import LlmCache
+from core.registry import registry
+from core.tracing import span
+
+
+# DeepSearch 뉴스 검색 API 설정 (환경 변수로 변경 가능, 로컬 대체 서버 주소 지정 가능)
+# API 키는 DEEPSEARCH_API_KEY 환경 변수로만 받음 (클라이언트를 만들 때 읽음)
+DEEPSEARCH_BASE_URL = os.environ.get("DEEPSEARCH_BASE_URL", "https://api-v2.deepsearch.com")
+DEFAULT_WINDOW_DAYS = int(os.environ.get("DEEPSEARCH_WINDOW_DAYS", "320"))
+DEFAULT_CONNECT_TIMEOUT = float(os.environ.get("DEEPSEARCH_CONNECT_TIMEOUT", "3.05"))
+DEFAULT_READ_TIMEOUT = float(os.environ.get("DEEPSEARCH_READ_TIMEOUT", "10"))
+
+# 기사 캐시 위치와 유효 기간
+DEFAULT_CACHE_PATH = Path(os.environ.get("DTLAB_CACHE_DIR", ".cache")) / "news.sqlite3"
+DEFAULT_CACHE_TTL = int(os.environ.get("DEEPSEARCH_CACHE_TTL", str(6 * 3600)))
+
+
+class NewsSearchError(RuntimeError):
+    """뉴스 검색이 재시도 후에도 실패했을 때 발생합니다."""
+
+
+def default_date_window(days=DEFAULT_WINDOW_DAYS, today=None):
+    """
+    오늘을 끝으로 하는 검색 기간을 (시작일, 종료일) 문자열로 반환합니다.
+    - days: 검색 기간 (일)
+    - today: 기준 날짜 (None이면 오늘)
+    """
+    today = today or datetime.date.today()
+    return (today - datetime.timedelta(days=days)).isoformat(), today.isoformat()
+
+
+class NewsClient:
+    """
+    DeepSearch 뉴스 검색 전용 클라이언트입니다.
+    연결 풀을 재사용하고, 연결/읽기 제한 시간과 지수 백오프 재시도를 적용하며,
+    (키워드 집합, 검색 기간)별 결과를 로컬 캐시에 저장합니다.
+    - base_url: API 주소 (로컬 대체 서버 주소로 바꾸면 오프라인으로 동작)
+    - api_key: API 키 (None이면 DEEPSEARCH_API_KEY 환경 변수, 둘 다 없으면 NewsSearchError)
+    - timeout: (연결, 읽기) 제한 시간 (초)
+    - max_retries: 최대 재시도 횟수
+    - backoff_factor: 재시도 간격 계수 (0.5 → 0.5, 1, 2초 ...)
+    - pool_size: 연결 풀 크기 (동시 검색 수)
+    - cache: 기사 캐시 (None이면 캐시 사용 안 함)
+    """
+
+    def __init__(self, base_url=DEEPSEARCH_BASE_URL, api_key=None,
+                 timeout=(DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT), max_retries=3,
+                 backoff_factor=0.5, pool_size=10, cache=None):
+        # requests는 실제 클라이언트를 만들 때 불러옴 (페이지 첫 실행 시간 단축)
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        api_key = api_key or os.environ.get("DEEPSEARCH_API_KEY")
+        if not api_key:
+            raise NewsSearchError("DeepSearch API 키가 없습니다. DEEPSEARCH_API_KEY 환경 변수를 설정해 주세요.")
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout = timeout
+        self.cache = cache
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @staticmethod
+    def cache_key(keywords, date_from, date_to):
+        """
+        키워드 집합과 검색 기간으로 캐시 키를 만듭니다 (키워드 순서는 무시).
+        - keywords: 검색 키워드 목록
+        - date_from, date_to: 검색 기간
+        """
+        payload = json.dumps(
+            {"keywords": sorted({keyword.strip() for keyword in keywords}), "from": date_from, "to": date_to},
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def search(self, keywords, date_from=None, date_to=None, bypass_cache=False):
+        """
+        키워드 중 하나라도 포함된 기사를 검색합니다.
+        - keywords: 검색 키워드 목록
+        - date_from, date_to: 검색 기간 (YYYY-MM-DD, None이면 최근 기간)
+        - bypass_cache: True면 캐시된 결과를 사용하지 않음
+        반환값: 기사 목록
+        """
+        if date_from is None or date_to is None:
+            default_from, default_to = default_date_window()
+            date_from, date_to = date_from or default_from, date_to or default_to
+
+        with span("deepsearch.search", keywords=len(keywords)) as s:
+            articles = self._search(keywords, date_from, date_to, bypass_cache, s)
+            s.set(articles=len(articles))
+        return articles
+
+    def _search(self, keywords, date_from, date_to, bypass_cache, current_span):
+        key = self.cache_key(keywords, date_from, date_to)
+        if self.cache is not None and not bypass_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                current_span.set(cached=True)
+                return cached
+        current_span.set(cached=False)
+
+        search_params = {
+            "keyword": " OR ".join(f'"{keyword.strip()}"' for keyword in keywords),
+            "api_key": self.api_key,
+            "date_from": date_from,
+            "date_to": date_to
+        }
+        import requests
+
+        try:
+            response = self.session.get(f"{self.base_url}/v1/articles", params=search_params, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise NewsSearchError(f"뉴스 검색 실패: {e}") from e
+        if response.status_code != 200:
+            raise NewsSearchError(f"뉴스 검색 실패: {response.status_code}")
+
+        articles = response.json().get("data", [])
+        if self.cache is not None:
+            self.cache.put(key, "deepsearch", articles)
+        return articles
+
+
+def news_client():
+    """
+    프로세스 전체에서 공유하는 뉴스 클라이언트를 반환합니다.
+    기사 캐시는 LLM 응답 캐시와 같은 SQLite 저장 방식을 사용합니다.
+    """
+    return registry.get(
+        "news:deepsearch",
+        lambda: NewsClient(cache=LlmCache(DEFAULT_CACHE_PATH, ttl_seconds=DEFAULT_CACHE_TTL)),
+    )
@@ -0,0 +1,172 @@
+import ast
+import asyncio
+import time
+
+from core.llm import achat_completion
+from core.news_client import news_client
+from core.tracing import span
+
+
+# 요약을 시작하기 위해 필요한 기사 수
+MIN_ARTICLES = 5
+
+KEYWORD_SYSTEM_PROMPT = "You are an assistant for extracting keywords."
+
+
+def _message_content(response):
+    return response["choices"][0]["message"]["content"].strip()
+
+
+async def extract_role_keywords(employee_role, bypass_cache=False):
+    """
+    담당 업무 문장에서 직무 키워드 3개를 추출합니다.
+    - employee_role: 임직원이 입력한 담당 업무
+    - bypass_cache: True면 캐시된 응답을 사용하지 않음
+    """
+    prompt = f"""
+    다음 문장에서 중요한 키워드 3개를 추출 후 리스트로 반환하세요.
+
+    문장: "{employee_role}"
+    반환형식:["핵심단어1","핵심단어2","핵심단어3"]
+    """
+    response = await achat_completion(
+        model="gpt-4",
+        messages=[
+            {"role": "system", "content": KEYWORD_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        max_tokens=200,
+        temperature=0.4,
+        bypass_cache=bypass_cache
+    )
+    return [keyword.strip() for keyword in ast.literal_eval(_message_content(response))]
+
+
+async def search_news(keyword, date_from=None, date_to=None, bypass_cache=False):
+    """
+    키워드 하나로 DeepSearch 뉴스를 검색합니다.
+    연결 풀을 공유하는 뉴스 클라이언트를 작업 스레드에서 호출하므로 여러 검색이 동시에 진행됩니다.
+    - keyword: 검색 키워드
+    - date_from, date_to: 검색 기간 (YYYY-MM-DD, None이면 최근 기간)
+    - bypass_cache: True면 캐시된 기사를 사용하지 않음
+    """
+    return await asyncio.to_thread(news_client().search, [keyword], date_from, date_to, bypass_cache)
+
+
+def article_key(article):
+    """
+    중복 기사를 판별하기 위한 키를 반환합니다 (id → url → 제목 순서로 사용).
+    - article: DeepSearch 기사 데이터
+    """
+    return article.get("id") or article.get("content_url") or article.get("title", "").strip()
+
+
+async def collect_articles(keywords, min_articles=MIN_ARTICLES, **search_kwargs):
+    """
+    키워드별 뉴스 검색을 동시에 실행하고 중복을 제거해 기사를 모읍니다.
+    기사가 min_articles개 모이면 남은 검색은 취소합니다.
+    - keywords: 검색 키워드 목록
+    - min_articles: 필요한 기사 수
+    - search_kwargs: search_news()에 전달할 검색 기간/캐시 옵션
+    반환값: (기사 목록, 실패한 검색 오류 목록)
+    """
+    tasks = [asyncio.create_task(search_news(keyword, **search_kwargs)) for keyword in keywords]
+    articles, seen, errors = [], set(), []
+    try:
+        for finished in asyncio.as_completed(tasks):
+            try:
+                found = await finished
+            except Exception as e:
+                errors.append(str(e))
+                continue
+            for article in found:
+                key = article_key(article)
+                if key and key not in seen:
+                    seen.add(key)
+                    articles.append(article)
+            if len(articles) >= min_articles:
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+    return articles[:min_articles], errors
+
+
+async def summarize_news_keywords(articles, bypass_cache=False):
+    """
+    기사 제목과 요약에서 중요한 키워드 3개를 추출합니다.
+    - articles: 기사 목록
+    - bypass_cache: True면 캐시된 응답을 사용하지 않음
+    """
+    content = "\n\n".join(
+        f"제목: {article.get('title', '제목 없음')}\n요약: {article.get('summary', '요약 없음')}"
+        for article in articles
+    )
+    news_prompt = f"""
+    아래 기사 내용을 바탕으로 중요한 키워드 3개를 추출하세요:
+
+    {content}
+
+    반환형식: 키워드1, 키워드2, 키워드3
+    """
+    response = await achat_completion(
+        model="gpt-4",
+        messages=[
+            {"role": "system", "content": KEYWORD_SYSTEM_PROMPT},
+            {"role": "user", "content": news_prompt}
+        ],
+        max_tokens=200,
+        temperature=0.4,
+        bypass_cache=bypass_cache
+    )
+    return _message_content(response)
+
+
+async def run_keyword_news_pipeline(employee_role, min_articles=MIN_ARTICLES, on_stage=None, bypass_cache=False):
+    """
+    직무 키워드 추출 → 키워드별 뉴스 동시 검색 → 뉴스 키워드 요약을 실행합니다.
+    - employee_role: 임직원이 입력한 담당 업무
+    - min_articles: 요약에 사용할 기사 수
+    - on_stage: 단계가 끝날 때마다 (단계 이름, 결과)로 호출되는 함수
+    - bypass_cache: True면 캐시된 LLM 응답을 사용하지 않음
+    반환값: {"role_keywords", "articles", "news_keywords", "errors", "timings"}
+    """
+    with span("news.pipeline"):
+        return await _run_pipeline(employee_role, min_articles, on_stage, bypass_cache)
+
+
+async def _run_pipeline(employee_role, min_articles, on_stage, bypass_cache):
+    timings = {}
+    started = time.perf_counter()
+
+    def _stage_done(name, stage_started, value):
+        timings[name] = time.perf_counter() - stage_started
+        if on_stage is not None:
+            on_stage(name, value)
+
+    stage_started = time.perf_counter()
+    with span("news.role_keywords"):
+        role_keywords = await extract_role_keywords(employee_role, bypass_cache)
+    _stage_done("직무 키워드 추출", stage_started, role_keywords)
+
+    stage_started = time.perf_counter()
+    with span("news.search", keywords=len(role_keywords)) as s:
+        articles, errors = await collect_articles(role_keywords, min_articles=min_articles, bypass_cache=bypass_cache)
+        s.set(articles=len(articles), errors=len(errors))
+    _stage_done("뉴스 검색", stage_started, articles)
+
+    news_keywords = None
+    if articles:
+        stage_started = time.perf_counter()
+        with span("news.summarize", articles=len(articles)):
+            news_keywords = await summarize_news_keywords(articles, bypass_cache)
+        _stage_done("뉴스 키워드 요약", stage_started, news_keywords)
+
+    timings["전체"] = time.perf_counter() - started
+    return {
+        "role_keywords": role_keywords,
+        "articles": articles,
+        "news_keywords": news_keywords,
+        "errors": errors,
+        "timings": timings,
+    }
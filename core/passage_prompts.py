@@ -0,0 +1,64 @@
+"""
+지문 생성 프롬프트를 구성합니다 (passage 생성기 역량, 기본값 P4-1-1 업무에 필요한 생성형 인공지능 서비스 선정 역량).
+접두어와 예제 텍스트는 역량별로 한 번만 만들고, 요청마다 사용자 입력만 채웁니다.
+"""
+from functools import lru_cache
+
+from core.catalog import get_competency
+from core.examples import formatted_examples, join_few_shot
+
+
+# 역량을 지정하지 않았을 때 사용할 역량 코드
+DEFAULT_COMPETENCY = "P4-1-1"
+
+# 기업 및 부서 리스트
+companies = ["코드스테이츠", "KCC", "현대모비스", "전기안전공사", "건강보험심사평가원"]
+departments = ["디지털 마케팅팀", "DT 전략 기획팀", "교육 컨설팅 팀", "사업팀", "진단평가팀"]
+
+
+@lru_cache(maxsize=1024)
+def _prefix(code):
+    # 교육 데이터 및 임직원 정보 안내 (역량별로 한 번만 생성)
+    competency = get_competency(code)
+    return (
+        "당신은 역량 평가에 필요한 질문을 생성하는 임무를 맡은 AI 비서입니다.\n"
+        "제공된 Education Data, 임직원 정보를 참고하여 지문을 생성하세요.\n\n"
+        "Education Data:\n"
+        f"- Factor: {competency.factor}\n"
+        f"- Sub Factor: {competency.sub_factor}\n"
+        f"- Achievement Standard: {competency.achievement_standard}\n"
+        f"- Learning Object: {competency.learning_object}\n"
+        f"- Learning Target Note: {competency.learning_target_note}\n\n"
+    )
+
+
+def build_passage_input(company, department, role, competency=DEFAULT_COMPETENCY):
+    """
+    임직원 정보로 지문 생성 요청 문장을 만듭니다. 입력이 비어 있으면 None을 반환합니다.
+    - company: 기업명
+    - department: 부서명
+    - role: 담당 업무
+    - competency: 역량 코드
+    """
+    if not (company.strip() and department.strip() and role.strip()):
+        return None
+    request = get_competency(competency).request
+    return f"{company} 기업의 {department} 에서 {role}을(를) 담당하는 직원을 대상으로 {request}"
+
+
+def build_passage_messages(user_input, competency=DEFAULT_COMPETENCY, context=""):
+    """
+    지문 생성을 위한 Chat 메시지 목록을 만듭니다.
+    - user_input: build_passage_input()으로 만든 요청 문장
+    - competency: 역량 코드
+    - context: Education Data 뒤에 넣을 교안 내용 (core.retrieval.retrieve_context() 결과, 빈 문자열이면 생략)
+    반환값: {"role", "content"} 메시지 목록
+    """
+    library = get_competency(competency).example_library
+    final_prompt = join_few_shot(
+        _prefix(competency) + context, formatted_examples(library), f"Input: {user_input}\nOutput:"
+    )
+    return [
+        {"role": "system", "content": "당신은 역량 평가에 필요한 질문을 생성하는 임무를 맡은 AI 비서입니다."},
+        {"role": "user", "content": final_prompt},
+    ]
@@ -0,0 +1,186 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+
+CACHE_FORMAT_VERSION = 1
+
+# 캐시 위치와 최대 용량 (환경 변수로 변경 가능)
+DEFAULT_CACHE_DIR = Path(os.environ.get("DTLAB_CACHE_DIR", ".cache")) / "pdf"
+DEFAULT_MAX_BYTES = int(os.environ.get("DTLAB_PDF_CACHE_MAX_MB", "512")) * 1024 * 1024
+
+
+def make_cache_key(data, **settings):
+    """
+    업로드된 파일 바이트와 처리 설정으로 캐시 키를 만듭니다.
+    - data: PDF 파일 바이트
+    - settings: 분할기/키워드 설정 (chunk_size, pipeline 등)
+    """
+    digest = hashlib.sha256()
+    digest.update(data)
+    digest.update(json.dumps(
+        {"version": CACHE_FORMAT_VERSION, **settings}, sort_keys=True, ensure_ascii=False
+    ).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class PdfCache:
+    """
+    분할된 청크와 키워드 결과를 디스크에 저장하는 내용 주소 기반 캐시입니다.
+    항목은 gzip으로 압축한 JSON Lines 파일 하나로 저장되며,
+    전체 용량이 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제합니다.
+    - directory: 캐시 디렉터리
+    - max_bytes: 캐시 최대 용량 (바이트)
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return self.directory / f"{key}.jsonl.gz"
+
+    def get(self, key):
+        """
+        캐시된 결과를 반환합니다. 없으면 None을 반환합니다.
+        - key: make_cache_key()로 만든 키
+        반환값: {"chunks": [...], "chunk_keywords": [...], "document_keywords": [...]}
+        """
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                records = [json.loads(line) for line in f]
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError):
+            # 손상된 항목은 삭제 후 캐시 미스로 처리
+            path.unlink(missing_ok=True)
+            return None
+
+        # LRU 순서를 위해 접근 시각 갱신
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+        result = {"chunks": [], "chunk_keywords": [], "document_keywords": []}
+        for record in records:
+            if record["kind"] == "chunk":
+                result["chunks"].append({"page_content": record["text"], "metadata": record["metadata"]})
+                result["chunk_keywords"].append(record["keywords"])
+            elif record["kind"] == "summary":
+                result["document_keywords"] = [tuple(item) for item in record["document_keywords"]]
+        return result
+
+    def put(self, key, chunks, chunk_keywords, document_keywords):
+        """
+        처리 결과를 캐시에 저장합니다.
+        - key: make_cache_key()로 만든 키
+        - chunks: {"page_content", "metadata"} 형태의 청크 목록 (langchain Document도 가능)
+        - chunk_keywords: 청크별 키워드 목록
+        - document_keywords: 문서 전체 (키워드, 점수) 목록
+        """
+        writer = self.open_writer(key)
+        try:
+            for chunk, keywords in zip(chunks, chunk_keywords):
+                writer.add_chunk(chunk, keywords)
+        except BaseException:
+            writer.abort()
+            raise
+        writer.commit(document_keywords)
+
+    def open_writer(self, key):
+        """
+        청크를 처리되는 대로 하나씩 기록하는 작성기를 반환합니다.
+        commit()을 호출하기 전까지는 캐시에 나타나지 않습니다.
+        - key: make_cache_key()로 만든 키
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return CacheWriter(self, key)
+
+    def evict(self):
+        """
+        전체 용량이 max_bytes 이하가 될 때까지 오래된 항목을 삭제합니다.
+        """
+        with self._lock:
+            entries = []
+            for path in self.directory.glob("*.jsonl.gz"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+
+
+class CacheWriter:
+    """
+    캐시 항목 하나를 임시 파일에 순서대로 기록한 뒤 원자적으로 공개합니다.
+    - cache: 대상 PdfCache
+    - key: 캐시 키
+    """
+
+    def __init__(self, cache, key):
+        self.cache = cache
+        self.key = key
+        fd, self._tmp_path = tempfile.mkstemp(dir=cache.directory, suffix=".tmp")
+        self._raw = os.fdopen(fd, "wb")
+        self._file = gzip.open(self._raw, "wt", encoding="utf-8")
+
+    def add_chunk(self, chunk, keywords):
+        """
+        청크 하나와 키워드를 기록합니다.
+        - chunk: {"page_content", "metadata"} 형태의 청크 (langchain Document도 가능)
+        - keywords: 청크의 키워드 목록
+        """
+        if not isinstance(chunk, dict):
+            chunk = {"page_content": chunk.page_content, "metadata": chunk.metadata}
+        self._file.write(_dumps({
+            "kind": "chunk",
+            "text": chunk["page_content"],
+            "metadata": chunk["metadata"],
+            "keywords": list(keywords),
+        }))
+
+    def commit(self, document_keywords):
+        """
+        문서 전체 키워드를 기록하고 항목을 캐시에 공개합니다.
+        - document_keywords: 문서 전체 (키워드, 점수) 목록
+        """
+        try:
+            self._file.write(_dumps({"kind": "summary", "document_keywords": list(document_keywords)}))
+            self._close()
+            # 완성된 파일만 보이도록 원자적으로 교체
+            os.replace(self._tmp_path, self.cache._path(self.key))
+        except BaseException:
+            self.abort()
+            raise
+        self.cache.evict()
+
+    def abort(self):
+        """
+        기록 중인 임시 파일을 삭제합니다.
+        """
+        self._close()
+        Path(self._tmp_path).unlink(missing_ok=True)
+
+    def _close(self):
+        if not self._file.closed:
+            self._file.close()
+        if not self._raw.closed:
+            self._raw.close()
+
+
+def _dumps(record):
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
@@ -0,0 +1,220 @@
+import math
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from core.registry import keyword_engine_class, registry, spacy_splitter
+
+
+# 병렬 작업자 수 기본값 (환경 변수로 변경 가능)
+DEFAULT_WORKERS = int(os.environ.get("DTLAB_PDF_WORKERS", "1"))
+
+# 작업자 한 명당 나눌 샤드 수 (페이지별 처리량 차이를 흡수)
+SHARDS_PER_WORKER = 2
+
+
+def _open_pdf(pdf):
+    import fitz
+
+    # 업로드 버퍼는 임시 파일 없이 메모리에서 바로 엶
+    if isinstance(pdf, (bytes, bytearray, memoryview)):
+        return fitz.open(stream=bytes(pdf), filetype="pdf")
+    return fitz.open(pdf)
+
+
+def _source_name(pdf, source):
+    if source is not None:
+        return source
+    return "memory" if isinstance(pdf, (bytes, bytearray, memoryview)) else str(pdf)
+
+
+def page_count(pdf):
+    """
+    PDF의 전체 페이지 수를 반환합니다.
+    - pdf: PDF 파일 경로 또는 파일 바이트
+    """
+    with _open_pdf(pdf) as doc:
+        return len(doc)
+
+
+def iter_pages(pdf, start=0, stop=None, source=None):
+    """
+    PDF의 [start, stop) 페이지를 한 페이지씩 (텍스트, 메타데이터)로 반환합니다.
+    메타데이터는 PyMuPDFLoader와 같은 형식이며, 한 번에 한 페이지만 메모리에 올립니다.
+    - pdf: PDF 파일 경로 또는 파일 바이트
+    - start: 시작 페이지 (0부터)
+    - stop: 끝 페이지 (포함하지 않음, None이면 마지막 페이지까지)
+    - source: 메타데이터에 기록할 원본 이름 (업로드 파일명 등)
+    """
+    source = _source_name(pdf, source)
+    with _open_pdf(pdf) as doc:
+        doc_metadata = {k: v for k, v in doc.metadata.items() if type(v) in [str, int]}
+        stop = len(doc) if stop is None else min(stop, len(doc))
+        for page_no in range(start, stop):
+            page = doc[page_no]
+            metadata = {
+                "source": source,
+                "file_path": source,
+                "page": page.number,
+                "total_pages": len(doc),
+                **doc_metadata,
+            }
+            yield page.get_text(), metadata
+
+
+def load_pages(pdf, start=0, stop=None, source=None):
+    """
+    PDF의 [start, stop) 페이지를 (텍스트, 메타데이터) 목록으로 반환합니다.
+    - pdf: PDF 파일 경로 또는 파일 바이트
+    - start, stop: 페이지 구간
+    - source: 메타데이터에 기록할 원본 이름
+    """
+    return list(iter_pages(pdf, start, stop, source))
+
+
+def process_pages(pages, chunk_size=350, pipeline="ko_core_news_sm", top_n=5):
+    """
+    페이지 목록을 분할하고 청크별 키워드를 빈도 기준으로 추출합니다.
+    - pages: (텍스트, 메타데이터) 목록
+    - chunk_size, pipeline: 분할기 설정
+    - top_n: 청크마다 추출할 키워드 개수
+    반환값: {"chunks": [...], "chunk_keywords": [...], "term_counts": Counter}
+    """
+    splitter = spacy_splitter(chunk_size=chunk_size, pipeline=pipeline)
+    # 청크는 페이지 경계를 넘지 않으므로 구간별 결과를 이어 붙이면 순차 처리와 같음
+    split_docs = splitter.create_documents(
+        [text for text, _ in pages], metadatas=[metadata for _, metadata in pages]
+    )
+    chunks = [{"page_content": doc.page_content, "metadata": doc.metadata} for doc in split_docs]
+    if not chunks:
+        return {"chunks": [], "chunk_keywords": [], "term_counts": Counter()}
+
+    # 빈도 기준 청크별 상위 키워드는 다른 청크와 무관하므로 구간 단위로 계산해도 동일함
+    KeywordEngine = keyword_engine_class()
+    engine = KeywordEngine(weighting="count").fit([chunk["page_content"] for chunk in chunks])
+    return {
+        "chunks": chunks,
+        "chunk_keywords": engine.top_terms_per_chunk(top_n=top_n),
+        "term_counts": Counter(dict(engine.top_terms_for_document(top_n=len(engine.terms)))),
+    }
+
+
+def iter_page_results(pdf, chunk_size=350, pipeline="ko_core_news_sm", top_n=5, source=None):
+    """
+    페이지 → 청크 → 키워드 순서로 한 페이지씩 처리 결과를 반환하는 생성기입니다.
+    앞 페이지의 결과를 화면에 표시하는 동안 다음 페이지를 읽으며,
+    메모리에는 현재 페이지만 유지합니다.
+    - pdf: PDF 파일 경로 또는 파일 바이트
+    - chunk_size, pipeline: 분할기 설정
+    - top_n: 청크마다 추출할 키워드 개수
+    - source: 메타데이터에 기록할 원본 이름
+    """
+    for text, metadata in iter_pages(pdf, source=source):
+        result = process_pages([(text, metadata)], chunk_size, pipeline, top_n)
+        result["page"] = metadata["page"]
+        result["total_pages"] = metadata["total_pages"]
+        yield result
+
+
+def document_keywords_from_counts(term_counts, top_n=30):
+    """
+    병합된 단어 빈도에서 문서 전체 상위 키워드를 구합니다.
+    동점은 사전순으로 정렬합니다 (KeywordEngine과 같은 기준).
+    - term_counts: 단어별 빈도 Counter
+    - top_n: 추출할 키워드 개수
+    """
+    return sorted(term_counts.items(), key=lambda item: (-item[1], item[0]))[:top_n]
+
+
+def page_shards(total_pages, workers):
+    """
+    전체 페이지를 연속된 [start, stop) 구간으로 나눕니다.
+    - total_pages: 전체 페이지 수
+    - workers: 작업자 수
+    """
+    if total_pages <= 0:
+        return []
+    n_shards = min(total_pages, max(1, workers) * SHARDS_PER_WORKER)
+    size = math.ceil(total_pages / n_shards)
+    return [(start, min(start + size, total_pages)) for start in range(0, total_pages, size)]
+
+
+def process_shard(pdf, start, stop, chunk_size=350, pipeline="ko_core_news_sm", top_n=5, source=None):
+    """
+    페이지 구간 하나를 분할하고 청크별 키워드를 빈도 기준으로 추출합니다.
+    작업자 프로세스에서 실행되며, spaCy 파이프라인은 프로세스당 한 번만 로드됩니다.
+    - pdf: PDF 파일 경로 또는 파일 바이트
+    - start, stop: 페이지 구간
+    - chunk_size, pipeline: 분할기 설정
+    - top_n: 청크마다 추출할 키워드 개수
+    - source: 메타데이터에 기록할 원본 이름
+    """
+    return process_pages(load_pages(pdf, start, stop, source), chunk_size, pipeline, top_n)
+
+
+def _process_pool(workers):
+    # 작업자 수별로 하나의 프로세스 풀을 만들어 재사용
+    # (Streamlit 서버 스레드를 fork하지 않도록 spawn 사용)
+    return registry.get(
+        f"process_pool:{workers}",
+        lambda: ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")),
+    )
+
+
+def process_pdf_file(pdf, chunk_size=350, pipeline="ko_core_news_sm", weighting="count",
+                     workers=DEFAULT_WORKERS, top_n=5, document_top_n=30, source=None):
+    """
+    PDF를 페이지 구간으로 나누어 분할과 키워드 추출을 수행합니다.
+    workers가 1이면 현재 프로세스에서 순차 처리하고,
+    2 이상이면 프로세스 풀에서 구간을 병렬 처리한 뒤 순서대로 병합합니다.
+    - pdf: PDF 파일 경로 또는 파일 바이트
+    - chunk_size, pipeline: 분할기 설정
+    - weighting: 키워드 가중치 방식 ("count" 또는 "tfidf")
+    - workers: 병렬 작업자 수
+    - top_n: 청크마다 추출할 키워드 개수
+    - document_top_n: 문서 전체에서 추출할 키워드 개수
+    - source: 메타데이터에 기록할 원본 이름
+    반환값: {"chunks": [...], "chunk_keywords": [...], "document_keywords": [...]}
+    """
+    source = _source_name(pdf, source)
+    shards = page_shards(page_count(pdf), workers)
+    args = [(pdf, start, stop, chunk_size, pipeline, top_n, source) for start, stop in shards]
+    if workers <= 1:
+        partials = [process_shard(*arg) for arg in args]
+    else:
+        # map은 제출 순서대로 결과를 돌려주므로 청크 번호가 순차 처리와 같음
+        partials = list(_process_pool(workers).map(process_shard, *zip(*args)))
+
+    chunks, chunk_keywords, term_counts = [], [], Counter()
+    for partial in partials:
+        chunks.extend(partial["chunks"])
+        chunk_keywords.extend(partial["chunk_keywords"])
+        term_counts.update(partial["term_counts"])
+
+    result = {
+        "chunks": chunks,
+        "chunk_keywords": chunk_keywords,
+        "document_keywords": document_keywords_from_counts(term_counts, document_top_n),
+    }
+    return reweight(result, weighting, top_n, document_top_n)
+
+
+def reweight(result, weighting, top_n=5, document_top_n=30):
+    """
+    빈도 기준으로 추출된 결과의 키워드를 다른 가중치 방식으로 다시 계산합니다.
+    TF-IDF는 문서 전체의 문서 빈도가 필요하므로 전체 청크로 한 번 학습합니다.
+    - result: {"chunks", "chunk_keywords", "document_keywords"} 형태의 결과
+    - weighting: 키워드 가중치 방식 ("count" 또는 "tfidf")
+    - top_n: 청크마다 추출할 키워드 개수
+    - document_top_n: 문서 전체에서 추출할 키워드 개수
+    """
+    if weighting == "count" or not result["chunks"]:
+        return result
+    KeywordEngine = keyword_engine_class()
+    engine = KeywordEngine(weighting=weighting).fit([chunk["page_content"] for chunk in result["chunks"]])
+    return {
+        "chunks": result["chunks"],
+        "chunk_keywords": engine.top_terms_per_chunk(top_n=top_n),
+        "document_keywords": engine.top_terms_for_document(top_n=document_top_n),
+    }
@@ -0,0 +1,242 @@
+import re
+from dataclasses import dataclass, field
+
+
+# 구역 표시 (한 번의 탐색으로 모든 표시 위치를 찾음)
+_MARKER_PATTERN = re.compile(r"\[질문\]|\[선지\]|\[정답 및 해설\]|정답\)|해설\)")
+_MARKER_SECTIONS = {"[질문]": "question", "[선지]": "options", "[정답 및 해설]": None, "정답)": "answer", "해설)": "explanation"}
+
+# "선지 1) 내용", "1) 내용", "1. 내용" 형식의 선지 한 줄
+_OPTION_PATTERN = re.compile(r"^\s*(?:선지\s*)?([1-4])\s*[).]\s*(.*\S)", re.MULTILINE)
+_ANSWER_PATTERN = re.compile(r"[1-4]")
+
+SECTIONS = ("question", "options", "answer", "explanation")
+OPTION_COUNT = 4
+
+
+@dataclass
+class ParsedQuestion:
+    """
+    구역별로 분리한 객관식 문항입니다.
+    - question: 지문과 질문
+    - options: 선지 4개 (번호 순서)
+    - answer: 정답 선지 번호 (1~4, 찾지 못하면 None)
+    - explanation: 해설
+    - sections: 구역별 원문 (선지 형식이 맞지 않을 때 표시용)
+    """
+
+    question: str = ""
+    options: list = field(default_factory=list)
+    answer: int = None
+    explanation: str = ""
+    sections: dict = field(default_factory=dict, repr=False)
+
+    def problems(self):
+        """
+        비어 있거나 형식이 맞지 않는 구역 이름을 순서대로 반환합니다.
+        """
+        problems = []
+        if not self.question:
+            problems.append("question")
+        if len(self.options) != OPTION_COUNT or not all(self.options):
+            problems.append("options")
+        if self.answer is None:
+            problems.append("answer")
+        if not self.explanation:
+            problems.append("explanation")
+        return problems
+
+    @property
+    def is_valid(self):
+        return not self.problems()
+
+    def options_text(self):
+        if len(self.options) == OPTION_COUNT:
+            return "\n".join(f"선지 {i}) {option}" for i, option in enumerate(self.options, start=1))
+        return self.sections.get("options", "")
+
+    def to_text(self):
+        """
+        프롬프트와 같은 형식의 문항 원문으로 되돌립니다.
+        """
+        return (
+            f"[질문]\n{self.question}\n\n"
+            f"[선지]\n{self.options_text()}\n\n"
+            f"[정답 및 해설]\n정답) {self.answer or ''}\n해설) {self.explanation}"
+        )
+
+    def to_dict(self):
+        """
+        {"question", "options", "answer", "explanation"} 문자열 dict로 변환합니다 (저장/표시용).
+        """
+        return {
+            "question": self.question,
+            "options": self.options_text(),
+            "answer": str(self.answer) if self.answer is not None else self.sections.get("answer", ""),
+            "explanation": self.explanation,
+        }
+
+
+def parse_options(text):
+    """
+    선지 구역에서 번호별 선지를 읽습니다. 1~4번이 모두 한 번씩 있을 때만 목록을 반환합니다.
+    - text: 선지 구역 원문
+    """
+    found = {}
+    for number, content in _OPTION_PATTERN.findall(text):
+        found.setdefault(int(number), content.strip())
+    if sorted(found) != list(range(1, OPTION_COUNT + 1)):
+        return []
+    return [found[i] for i in range(1, OPTION_COUNT + 1)]
+
+
+def parse_answer(text):
+    """
+    정답 구역에서 정답 선지 번호를 읽습니다.
+    - text: 정답 구역 원문 (예: "4", "선지 2")
+    """
+    match = _ANSWER_PATTERN.search(text)
+    return int(match.group()) if match else None
+
+
+def split_sections(generated_content):
+    """
+    문항 텍스트를 한 번만 훑어 구역별 원문을 반환합니다.
+    각 표시의 첫 등장 위치부터 다음 표시 전까지를 해당 구역으로 봅니다.
+    - generated_content: 모델이 생성한 문항 텍스트
+    반환값: {"question", "options", "answer", "explanation"} (없는 구역은 빈 문자열)
+    """
+    positions, seen = [], set()
+    for match in _MARKER_PATTERN.finditer(generated_content):
+        marker = match.group()
+        if marker not in seen:
+            seen.add(marker)
+            positions.append((match.start(), match.end(), _MARKER_SECTIONS[marker]))
+
+    sections = dict.fromkeys(SECTIONS, "")
+    for i, (_, end, name) in enumerate(positions):
+        if name is None:
+            continue
+        stop = positions[i + 1][0] if i + 1 < len(positions) else len(generated_content)
+        sections[name] = generated_content[end:stop].strip()
+    return sections
+
+
+def parse_structured(generated_content):
+    """
+    문항 텍스트를 ParsedQuestion으로 분리합니다.
+    - generated_content: 모델이 생성한 문항 텍스트
+    """
+    sections = split_sections(generated_content)
+    return ParsedQuestion(
+        question=sections["question"],
+        options=parse_options(sections["options"]),
+        answer=parse_answer(sections["answer"]),
+        explanation=sections["explanation"],
+        sections=sections,
+    )
+
+
+def parse_question(generated_content):
+    """
+    생성된 문항 텍스트를 [질문]/[선지]/[정답 및 해설] 구역으로 분리합니다.
+    - generated_content: 모델이 생성한 문항 텍스트
+    반환값: {"question", "options", "answer", "explanation"} (없는 구역은 빈 문자열)
+    """
+    return parse_structured(generated_content).to_dict()
+
+
+def is_complete(parsed):
+    """
+    모든 구역이 채워졌는지 확인합니다.
+    - parsed: parse_question()의 결과
+    """
+    return all(parsed.values())
+
+
+# 스트리밍 중 구역을 구분하는 표시와 해당 구역 이름 (등장 순서)
+_STREAM_MARKERS = (
+    ("[질문]", "question"),
+    ("[선지]", "options"),
+    ("[정답 및 해설]", None),
+    ("정답)", "answer"),
+    ("해설)", "explanation"),
+)
+
+
+# 해설 뒤에 오면 문항이 끝났다고 보는 표시 (few-shot 형식을 이어 새 예제를 쓰거나 다음 문항을 시작)
+# 해설은 여러 문단일 수 있으므로 빈 줄만으로는 끝났다고 보지 않고, 해설 문장 속의 "Output:"도 끝으로 보지 않도록 줄 시작만 인정
+_TRAILING_MARKERS = ("\nInput:", "\nOutput:", "\n\n[질문]")
+
+
+class StreamingQuestionParser:
+    """
+    토큰이 도착하는 대로 [질문]/[선지]/[정답 및 해설] 구역을 채우는 점진적 파서입니다.
+    이미 찾은 표시 이후의 새 텍스트만 검사하므로 전체 응답을 다시 나누지 않습니다.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._next_marker = 0
+        self._positions = {}
+
+    def feed(self, delta):
+        """
+        새로 도착한 텍스트 조각을 추가하고 현재까지의 구역별 내용을 반환합니다.
+        - delta: 텍스트 조각
+        반환값: {"question", "options", "answer", "explanation"} (아직 없는 구역은 빈 문자열)
+        """
+        # 표시가 조각 경계에 걸칠 수 있으므로 가장 긴 표시 길이만큼 앞에서부터 검사
+        search_from = max(0, len(self.text) - len("[정답 및 해설]"))
+        self.text += delta
+        while self._next_marker < len(_STREAM_MARKERS):
+            marker, _ = _STREAM_MARKERS[self._next_marker]
+            start = max(search_from, self._last_end())
+            position = self.text.find(marker, start)
+            if position < 0:
+                break
+            self._positions[self._next_marker] = (position, position + len(marker))
+            self._next_marker += 1
+        return self.sections()
+
+    def end(self):
+        """
+        구조화된 문항이 끝난 위치를 반환합니다. 아직 끝나지 않았으면 None을 반환합니다.
+        해설 내용 뒤에 다음 예제/문항 표시가 나오면 끝난 것으로 보며, 반환한 위치 앞까지가 문항입니다.
+        """
+        if self._next_marker < len(_STREAM_MARKERS):
+            return None
+        # 해설 표시 뒤 공백을 건너뛴 해설 내용의 시작
+        start = self._last_end()
+        while start < len(self.text) and self.text[start].isspace():
+            start += 1
+        if start >= len(self.text):
+            return None
+        candidates = [self.text.find(marker, start) for marker in _TRAILING_MARKERS]
+        candidates = [position for position in candidates if position >= 0]
+        if not candidates:
+            return None
+        # 표시 앞의 공백은 문항에 포함하지 않음
+        end = min(candidates)
+        while end > start and self.text[end - 1].isspace():
+            end -= 1
+        return end
+
+    def _last_end(self):
+        if not self._positions:
+            return 0
+        return self._positions[max(self._positions)][1]
+
+    def sections(self):
+        """
+        현재까지 받은 텍스트의 구역별 내용을 반환합니다.
+        """
+        sections = {"question": "", "options": "", "answer": "", "explanation": ""}
+        found = sorted(self._positions.items())
+        for i, (index, (_, end)) in enumerate(found):
+            name = _STREAM_MARKERS[index][1]
+            if name is None:
+                continue
+            stop = found[i + 1][1][0] if i + 1 < len(found) else len(self.text)
+            sections[name] = self.text[end:stop].strip()
+        return sections
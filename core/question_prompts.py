@@ -0,0 +1,118 @@
+"""
+객관식 문항 생성 프롬프트를 구성합니다 (question 생성기 역량, 기본값 P4-3-1 LLM 파인튜닝 역량).
+Streamlit 페이지와 일괄 생성 명령이 같은 프롬프트를 사용합니다.
+요청마다 바뀌지 않는 접두어와 예제 텍스트는 역량/난이도별로 한 번만 만들고,
+요청마다 사용자 입력만 채웁니다 (langchain 템플릿을 매번 만들지 않음).
+"""
+from functools import lru_cache
+
+from core.catalog import get_competency
+from core.examples import (
+    DEFAULT_EXAMPLE_COUNT, DEFAULT_EXAMPLE_TOKEN_BUDGET, example_index, formatted_examples, join_few_shot,
+)
+
+
+# 역량을 지정하지 않았을 때 사용할 역량 코드
+DEFAULT_COMPETENCY = "P4-3-1"
+
+# 기업 및 부서 리스트
+companies = ["SK하이닉스", "코드스테이츠", "KCC", "현대모비스", "전기안전공사", "건강보험심사평가원"]
+departments = ["데이터 엔지니어팀", "데이터 분석팀", "인공지능 연구팀", "디지털 마케팅팀", "DT 전략 기획팀", "교육 컨설팅 팀", "사업팀", "진단평가팀"]
+
+# 난이도 목록
+difficulties = ("하", "중", "상")
+
+# 난이도에 따른 추가 설명 및 지문 길이 조정
+difficulty_settings = {
+    "하": ("간결하고 기본적인 정보를 포함하여 짧은 지문을 생성하세요.", 500),
+    "중": ("세부 정보를 포함하고 약간의 배경 설명을 추가하여 중간 길이의 지문을 생성하세요.", 1000),
+    "상": ("심화된 설명과 추가적인 배경 정보를 포함하여 길고 상세한 지문을 생성하세요.", 1500),
+}
+default_difficulty_setting = ("기본 정보를 포함한 지문을 생성하세요.", 500)
+
+
+@lru_cache(maxsize=1024)
+def _prefix(code, difficulty):
+    # Prefix에 난이도와 추가 지시사항 포함 (역량/난이도별로 한 번만 생성)
+    complexity_instruction, _ = difficulty_settings.get(difficulty, default_difficulty_setting)
+    competency = get_competency(code)
+    return (
+        "당신은 시험문제를 생성하는 AI 비서입니다.\n"
+        "제공된 정보를 바탕으로 객관식 문제를 생성하세요.\n\n"
+        f"난이도: {difficulty}\n"
+        f"추가 지시사항: {complexity_instruction}\n\n"
+        "문항 형식:\n"
+        "- 지문은 상황 설명을 포함하여 문제에 필요한 배경 정보를 제공합니다.\n"
+        "- 질문은 객관식 형태로 작성됩니다. 예: '~중 가장 적절한 것은?', '~중 적절하지 않은 것은?'\n"
+        "- 선택지는 4개를 제공하고, 하나는 정답이고 나머지는 오답으로 구성됩니다.\n\n"
+        "Education Data:\n"
+        f"- Factor: {competency.factor}\n"
+        f"- Sub Factor: {competency.sub_factor}\n"
+        f"- Achievement Standard: {competency.achievement_standard}\n"
+        f"- Learning Object: {competency.learning_object}\n"
+        f"- Learning Target Note: {competency.learning_target_note}\n\n"
+    )
+
+
+# 응답 형식 안내 (사용자 입력 {input}만 요청마다 채움)
+_suffix = (
+    "Input: {input}\n"
+    "Output:\n"
+    "[질문]\n"
+    "생성형 인공지능과 관련된 상황 설명을 포함하세요.\n\n"
+    "[선지]"
+    "선지 1) 선택지 1 내용\n"
+    "선지 2) 선택지 2 내용\n"
+    "선지 3) 선택지 3 내용\n"
+    "선지 4) 선택지 4 내용\n\n"
+    "[정답 및 해설]"
+    "정답) 올바른 선택지\n"
+    "해설) 왜 이 선택지가 정답인지 설명하세요."
+)
+
+
+def build_question_messages(company, department, topic, difficulty,
+                            example_count=DEFAULT_EXAMPLE_COUNT, example_token_budget=DEFAULT_EXAMPLE_TOKEN_BUDGET,
+                            competency=DEFAULT_COMPETENCY, context=""):
+    """
+    객관식 문항 생성을 위한 Chat 메시지 목록을 만듭니다.
+    - company: 기업명
+    - department: 부서명
+    - topic: 문항 주제 (뉴스 기반 키워드 등)
+    - difficulty: 난이도 ("하", "중", "상")
+    - example_count: 넣을 few-shot 예제 수 (None이면 라이브러리의 모든 예제)
+    - example_token_budget: 예제에 쓸 최대 토큰 수
+    - competency: 역량 코드
+    - context: Education Data 뒤에 넣을 교안 내용 (core.retrieval.retrieve_context() 결과, 빈 문자열이면 생략)
+    반환값: ({"role", "content"} 메시지 목록, 난이도별 max_tokens)
+    """
+    complexity_instruction, max_tokens = difficulty_settings.get(difficulty, default_difficulty_setting)
+    library = get_competency(competency).example_library
+
+    # 사용자 입력과 뉴스 키워드를 바탕으로 문제 설정
+    user_input = (
+        f"{company} 기업의 {department}에서 '{topic}' 주제를 다룹니다. "
+        f"이와 관련하여 문제를 작성하세요."
+    )
+
+    # 주제와 가장 관련 있는 예제만 선택
+    if example_count is None:
+        example_texts = formatted_examples(library)
+    else:
+        index = example_index(library)
+        example_texts = [
+            index.formatted[i]
+            for i in index.select(f"{department} {topic}", k=example_count, token_budget=example_token_budget)
+        ]
+
+    final_prompt = join_few_shot(
+        _prefix(competency, difficulty) + context, example_texts, _suffix.format(input=user_input)
+    )
+
+    messages = [
+        {"role": "system", "content": "당신은 시험 문제를 생성하는 AI 비서입니다."},
+        {"role": "system", "content": f"문제 생성 시 '{topic}' 주제를 포함합니다."},
+        {"role": "system", "content": complexity_instruction},
+        {"role": "user", "content": final_prompt},
+    ]
+    return messages, max_tokens
@@ -0,0 +1,315 @@
+"""
+검수를 마친 문항(채택/폐기)을 저장하는 SQLite 저장소입니다.
+페이지마다 열 구성이 달랐던 generated_questions.csv / discarded_questions.csv를 대신하며,
+기존 CSV 파일은 처음 열 때 한 번만 가져옵니다.
+
+기존 CSV 가져오기 예: python -m core.question_store generated_questions.csv discarded_questions.csv
+"""
+import argparse
+import csv
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from core.question_parser import parse_question
+from core.registry import registry
+
+
+# 저장소 위치 (환경 변수로 변경 가능)
+DEFAULT_STORE_PATH = Path(os.environ.get("DTLAB_QUESTION_DB", "data/questions.sqlite3"))
+
+# 이전 버전 페이지가 기록하던 CSV 파일
+LEGACY_CSV_FILES = ("generated_questions.csv", "discarded_questions.csv")
+
+STATUSES = ("accepted", "discarded")
+
+# 문항 레코드의 열 (id 제외)
+COLUMNS = (
+    "status", "page", "company", "department", "competency", "difficulty", "topic",
+    "question", "options", "answer", "explanation", "raw",
+    "reviewer", "discard_reason", "discard_note", "source", "created_at",
+)
+
+# 조건 검색과 집계에 사용할 수 있는 열
+FILTER_COLUMNS = ("status", "page", "company", "department", "competency", "difficulty", "reviewer")
+
+# 스키마 변경 목록. i번째 항목을 적용하면 PRAGMA user_version이 i + 1이 됩니다.
+# 스키마를 바꿀 때는 기존 항목을 고치지 말고 새 항목을 뒤에 추가합니다.
+_MIGRATIONS = [
+    """
+    CREATE TABLE questions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        status TEXT NOT NULL,
+        page TEXT,
+        company TEXT,
+        department TEXT,
+        competency TEXT,
+        difficulty TEXT,
+        topic TEXT,
+        question TEXT,
+        options TEXT,
+        answer TEXT,
+        explanation TEXT,
+        raw TEXT,
+        reviewer TEXT,
+        discard_reason TEXT,
+        discard_note TEXT,
+        source TEXT NOT NULL DEFAULT 'app',
+        created_at TEXT NOT NULL
+    );
+    CREATE INDEX idx_questions_company ON questions (company, created_at);
+    CREATE INDEX idx_questions_department ON questions (department, created_at);
+    CREATE INDEX idx_questions_competency ON questions (competency, created_at);
+    CREATE INDEX idx_questions_reviewer ON questions (reviewer, created_at);
+    CREATE INDEX idx_questions_created_at ON questions (created_at);
+    CREATE INDEX idx_questions_status ON questions (status, created_at);
+    CREATE TABLE imports (
+        sha256 TEXT PRIMARY KEY,
+        path TEXT NOT NULL,
+        rows INTEGER NOT NULL,
+        imported_at TEXT NOT NULL
+    );
+    """,
+]
+
+SCHEMA_VERSION = len(_MIGRATIONS)
+
+
+def _now():
+    return time.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+class QuestionStore:
+    """
+    문항을 SQLite(WAL)에 저장하고 조건별로 조회합니다.
+    여러 문항을 저장할 때는 save_many()로 한 트랜잭션에 묶어 기록합니다.
+    - path: SQLite 파일 경로
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+
+    def _migrate(self):
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise RuntimeError(f"지원하지 않는 문항 저장소 버전입니다: {version} (최대 {SCHEMA_VERSION})")
+        for number, script in enumerate(_MIGRATIONS[version:], start=version + 1):
+            # 변경 내용과 버전 기록을 한 트랜잭션으로 적용
+            self._conn.executescript(f"BEGIN; {script} PRAGMA user_version = {number}; COMMIT;")
+
+    @property
+    def schema_version(self):
+        return self._conn.execute("PRAGMA user_version").fetchone()[0]
+
+    @staticmethod
+    def _row(record):
+        if record.get("status", "accepted") not in STATUSES:
+            raise ValueError(f"알 수 없는 문항 상태입니다: {record['status']}")
+        values = {"status": "accepted", "source": "app", "created_at": _now(), **record}
+        return tuple(values.get(column) for column in COLUMNS)
+
+    def save(self, record):
+        """
+        문항 하나를 저장하고 ID를 반환합니다.
+        - record: COLUMNS 중 일부를 키로 갖는 dict (status 기본값 "accepted")
+        """
+        placeholders = ", ".join("?" for _ in COLUMNS)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"INSERT INTO questions ({', '.join(COLUMNS)}) VALUES ({placeholders})", self._row(record)
+            )
+            return cursor.lastrowid
+
+    def save_many(self, records):
+        """
+        여러 문항을 한 트랜잭션으로 저장하고 저장한 개수를 반환합니다.
+        - records: save()와 같은 형식의 dict 목록
+        """
+        rows = [self._row(record) for record in records]
+        placeholders = ", ".join("?" for _ in COLUMNS)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    f"INSERT INTO questions ({', '.join(COLUMNS)}) VALUES ({placeholders})", rows
+                )
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return len(rows)
+
+    def _where(self, filters, since, until):
+        clauses, params = [], []
+        for column, value in filters.items():
+            if column not in FILTER_COLUMNS:
+                raise ValueError(f"검색할 수 없는 열입니다: {column}")
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(until)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def query(self, since=None, until=None, limit=None, offset=0, **filters):
+        """
+        조건에 맞는 문항을 최신순으로 반환합니다.
+        - since, until: 저장 시각 범위 (YYYY-MM-DD 또는 YYYY-MM-DDTHH:MM:SS, until은 미포함)
+        - limit, offset: 반환할 개수와 시작 위치
+        - filters: FILTER_COLUMNS 열 = 값 (예: company="KCC", status="discarded")
+        """
+        where, params = self._where(filters, since, until)
+        sql = f"SELECT * FROM questions{where} ORDER BY created_at DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def count(self, since=None, until=None, **filters):
+        """
+        조건에 맞는 문항 수를 반환합니다. 인자는 query()와 같습니다.
+        """
+        where, params = self._where(filters, since, until)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM questions{where}", params).fetchone()[0]
+
+    def counts_by(self, column, since=None, until=None, **filters):
+        """
+        열 값별 문항 수를 많은 순으로 반환합니다.
+        - column: 집계 기준 열 (FILTER_COLUMNS 중 하나)
+        반환값: [(값, 문항 수)]
+        """
+        if column not in FILTER_COLUMNS:
+            raise ValueError(f"집계할 수 없는 열입니다: {column}")
+        where, params = self._where(filters, since, until)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {column}, COUNT(*) FROM questions{where} GROUP BY {column} ORDER BY COUNT(*) DESC",
+                params,
+            ).fetchall()
+        return [tuple(row) for row in rows]
+
+    def import_csv(self, path):
+        """
+        이전 페이지가 기록한 CSV 파일을 가져옵니다. 같은 내용의 파일은 한 번만 가져옵니다.
+        열 개수로 형식을 구분합니다.
+        - 1열: P4-1-1 채택 문항 (원문)
+        - 5열: P4-3-1 채택 문항 (질문, 선지, 정답, 해설, 검수자)
+        - 7열: P4-3-1 폐기 문항 (질문, 선지, 정답, 해설, 폐기 사유, 추가 설명, 검수자)
+        - path: CSV 파일 경로
+        반환값: {"imported", "skipped", "already_imported"}
+        """
+        path = Path(path)
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            done = self._conn.execute("SELECT 1 FROM imports WHERE sha256 = ?", (digest,)).fetchone()
+        if done:
+            return {"imported": 0, "skipped": 0, "already_imported": True}
+
+        # 기존 CSV에는 저장 시각이 없으므로 파일 수정 시각을 사용
+        created_at = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(path.stat().st_mtime))
+        source = f"csv:{path.name}"
+        records, skipped = [], 0
+        for row in csv.reader(data.decode("utf-8-sig").splitlines(keepends=True)):
+            if len(row) == 1:
+                parsed = parse_question(row[0])
+                records.append({
+                    "page": "P4-1-1", "raw": row[0], **parsed,
+                    "question": parsed["question"] or row[0],
+                })
+            elif len(row) == 5:
+                records.append({
+                    "page": "P4-3-1",
+                    "question": row[0], "options": row[1], "answer": row[2], "explanation": row[3],
+                    "reviewer": row[4],
+                })
+            elif len(row) == 7:
+                records.append({
+                    "status": "discarded", "page": "P4-3-1",
+                    "question": row[0], "options": row[1], "answer": row[2], "explanation": row[3],
+                    "discard_reason": row[4], "discard_note": row[5], "reviewer": row[6],
+                })
+            else:
+                skipped += 1
+        for record in records:
+            record.update(source=source, created_at=created_at)
+
+        self.save_many(records)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO imports (sha256, path, rows, imported_at) VALUES (?, ?, ?, ?)",
+                (digest, str(path), len(records), _now()),
+            )
+        return {"imported": len(records), "skipped": skipped, "already_imported": False}
+
+
+def import_legacy_csvs(store, directory="."):
+    """
+    작업 디렉터리에 남아 있는 이전 CSV 파일을 가져옵니다.
+    - store: QuestionStore
+    - directory: CSV 파일이 있는 디렉터리
+    반환값: {파일 경로: import_csv() 결과}
+    """
+    results = {}
+    for name in LEGACY_CSV_FILES:
+        path = Path(directory) / name
+        if path.exists():
+            results[str(path)] = store.import_csv(path)
+    return results
+
+
+def _open_default_store():
+    store = QuestionStore()
+    import_legacy_csvs(store)
+    return store
+
+
+def question_store():
+    """
+    프로세스 전체에서 공유하는 문항 저장소를 반환합니다.
+    처음 열 때 남아 있는 이전 CSV 파일을 가져옵니다.
+    """
+    return registry.get("question_store", _open_default_store)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="이전 CSV 문항 파일을 문항 저장소로 가져오기")
+    parser.add_argument("files", nargs="*", default=list(LEGACY_CSV_FILES), help="가져올 CSV 파일")
+    parser.add_argument("--db", default=str(DEFAULT_STORE_PATH), help="문항 저장소 경로")
+    args = parser.parse_args()
+
+    store = QuestionStore(args.db)
+    for path in args.files:
+        if not Path(path).exists():
+            print(f"{path}: 파일 없음")
+            continue
+        result = store.import_csv(path)
+        if result["already_imported"]:
+            print(f"{path}: 이미 가져온 파일")
+        else:
+            print(f"{path}: {result['imported']}개 가져옴, {result['skipped']}개 건너뜀")
+    print(
+        f"저장된 문항: 채택 {store.count(status='accepted')}개, "
+        f"폐기 {store.count(status='discarded')}개 (스키마 버전 {store.schema_version})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,470 @@
+"""
+모든 모델 호출 앞에 두는 공유 속도 제한기입니다. 여러 검수자, 작업 대기열, 일괄 생성이 동시에 호출해도
+OpenAI 한도(분당 요청 수/토큰 수)를 넘지 않도록 호출 전에 순서를 기다리게 합니다.
+- 분당 요청 수(RPM)와 분당 토큰 수(TPM) 토큰 버킷 (토큰은 호출 전 추정값: 프롬프트 토큰 + max_tokens)
+- 동시 호출 수를 429 응답과 응답 지연으로 조절 (AIMD: 성공 시 조금씩 늘리고, 429나 지연 증가 시 크게 줄임)
+- 429를 받으면 모든 호출을 Retry-After 또는 지터를 넣은 지수 대기 시간만큼 멈춘 뒤 다시 시도
+- 기다리는 호출은 세션별로 번갈아 허용 (일괄 생성이 많아도 검수자 요청이 밀리지 않음)
+
+한도는 모델별로 따로 관리합니다 (OpenAI 한도가 모델별이므로).
+
+환경 변수:
+- DTLAB_LLM_LIMITS: 모델별 한도 "모델=RPM:TPM" 목록 (예: "gpt-4=500:10000,gpt-4-turbo=500:30000")
+- DTLAB_LLM_CONCURRENCY: 시작 동시 호출 수 (기본값 8)
+- DTLAB_LLM_MAX_RETRIES: 429를 받았을 때 다시 시도하는 최대 횟수 (기본값 5)
+"""
+import contextvars
+import os
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+from core.registry import registry
+from core.tokens import count_message_tokens
+
+# 모델별 분당 (요청 수, 토큰 수) 한도 (OpenAI 사용량 등급 1 기준). 목록에 없는 모델은 DEFAULT_LIMITS 사용
+MODEL_LIMITS = {
+    "gpt-4": (500, 10000),
+    "gpt-4-turbo": (500, 30000),
+    "gpt-4o": (500, 30000),
+    "gpt-3.5-turbo": (3500, 60000),
+}
+DEFAULT_LIMITS = (500, 10000)
+
+INITIAL_CONCURRENCY = int(os.environ.get("DTLAB_LLM_CONCURRENCY", "8"))
+MAX_CONCURRENCY = 64
+MAX_RETRIES = int(os.environ.get("DTLAB_LLM_MAX_RETRIES", "5"))
+
+# 버킷에 모아 둘 수 있는 최대량 (초 단위 한도). OpenAI는 분당 한도를 더 짧은 구간으로 나누어 적용하므로
+# 1분치를 한 번에 쓰지 않도록 제한
+BURST_SECONDS = 6.0
+
+# max_tokens가 없는 호출의 응답 토큰 추정값
+DEFAULT_COMPLETION_TOKENS = 1000
+
+# 429를 받았을 때의 대기 시간 (초): 연속 횟수마다 두 배, 최대 MAX_BACKOFF
+BASE_BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+
+# 응답 지연이 기준(관측한 최소 지연)의 이 배수를 넘으면 동시 호출 수를 줄임.
+# 첫 토큰까지의 지연(스트리밍)과 전체 호출 지연은 크기가 다르므로 기준을 따로 두고,
+# 전체 호출 지연은 응답 길이에 따라 달라지므로 토큰 추정값 하나당 지연으로 나누어 비교
+LATENCY_TOLERANCE = 2.0
+LATENCY_DECREASE = 0.9
+RATE_LIMIT_DECREASE = 0.5
+
+_session = contextvars.ContextVar("dtlab_rate_limit_session", default="default")
+
+
+def _parse_limits(value):
+    limits = dict(MODEL_LIMITS)
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        model, rates = item.split("=")
+        rpm, tpm = rates.split(":")
+        limits[model.strip()] = (int(rpm), int(tpm))
+    return limits
+
+
+_LIMITS = _parse_limits(os.environ.get("DTLAB_LLM_LIMITS", ""))
+
+
+@contextmanager
+def rate_limit_session(name):
+    """
+    이 블록 안의 모델 호출을 세션 하나로 묶어 다른 세션과 번갈아 허용되도록 합니다.
+    asyncio 작업과 asyncio.to_thread는 현재 세션을 물려받습니다.
+    - name: 세션 이름 (Streamlit 세션 ID, "batch" 등)
+    """
+    token = _session.set(name or "default")
+    try:
+        yield
+    finally:
+        _session.reset(token)
+
+
+def request_tokens(messages, model, max_tokens=None, prompt_tokens=None):
+    """
+    호출 전 토큰 추정값을 계산합니다. OpenAI도 요청 시점에 max_tokens를 응답 토큰으로 계산하므로 같은 방식을 사용합니다.
+    - messages: 메시지 목록
+    - model: 모델 이름
+    - max_tokens: 최대 응답 토큰 수 (None이면 DEFAULT_COMPLETION_TOKENS)
+    - prompt_tokens: 이미 계산한 프롬프트 토큰 수 (None이면 계산)
+    """
+    if prompt_tokens is None:
+        prompt_tokens = count_message_tokens(messages, model)
+    return prompt_tokens + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+
+
+def is_rate_limit_error(error):
+    """
+    OpenAI(0.x/1.x)나 langchain이 발생시킨 429 오류인지 확인합니다.
+    """
+    if getattr(error, "http_status", None) == 429 or getattr(error, "status_code", None) == 429:
+        return True
+    return any(cls.__name__ == "RateLimitError" for cls in type(error).__mro__)
+
+
+def retry_after(error):
+    """
+    429 오류의 Retry-After 헤더 값(초)을 반환합니다. 없으면 None을 반환합니다.
+    """
+    headers = getattr(error, "headers", None) or getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    분당 한도를 초 단위로 채우는 토큰 버킷입니다.
+    요청량이 최대량보다 크면 버킷이 가득 찼을 때 허용하고 잔량을 음수로 남겨, 장기 평균이 한도를 넘지 않게 합니다.
+    - per_minute: 분당 한도
+    - burst_seconds: 모아 둘 수 있는 최대량 (초 단위 한도)
+    """
+
+    def __init__(self, per_minute, burst_seconds=BURST_SECONDS):
+        self.rate = per_minute / 60
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount, now):
+        """
+        amount만큼 사용할 수 있을 때까지 남은 시간(초)을 반환합니다.
+        """
+        self._refill(now)
+        need = min(amount, self.capacity)
+        return 0.0 if self.level >= need else (need - self.level) / self.rate
+
+    def take(self, amount, now):
+        self._refill(now)
+        self.level -= amount
+
+    def drain(self, now):
+        # 서버 쪽 한도가 이미 바닥났으므로 남은 양을 비움
+        self._refill(now)
+        self.level = min(self.level, 0.0)
+
+
+class _Waiter:
+    __slots__ = ("tokens", "granted")
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.granted = False
+
+
+class Permit:
+    """
+    호출 하나의 허가입니다. 호출이 끝나면 release()로 결과를 알려 동시 호출 수를 조절합니다.
+    """
+
+    def __init__(self, limiter, tokens, waited):
+        self.limiter = limiter
+        self.tokens = tokens
+        self.waited = waited
+        self._released = False
+
+    def release(self, latency=None, rate_limited=False, retry_after=None, first_token=False):
+        """
+        - latency: 응답 지연 (초)
+        - rate_limited: 429를 받았으면 True
+        - retry_after: 429 응답의 Retry-After 값 (초)
+        - first_token: latency가 첫 토큰까지의 시간(스트리밍)이면 True, 전체 호출 시간이면 False
+        """
+        if not self._released:
+            self._released = True
+            if latency is None:
+                signal = None
+            elif first_token:
+                signal = "first_token"
+            else:
+                signal = "call"
+                latency = latency / max(self.tokens, 1)
+            self.limiter._release(latency, rate_limited, retry_after, signal)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class RateLimiter:
+    """
+    모델 하나의 요청 수/토큰 수 버킷, 동시 호출 수, 세션별 대기열을 관리합니다.
+    - rpm: 분당 요청 수 한도
+    - tpm: 분당 토큰 수 한도
+    - concurrency: 시작 동시 호출 수
+    - max_concurrency: 동시 호출 수 상한
+    """
+
+    def __init__(self, rpm, tpm, concurrency=INITIAL_CONCURRENCY, max_concurrency=MAX_CONCURRENCY):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.limit = float(concurrency)
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self._cond = threading.Condition()
+        self._sessions = OrderedDict()
+        self._resume_at = 0.0
+        self._consecutive_limited = 0
+        # 지연 종류별 ("first_token", "call") 지수 이동 평균과 기준
+        self._latency = {}
+        self._baseline = {}
+        self._stats = {"granted": 0, "rate_limited": 0, "waited_seconds": 0.0, "max_wait_seconds": 0.0}
+
+    def acquire(self, tokens, session=None, timeout=None):
+        """
+        호출 허가를 받을 때까지 기다립니다. 세션마다 순서대로, 세션끼리는 번갈아 허가합니다.
+        - tokens: 토큰 추정값 (request_tokens())
+        - session: 세션 이름 (None이면 rate_limit_session()으로 지정한 세션)
+        - timeout: 최대 대기 시간 (초, 넘으면 TimeoutError)
+        반환값: Permit
+        """
+        session = session or _session.get()
+        waiter = _Waiter(tokens)
+        started = time.monotonic()
+        with self._cond:
+            self._sessions.setdefault(session, deque()).append(waiter)
+            while True:
+                wait = self._dispatch(time.monotonic())
+                if waiter.granted:
+                    break
+                if timeout is not None:
+                    remaining = started + timeout - time.monotonic()
+                    if remaining <= 0:
+                        self._remove(session, waiter)
+                        raise TimeoutError("모델 호출 허가를 기다리는 시간이 초과되었습니다.")
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._cond.wait(wait)
+            waited = time.monotonic() - started
+            self._stats["waited_seconds"] += waited
+            self._stats["max_wait_seconds"] = max(self._stats["max_wait_seconds"], waited)
+        return Permit(self, tokens, waited)
+
+    def _remove(self, session, waiter):
+        waiters = self._sessions.get(session)
+        if waiters is not None and waiter in waiters:
+            waiters.remove(waiter)
+            if not waiters:
+                del self._sessions[session]
+
+    def _dispatch(self, now):
+        # 차례가 된 세션의 첫 호출부터 허가하고, 더 허가할 수 없으면 다음 확인까지 남은 시간을 반환
+        # (None이면 진행 중인 호출이 끝날 때까지 대기). 큰 호출이 계속 밀리지 않도록 차례를 건너뛰지 않음
+        granted = False
+        wait = None
+        while self._sessions:
+            if self.in_flight >= int(self.limit):
+                break
+            if now < self._resume_at:
+                wait = self._resume_at - now
+                break
+            session, waiters = next(iter(self._sessions.items()))
+            waiter = waiters[0]
+            wait = max(self.requests.wait_time(1, now), self.tokens.wait_time(waiter.tokens, now))
+            if wait > 0:
+                break
+            wait = None
+            self.requests.take(1, now)
+            self.tokens.take(waiter.tokens, now)
+            self.in_flight += 1
+            self._stats["granted"] += 1
+            waiter.granted = granted = True
+            # 허가한 세션은 남은 호출과 함께 맨 뒤로 보냄
+            waiters.popleft()
+            del self._sessions[session]
+            if waiters:
+                self._sessions[session] = waiters
+        if granted:
+            self._cond.notify_all()
+        return wait
+
+    def _release(self, latency, rate_limited, retry_after, signal):
+        with self._cond:
+            now = time.monotonic()
+            self.in_flight -= 1
+            if rate_limited:
+                self._stats["rate_limited"] += 1
+                # 이미 멈춘 상태에서 함께 실패한 호출은 한 번만 반영
+                if now >= self._resume_at:
+                    self._consecutive_limited += 1
+                    self.limit = max(1.0, self.limit * RATE_LIMIT_DECREASE)
+                    if retry_after is None:
+                        # 지터를 넣은 지수 대기 (절반은 고정, 절반은 무작위)
+                        backoff = min(MAX_BACKOFF, BASE_BACKOFF * 2 ** (self._consecutive_limited - 1))
+                        retry_after = backoff / 2 + random.uniform(0, backoff / 2)
+                    self._resume_at = now + retry_after
+                    self.requests.drain(now)
+                    self.tokens.drain(now)
+            elif latency is not None:
+                # 성공한 호출만 반영 (다른 오류는 동시 호출 수를 바꾸지 않음)
+                self._consecutive_limited = 0
+                self._observe_latency(signal, latency)
+                # 한도까지 사용 중일 때만 늘림 (한가할 때 상한이 계속 커지지 않도록)
+                if self.in_flight + 1 >= int(self.limit):
+                    self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+            self._dispatch(now)
+            self._cond.notify_all()
+
+    def _observe_latency(self, signal, latency):
+        previous = self._latency.get(signal)
+        current = self._latency[signal] = latency if previous is None else 0.8 * previous + 0.2 * latency
+        baseline = self._baseline.get(signal)
+        if baseline is None or current < baseline:
+            baseline = current
+        else:
+            # 모델 응답 속도가 실제로 느려진 경우를 따라가도록 기준을 천천히 올림
+            baseline += (current - baseline) * 0.01
+        self._baseline[signal] = baseline
+        if current > LATENCY_TOLERANCE * baseline:
+            self.limit = max(1.0, self.limit * LATENCY_DECREASE)
+
+    def stats(self):
+        """
+        현재 동시 호출 수 한도, 진행/대기 중인 호출 수, 허가/429 횟수, 대기 시간을 반환합니다.
+        """
+        with self._cond:
+            return {
+                **self._stats,
+                "limit": self.limit,
+                "in_flight": self.in_flight,
+                "queued": sum(len(waiters) for waiters in self._sessions.values()),
+                "sessions": len(self._sessions),
+                "latency": dict(self._latency),
+            }
+
+
+def rate_limiter(model):
+    """
+    프로세스 전체에서 공유하는 모델별 속도 제한기를 반환합니다.
+    - model: 모델 이름
+    """
+    rpm, tpm = _LIMITS.get(model, DEFAULT_LIMITS)
+    return registry.get(f"rate_limiter:{model}", lambda: RateLimiter(rpm, tpm))
+
+
+def _attempts(model):
+    # 429를 받으면 허가를 반납하고 (제한기가 대기 시간을 정함) 다시 허가를 받아 시도
+    limiter = rate_limiter(model)
+    for attempt in range(MAX_RETRIES + 1):
+        yield limiter, attempt == MAX_RETRIES
+
+
+def call_with_limit(model, tokens, call):
+    """
+    허가를 받아 모델을 호출하고, 429를 받으면 대기 후 다시 시도합니다.
+    - model: 모델 이름
+    - tokens: 토큰 추정값 (request_tokens())
+    - call: 인자 없이 모델을 호출하는 함수
+    """
+    for limiter, last in _attempts(model):
+        permit = limiter.acquire(tokens)
+        started = time.monotonic()
+        try:
+            result = call()
+        except Exception as e:
+            if is_rate_limit_error(e) and not last:
+                permit.release(rate_limited=True, retry_after=retry_after(e))
+                continue
+            permit.release()
+            raise
+        except BaseException:
+            # 취소나 인터럽트도 허가를 반납 (지연 시간은 반영하지 않음)
+            permit.release()
+            raise
+        permit.release(latency=time.monotonic() - started)
+        return result
+
+
+async def _acquire_in_thread(limiter, tokens):
+    # 대기 중에 취소되어도 작업 스레드는 결국 허가를 받으므로, 받는 즉시 반납하도록 표시해 둠
+    import asyncio
+
+    lock = threading.Lock()
+    state = {"cancelled": False, "permit": None}
+
+    def acquire():
+        permit = limiter.acquire(tokens)
+        with lock:
+            if state["cancelled"]:
+                permit.release()
+            else:
+                state["permit"] = permit
+        return permit
+
+    try:
+        return await asyncio.to_thread(acquire)
+    except asyncio.CancelledError:
+        with lock:
+            state["cancelled"] = True
+            permit = state["permit"]
+        if permit is not None:
+            # 허가를 받은 직후 결과를 넘기기 전에 취소된 경우
+            permit.release()
+        raise
+
+
+async def acall_with_limit(model, tokens, call):
+    """
+    call_with_limit()의 asyncio 버전입니다. 허가는 작업 스레드에서 기다리므로 이벤트 루프를 막지 않습니다.
+    - call: 인자 없이 호출하면 awaitable을 반환하는 함수
+    """
+    for limiter, last in _attempts(model):
+        permit = await _acquire_in_thread(limiter, tokens)
+        started = time.monotonic()
+        try:
+            result = await call()
+        except Exception as e:
+            if is_rate_limit_error(e) and not last:
+                permit.release(rate_limited=True, retry_after=retry_after(e))
+                continue
+            permit.release()
+            raise
+        except BaseException:
+            # 취소나 인터럽트도 허가를 반납 (지연 시간은 반영하지 않음)
+            permit.release()
+            raise
+        permit.release(latency=time.monotonic() - started)
+        return result
+
+
+def open_with_limit(model, tokens, call):
+    """
+    스트리밍 호출을 시작합니다. 호출 시작에서 429를 받으면 call_with_limit()처럼 다시 시도하며,
+    반환한 허가는 스트림을 끝까지 읽은 뒤 호출자가 release() 합니다.
+    반환값: (call() 결과, Permit)
+    """
+    for limiter, last in _attempts(model):
+        permit = limiter.acquire(tokens)
+        try:
+            return call(), permit
+        except Exception as e:
+            if is_rate_limit_error(e) and not last:
+                permit.release(rate_limited=True, retry_after=retry_after(e))
+                continue
+            permit.release()
+            raise
+        except BaseException:
+            permit.release()
+            raise
+
+
+def limiter_stats():
+    """
+    지금까지 사용한 모델별 속도 제한기의 상태를 반환합니다.
+    """
+    return {
+        stats["name"].split(":", 1)[1]: registry.get(stats["name"]).stats()
+        for stats in registry.stats()
+        if stats["name"].startswith("rate_limiter:") and stats["status"] == "loaded"
+    }
@@ -0,0 +1,211 @@
+import threading
+import time
+
+
+class ResourceRegistry:
+    """
+    spaCy 파이프라인, 채팅 클라이언트, HTTP 세션처럼 생성 비용이 큰 객체를
+    프로세스 전체에서 한 번만 만들어 공유하는 저장소입니다.
+    Streamlit은 페이지 스크립트를 매번 다시 실행하지만 import된 모듈은 유지되므로,
+    여기에 보관한 객체는 모든 세션과 페이지가 함께 사용합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._factories = {}
+        self._resources = {}
+        self._name_locks = {}
+        self._stats = {}
+
+    def register(self, name, factory):
+        """
+        자원 생성 함수를 등록합니다. 이미 등록된 이름이면 무시합니다.
+        - name: 자원 이름
+        - factory: 인자 없이 자원을 생성하는 함수
+        """
+        with self._lock:
+            if name not in self._factories:
+                self._factories[name] = factory
+                self._name_locks[name] = threading.Lock()
+                self._stats[name] = {
+                    "name": name,
+                    "status": "pending",
+                    "load_seconds": None,
+                    "hits": 0,
+                    "last_wait_seconds": None,
+                    "error": None,
+                }
+
+    def get(self, name, factory=None):
+        """
+        자원을 반환합니다. 처음 요청될 때 한 번만 생성합니다.
+        - name: 자원 이름
+        - factory: 등록되지 않은 경우 사용할 생성 함수
+        """
+        if factory is not None:
+            self.register(name, factory)
+
+        start = time.perf_counter()
+        resource = self._resources.get(name)
+        if resource is None:
+            with self._name_locks[name]:
+                resource = self._resources.get(name)
+                if resource is None:
+                    resource = self._load(name)
+
+        with self._lock:
+            stats = self._stats[name]
+            stats["hits"] += 1
+            stats["last_wait_seconds"] = time.perf_counter() - start
+        return resource
+
+    def _load(self, name):
+        self._stats[name]["status"] = "loading"
+        start = time.perf_counter()
+        try:
+            resource = self._factories[name]()
+        except Exception as e:
+            self._stats[name].update(status="error", error=str(e))
+            raise
+        self._stats[name].update(status="loaded", load_seconds=time.perf_counter() - start, error=None)
+        self._resources[name] = resource
+        return resource
+
+    def is_loaded(self, name):
+        return name in self._resources
+
+    def stats(self):
+        """
+        자원별 상태, 최초 로드 시간, 사용 횟수, 마지막 대기 시간을 반환합니다.
+        """
+        with self._lock:
+            return [dict(stats) for stats in self._stats.values()]
+
+
+# 프로세스 전체에서 공유하는 기본 저장소
+registry = ResourceRegistry()
+
+_warmup_lock = threading.Lock()
+_warmup_thread = None
+
+
+def spacy_splitter(chunk_size=350, pipeline="ko_core_news_sm"):
+    """
+    spaCy 파이프라인을 로드한 SpacyTextSplitter를 반환합니다.
+    - chunk_size: 청크 크기
+    - pipeline: spaCy 파이프라인 이름
+    """
+    def _factory():
+        from langchain.text_splitter import SpacyTextSplitter
+        return SpacyTextSplitter(chunk_size=chunk_size, pipeline=pipeline)
+
+    return registry.get(f"splitter:{pipeline}:{chunk_size}", _factory)
+
+
+def chat_client(model="gpt-4-turbo", temperature=0.5, max_tokens=1500):
+    """
+    설정별로 하나씩 만들어 공유하는 ChatOpenAI 클라이언트를 반환합니다.
+    - model: 모델 이름
+    - temperature: 샘플링 온도
+    - max_tokens: 최대 생성 토큰 수
+    """
+    def _factory():
+        from langchain.chat_models import ChatOpenAI
+        # 429 재시도는 공유 속도 제한기(core.ratelimit)가 처리하므로 langchain은 한 번만 시도
+        return ChatOpenAI(model=model, temperature=temperature, max_tokens=max_tokens, max_retries=1)
+
+    return registry.get(f"chat:{model}:{temperature}:{max_tokens}", _factory)
+
+
+def http_session(name="default"):
+    """
+    연결을 재사용하는 requests.Session을 반환합니다.
+    - name: 세션 이름 (API별로 분리)
+    """
+    def _factory():
+        import requests
+        return requests.Session()
+
+    return registry.get(f"http:{name}", _factory)
+
+
+def keyword_engine_class():
+    """
+    numpy/scipy/scikit-learn을 포함한 키워드 엔진 모듈을 로드해 클래스를 반환합니다.
+    """
+    def _factory():
+        from core.keywords import KeywordEngine
+        return KeywordEngine
+
+    return registry.get("vectorizer:keywords", _factory)
+
+
+def _news_client():
+    from core.news_client import news_client
+    return news_client()
+
+
+def _duplicate_index():
+    from core.dedup import duplicate_index
+    return duplicate_index()
+
+
+def _example_index():
+    from core.examples import example_index
+    return example_index("P4-3-1")
+
+
+def _default_card_image():
+    from core.catalog import card_image, get_competency
+    from core.question_prompts import DEFAULT_COMPETENCY
+    return card_image(get_competency(DEFAULT_COMPETENCY))
+
+
+def _retrieval_index():
+    from core.retrieval import retrieval_index
+    return retrieval_index()
+
+
+def _token_caps():
+    from core.token_caps import token_caps
+    return token_caps()
+
+
+def _job_queue():
+    # 이전 프로세스에서 끝나지 않은 작업을 바로 이어서 실행
+    from core.jobs import job_queue
+    return job_queue()
+
+
+def start_warmup():
+    """
+    페이지에서 사용하는 기본 자원을 백그라운드에서 미리 로드합니다.
+    프로세스당 한 번만 실행됩니다.
+    """
+    global _warmup_thread
+    with _warmup_lock:
+        if _warmup_thread is not None:
+            return _warmup_thread
+
+        def _run():
+            for loader in (
+                keyword_engine_class,
+                spacy_splitter,
+                lambda: chat_client("gpt-4-turbo", 0.5, 1500),  # 일괄 생성 (core.batch)
+                _news_client,
+                _duplicate_index,
+                _example_index,
+                _default_card_image,
+                _retrieval_index,
+                _token_caps,
+                _job_queue,
+            ):
+                try:
+                    loader()
+                except Exception:
+                    # 오류는 registry.stats()에 기록되며 실제 요청 시 다시 시도됩니다.
+                    pass
+
+        _warmup_thread = threading.Thread(target=_run, name="resource-warmup", daemon=True)
+        _warmup_thread.start()
+        return _warmup_thread
@@ -0,0 +1,51 @@
+import math
+
+import pandas as pd
+
+
+COLUMNS = ["청크", "페이지", "키워드"]
+
+
+def results_table(result, first_chunk=1):
+    """
+    청크별 키워드 결과를 하나의 표로 만듭니다.
+    - result: {"chunks", "chunk_keywords"} 형태의 처리 결과
+    - first_chunk: 첫 청크의 번호
+    """
+    chunks = result["chunks"]
+    return pd.DataFrame({
+        "청크": range(first_chunk, first_chunk + len(chunks)),
+        # PyMuPDF 페이지 번호는 0부터 시작하므로 화면에는 1부터 표시
+        "페이지": [chunk["metadata"].get("page", -1) + 1 for chunk in chunks],
+        "키워드": [", ".join(keywords) for keywords in result["chunk_keywords"]],
+    }, columns=COLUMNS)
+
+
+def filter_results(table, keyword="", page=None):
+    """
+    서버에서 키워드와 페이지 조건으로 표를 걸러냅니다.
+    - table: results_table()로 만든 표
+    - keyword: 포함되어야 할 키워드 (대소문자 무시, 빈 문자열이면 전체)
+    - page: 페이지 번호 (1부터, None이면 전체)
+    """
+    mask = pd.Series(True, index=table.index)
+    keyword = keyword.strip()
+    if keyword:
+        mask &= table["키워드"].str.contains(keyword, case=False, regex=False)
+    if page is not None:
+        mask &= table["페이지"] == page
+    return table[mask]
+
+
+def page_slice(table, page_no, page_size):
+    """
+    표에서 화면에 보여줄 한 페이지 분량만 잘라냅니다.
+    - table: 걸러낸 표
+    - page_no: 보여줄 페이지 번호 (1부터)
+    - page_size: 페이지당 행 수
+    반환값: (잘라낸 표, 전체 페이지 수)
+    """
+    total_pages = max(1, math.ceil(len(table) / page_size))
+    page_no = min(max(1, page_no), total_pages)
+    start = (page_no - 1) * page_size
+    return table.iloc[start:start + page_size], total_pages
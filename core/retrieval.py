@@ -0,0 +1,544 @@
+"""
+처리한 교안 PDF의 청크를 검색하는 BM25 색인입니다.
+문항/지문 생성 시 요청과 관련 있는 교안 내용을 토큰 예산 안에서 프롬프트에 넣는 데 사용합니다.
+
+색인은 세그먼트 디렉터리 여러 개와 manifest.json으로 저장합니다.
+- 문서를 추가할 때마다 새 세그먼트를 하나 만들고 기존 세그먼트는 고치지 않음 (증분 갱신)
+- 세그먼트 배열(.npy)과 청크 텍스트는 메모리 매핑으로 열어, 색인 크기와 관계없이 바로 열림
+- 크기가 비슷한 세그먼트가 MERGE_FACTOR개 모이면 하나로 병합 (청크 하나가 다시 기록되는 횟수는 log 수준)
+
+한국어는 띄어쓰기 단위가 일정하지 않아 한글은 글자 2-gram, 영문/숫자는 단어를 검색어로 사용하며,
+검색어는 64비트 키(한글은 음절 번호, 영문/숫자는 해시)로 저장하여 단어 사전 없이 이진 탐색으로 찾습니다.
+
+환경 변수:
+- DTLAB_RETRIEVAL_DIR: 색인 디렉터리 (기본값 .cache/retrieval)
+- DTLAB_RETRIEVAL_TOP_K: 프롬프트에 넣을 최대 청크 수 (기본값 3)
+- DTLAB_RETRIEVAL_TOKEN_BUDGET: 프롬프트에 넣을 청크의 최대 토큰 수 합계 (기본값 600)
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from core.registry import registry
+from core.tokens import count_tokens
+
+
+RETRIEVAL_DIR = Path(os.environ.get("DTLAB_RETRIEVAL_DIR", Path(os.environ.get("DTLAB_CACHE_DIR", ".cache")) / "retrieval"))
+DEFAULT_TOP_K = int(os.environ.get("DTLAB_RETRIEVAL_TOP_K", "3"))
+DEFAULT_TOKEN_BUDGET = int(os.environ.get("DTLAB_RETRIEVAL_TOKEN_BUDGET", "600"))
+
+MANIFEST_VERSION = 1
+# 크기 단계(청크 수의 MERGE_FACTOR 로그)가 같은 세그먼트가 이 개수만큼 모이면 병합
+MERGE_FACTOR = 8
+
+# BM25 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_ASCII_WORD = re.compile(r"[A-Za-z0-9]+")
+_SEGMENT_ARRAYS = ("terms", "offsets", "docs", "tfs", "lengths", "text_offsets", "pages", "documents")
+
+# 검색어 키 (uint64): 한글 2-gram과 한 글자 단어는 음절 번호로 바로 만들고, 영문/숫자 단어는 해시 사용
+_HANGUL_FIRST = 0xAC00
+_HANGUL_COUNT = 11172
+_BIGRAM_FLAG = np.uint64(1 << 63)
+_SYLLABLE_FLAG = np.uint64(1 << 62)
+_HASH_MASK = (1 << 62) - 1
+
+
+def _word_key(word):
+    digest = hashlib.blake2b(word.lower().encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") & _HASH_MASK
+
+
+def term_keys(texts):
+    """
+    여러 텍스트의 검색어를 한 번에 키로 바꿉니다.
+    한글은 띄어쓰기 단위가 일정하지 않아 연속된 두 음절(2-gram)을, 앞뒤에 한글이 없는 한 글자는 그 음절을,
+    영문/숫자는 소문자 단어를 검색어로 사용합니다. 한글 처리는 글자 단위 배열 연산으로 수행합니다.
+    - texts: 텍스트 목록
+    반환값: (검색어 키 배열, 검색어별 텍스트 번호 배열)
+    """
+    joined = "\n".join(texts)
+    # 잘못된 문자(짝이 없는 서로게이트 등)는 한 글자로 바꿔 글자 위치를 유지
+    codes = np.frombuffer(joined.encode("utf-32-le", errors="replace"), dtype=np.uint32).astype(np.int64) - _HANGUL_FIRST
+    text_of_char = np.repeat(np.arange(len(texts)), [len(text) + 1 for text in texts])[:len(codes)]
+    hangul = (codes >= 0) & (codes < _HANGUL_COUNT)
+
+    pairs = np.flatnonzero(hangul[:-1] & hangul[1:])
+    bigram_keys = (codes[pairs] * _HANGUL_COUNT + codes[pairs + 1]).astype(np.uint64) | _BIGRAM_FLAG
+    isolated = hangul.copy()
+    isolated[1:] &= ~hangul[:-1]
+    isolated[:-1] &= ~hangul[1:]
+    singles = np.flatnonzero(isolated)
+    single_keys = codes[singles].astype(np.uint64) | _SYLLABLE_FLAG
+
+    words = [(match.start(), _word_key(match.group())) for match in _ASCII_WORD.finditer(joined)]
+    word_positions = np.array([position for position, _ in words], dtype=np.int64)
+    word_keys = np.array([key for _, key in words], dtype=np.uint64)
+
+    keys = np.concatenate([bigram_keys, single_keys, word_keys])
+    positions = np.concatenate([pairs, singles, word_positions])
+    return keys, text_of_char[positions]
+
+
+def _query_keys(query):
+    return np.unique(term_keys([query])[0])
+
+
+@dataclass(frozen=True)
+class Passage:
+    """
+    검색된 교안 청크 하나입니다.
+    - text: 청크 본문
+    - source: 원본 파일 이름
+    - page: PDF 페이지 번호 (0부터)
+    - score: BM25 점수
+    """
+
+    text: str
+    source: str
+    page: int
+    score: float
+
+
+def _load_array(path):
+    # 메모리 매핑은 유지하되, 조각마다 np.memmap 객체를 만드는 비용이 없도록 일반 배열로 봄
+    return np.asarray(np.load(path, mmap_mode="r"))
+
+
+class Segment:
+    """
+    메모리 매핑으로 연 세그먼트 하나입니다. 게시 목록은 검색어 키 순으로 정렬되어 있습니다.
+    - terms: 검색어 키 (정렬), offsets: 검색어별 게시 목록 시작 위치
+    - docs, tfs: 게시 목록의 세그먼트 내 청크 번호와 검색어 빈도
+    - lengths: 청크별 검색어 수, pages: 청크별 페이지, documents: 청크별 문서 번호
+    - text_offsets: text.bin에서 청크 본문의 시작 위치
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        for name in _SEGMENT_ARRAYS:
+            setattr(self, name, _load_array(self.path / f"{name}.npy"))
+        text_path = self.path / "text.bin"
+        # 빈 파일은 메모리 매핑할 수 없음
+        self._text = np.asarray(np.memmap(text_path, dtype=np.uint8, mode="r")) if text_path.stat().st_size else np.empty(0, np.uint8)
+
+    def __len__(self):
+        return len(self.lengths)
+
+    @property
+    def name(self):
+        return self.path.name
+
+    def postings(self, keys):
+        """
+        검색어 키별 (문서 빈도, 게시 목록 시작, 끝)을 반환합니다. 없는 검색어는 빈도 0입니다.
+        """
+        pos = np.searchsorted(self.terms, keys)
+        found = pos < len(self.terms)
+        found[found] = self.terms[pos[found]] == keys[found]
+        starts = np.where(found, self.offsets[np.minimum(pos, len(self.terms))], 0)
+        ends = np.where(found, self.offsets[np.minimum(pos + 1, len(self.terms))], 0)
+        return ends - starts, starts, ends
+
+    def _scores(self, idf, docs, tfs, average_length):
+        tfs = np.asarray(tfs, dtype=np.float64)
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[docs] / average_length)
+        return idf * tfs * (BM25_K1 + 1) / (tfs + norm)
+
+    def top_docs(self, idf, postings, average_length, k, threshold=0.0):
+        """
+        이 세그먼트에서 BM25 점수 상위 k개 청크를 찾습니다 (MaxScore 방식, 결과는 전체 계산과 같음).
+        희귀한 검색어부터 게시 목록 전체를 점수에 더하다가, 남은 검색어가 줄 수 있는 최대 점수의 합이
+        k번째 점수 이하가 되면 나머지(흔한) 검색어는 후보 청크만 이진 탐색으로 확인합니다.
+        - idf: 검색어별 IDF
+        - postings: postings() 결과
+        - average_length: 전체 청크의 평균 검색어 수
+        - k: 최대 결과 수
+        - threshold: 다른 세그먼트에서 이미 찾은 k번째 점수 (이 점수를 넘지 못하는 청크는 제외)
+        반환값: (청크 번호 배열, 점수 배열)
+        """
+        counts, starts, ends = postings
+        terms = np.flatnonzero(counts > 0)
+        terms = terms[np.argsort(counts[terms], kind="stable")]
+        # 검색어별 최대 점수(빈도가 매우 크고 청크가 매우 짧을 때)를 뒤에서부터 누적
+        remaining = np.cumsum((idf[terms] * (BM25_K1 + 1))[::-1])[::-1]
+
+        candidates, scores, dense = np.empty(0, dtype=np.uint32), np.empty(0), None
+        essential = 0
+        while essential < len(terms) and remaining[essential] > threshold:
+            t = terms[essential]
+            docs = self.docs[starts[t]:ends[t]]
+            term_scores = self._scores(idf[t], docs, self.tfs[starts[t]:ends[t]], average_length)
+            if dense is None and len(candidates) + len(docs) > len(self) // 8:
+                # 후보가 많아지면 정렬로 합치는 대신 세그먼트 크기의 점수 배열에 바로 더함
+                dense = np.zeros(len(self))
+                dense[candidates] = scores
+            if dense is None:
+                candidates, inverse = np.unique(np.concatenate([candidates, docs]), return_inverse=True)
+                scores = np.bincount(inverse, weights=np.concatenate([scores, term_scores]))
+                touched = scores
+            else:
+                # 게시 목록 안의 청크 번호는 중복이 없으므로 바로 더할 수 있음
+                dense[docs] += term_scores
+                touched = dense[docs]
+            # 이번 검색어가 나온 청크 중 k번째 점수는 최종 k번째 점수의 하한
+            if len(touched) >= k:
+                threshold = max(threshold, float(np.partition(touched, len(touched) - k)[len(touched) - k]))
+            essential += 1
+        if dense is not None:
+            candidates = np.flatnonzero(dense).astype(np.uint32)
+            scores = dense[candidates]
+
+        # 후보가 아닌 청크는 남은 검색어를 모두 포함해도 k번째 점수를 넘지 못함
+        for i in range(essential, len(terms)):
+            alive = scores + remaining[i] > threshold
+            candidates, scores = candidates[alive], scores[alive]
+            if not len(candidates):
+                break
+            t = terms[i]
+            posting = self.docs[starts[t]:ends[t]]
+            positions = np.minimum(np.searchsorted(posting, candidates), len(posting) - 1)
+            hit = posting[positions] == candidates
+            scores[hit] += self._scores(idf[t], candidates[hit], self.tfs[starts[t] + positions[hit]], average_length)
+            if len(scores) >= k:
+                threshold = max(threshold, float(np.partition(scores, len(scores) - k)[len(scores) - k]))
+
+        if len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            candidates, scores = candidates[top], scores[top]
+        keep = scores > 0
+        return candidates[keep], scores[keep]
+
+    def text(self, doc):
+        return bytes(self._text[self.text_offsets[doc]:self.text_offsets[doc + 1]]).decode("utf-8")
+
+    @staticmethod
+    def write(path, terms, offsets, docs, tfs, lengths, texts, pages, documents):
+        """
+        세그먼트 배열과 청크 본문을 임시 디렉터리에 기록한 뒤 이름을 바꿔 완성합니다.
+        - texts: 청크 본문 바이트 목록
+        """
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        tmp_path.mkdir(parents=True)
+        text_offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+        np.cumsum([len(text) for text in texts], out=text_offsets[1:])
+        with open(tmp_path / "text.bin", "wb") as f:
+            f.write(b"".join(texts))
+        arrays = {
+            "terms": terms.astype(np.uint64), "offsets": offsets.astype(np.int64),
+            "docs": docs.astype(np.uint32), "tfs": np.minimum(tfs, np.iinfo(np.uint16).max).astype(np.uint16),
+            "lengths": lengths.astype(np.uint32), "text_offsets": text_offsets,
+            "pages": pages.astype(np.int32), "documents": documents.astype(np.uint32),
+        }
+        for name, array in arrays.items():
+            np.save(tmp_path / f"{name}.npy", array)
+        # 목록에 기록되기 전에 중단되어 남은 같은 이름의 세그먼트는 교체
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+        return Segment(path)
+
+
+def build_segment(path, texts, pages, documents):
+    """
+    청크 목록으로 세그먼트 하나를 만듭니다.
+    - path: 세그먼트 디렉터리
+    - texts: 청크 본문 목록
+    - pages: 청크별 페이지 번호
+    - documents: 청크별 문서 번호
+    """
+    keys, doc_ids = term_keys(texts)
+    lengths = np.bincount(doc_ids, minlength=len(texts))
+
+    # (검색어, 청크) 순으로 정렬한 뒤 같은 쌍의 개수를 검색어 빈도로 사용
+    order = np.lexsort((doc_ids, keys))
+    keys, doc_ids = keys[order], doc_ids[order]
+    boundary = np.ones(len(keys), dtype=bool)
+    boundary[1:] = (keys[1:] != keys[:-1]) | (doc_ids[1:] != doc_ids[:-1])
+    starts = np.flatnonzero(boundary)
+    tfs = np.diff(np.append(starts, len(keys)))
+    terms, term_starts = np.unique(keys[starts], return_index=True)
+
+    return Segment.write(
+        path, terms, np.append(term_starts, len(starts)), doc_ids[starts], tfs, lengths,
+        [text.encode("utf-8", errors="replace") for text in texts], np.asarray(pages), np.asarray(documents),
+    )
+
+
+def merge_segments(path, segments):
+    """
+    여러 세그먼트를 하나로 병합합니다 (청크 순서 유지).
+    - path: 병합한 세그먼트 디렉터리
+    - segments: Segment 목록
+    """
+    bases = np.cumsum([0] + [len(segment) for segment in segments])
+    terms = np.concatenate([np.repeat(np.asarray(s.terms), np.diff(s.offsets)) for s in segments])
+    docs = np.concatenate([np.asarray(s.docs, dtype=np.int64) + base for s, base in zip(segments, bases)])
+    tfs = np.concatenate([np.asarray(s.tfs) for s in segments])
+    # 세그먼트별 게시 목록이 이미 청크 순이고 앞 세그먼트의 청크 번호가 더 작으므로 검색어로만 안정 정렬
+    order = np.argsort(terms, kind="stable")
+    terms, docs, tfs = terms[order], docs[order], tfs[order]
+    unique_terms, starts = np.unique(terms, return_index=True)
+    offsets = np.append(starts, len(terms))
+    texts = []
+    for s in segments:
+        blob, ends = bytes(s._text), np.asarray(s.text_offsets).tolist()
+        texts.extend(blob[start:end] for start, end in zip(ends, ends[1:]))
+    return Segment.write(
+        path, unique_terms, offsets, docs, tfs,
+        np.concatenate([s.lengths for s in segments]),
+        texts,
+        np.concatenate([s.pages for s in segments]),
+        np.concatenate([s.documents for s in segments]),
+    )
+
+
+def _tier(size, factor):
+    # 청크 수의 factor 로그 (정수 연산으로 계산하여 경계값에서도 정확함)
+    tier = 0
+    while size >= factor:
+        size //= factor
+        tier += 1
+    return tier
+
+
+class RetrievalIndex:
+    """
+    교안 청크 BM25 색인입니다. 같은 내용의 PDF(캐시 키 기준)는 한 번만 추가합니다.
+    검색은 현재 세그먼트 목록을 그대로 사용하므로 문서를 추가하는 중에도 검색할 수 있습니다.
+    - directory: 색인 디렉터리
+    - merge_factor: 크기가 비슷한 세그먼트가 이 개수만큼 모이면 병합
+    """
+
+    def __init__(self, directory=RETRIEVAL_DIR, merge_factor=MERGE_FACTOR):
+        self.directory = Path(directory)
+        self.merge_factor = merge_factor
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        manifest = self._read_manifest()
+        self._next_segment = manifest["next_segment"]
+        # (세그먼트 목록, 문서 목록)을 함께 교체하여 검색 중에도 둘이 어긋나지 않도록 함
+        self._state = (tuple(Segment(self.directory / name) for name in manifest["segments"]), manifest["documents"])
+        self._keys = {document["key"] for document in manifest["documents"]}
+
+    def _read_manifest(self):
+        path = self.directory / "manifest.json"
+        if not path.exists():
+            return {"version": MANIFEST_VERSION, "segments": [], "documents": [], "next_segment": 1}
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != MANIFEST_VERSION:
+            raise RuntimeError(f"지원하지 않는 검색 색인 버전입니다: {manifest.get('version')}")
+        return manifest
+
+    def _write_manifest(self, segments, documents):
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "segments": [segment.name for segment in segments],
+            "documents": documents,
+            "next_segment": self._next_segment,
+        }
+        tmp_path = self.directory / "manifest.json.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, self.directory / "manifest.json")
+
+    def __len__(self):
+        return sum(len(segment) for segment in self._state[0])
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    @property
+    def documents(self):
+        return list(self._state[1])
+
+    @property
+    def segment_count(self):
+        return len(self._state[0])
+
+    def _new_segment_path(self):
+        path = self.directory / f"segment-{self._next_segment:06d}"
+        self._next_segment += 1
+        return path
+
+    def add_document(self, key, source, chunks):
+        """
+        처리한 PDF 하나의 청크를 색인에 추가합니다. 이미 추가한 문서면 무시합니다.
+        - key: 문서 식별자 (PdfCache 캐시 키 등 파일 내용 기준 값)
+        - source: 원본 파일 이름
+        - chunks: [{"page_content", "metadata"}] 청크 목록
+        반환값: 새로 추가했으면 True
+        """
+        return self.add_documents([(key, source, chunks)]) > 0
+
+    def add_documents(self, items):
+        """
+        여러 문서를 한 세그먼트로 추가합니다.
+        - items: (key, source, chunks) 목록
+        반환값: 새로 추가한 문서 수
+        """
+        with self._lock:
+            current_segments, documents = self._state
+            documents = list(documents)
+            texts, pages, numbers, added = [], [], [], set()
+            for key, source, chunks in items:
+                if key in self._keys or key in added or not chunks:
+                    continue
+                added.add(key)
+                number = len(documents)
+                documents.append({"key": key, "source": source, "chunks": len(chunks)})
+                for chunk in chunks:
+                    texts.append(chunk["page_content"])
+                    pages.append(chunk.get("metadata", {}).get("page", -1))
+                    numbers.append(number)
+            if not texts:
+                return 0
+
+            segments = current_segments + (build_segment(self._new_segment_path(), texts, pages, numbers),)
+            segments = self._merge_tiers(segments)
+            self._write_manifest(segments, documents)
+            self._remove_unused(segments)
+            self._state = (segments, documents)
+            self._keys |= added
+            return len(added)
+
+    def _merge_tiers(self, segments):
+        # 같은 크기 단계의 세그먼트가 merge_factor개 모이면 병합 (병합 결과가 다음 단계를 채우면 이어서 병합)
+        while True:
+            tiers = {}
+            for i, segment in enumerate(segments):
+                tiers.setdefault(_tier(len(segment), self.merge_factor), []).append(i)
+            full = [members for tier, members in sorted(tiers.items()) if len(members) >= self.merge_factor]
+            if not full:
+                return segments
+            members = set(full[0])
+            merged = merge_segments(self._new_segment_path(), [segments[i] for i in sorted(members)])
+            segments = tuple(segment for i, segment in enumerate(segments) if i not in members) + (merged,)
+
+    def _remove_unused(self, segments):
+        # 병합되어 쓰이지 않는 세그먼트 삭제 (이미 연 메모리 매핑은 계속 읽을 수 있음)
+        names = {segment.name for segment in segments}
+        for entry in os.scandir(self.directory):
+            if entry.is_dir() and entry.name.startswith("segment-") and entry.name not in names:
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+    def compact(self):
+        """
+        모든 세그먼트를 하나로 병합합니다.
+        """
+        with self._lock:
+            segments, documents = self._state
+            if len(segments) > 1:
+                segments = (merge_segments(self._new_segment_path(), list(segments)),)
+                self._write_manifest(segments, documents)
+                self._remove_unused(segments)
+                self._state = (segments, documents)
+
+    def search(self, query, k=DEFAULT_TOP_K):
+        """
+        질의와 관련 있는 청크를 BM25 점수 순으로 최대 k개 반환합니다.
+        - query: 질의 텍스트
+        - k: 최대 결과 수
+        반환값: Passage 목록
+        """
+        segments, documents = self._state
+        keys = _query_keys(query)
+        total = sum(len(segment) for segment in segments)
+        if not total or not len(keys) or k <= 0:
+            return []
+
+        lookups = [segment.postings(keys) for segment in segments]
+        df = sum(counts for counts, _, _ in lookups)
+        idf = np.log(1 + (total - df + 0.5) / (df + 0.5))
+        average_length = sum(int(np.sum(segment.lengths, dtype=np.int64)) for segment in segments) / total
+
+        # 큰 세그먼트부터 검색하여 k번째 점수(threshold)를 빨리 높이고, 이후 세그먼트에서 그보다 낮은 청크는 제외
+        candidates, threshold = [], 0.0
+        for segment_no in sorted(range(len(segments)), key=lambda i: -len(segments[i])):
+            docs, scores = segments[segment_no].top_docs(idf, lookups[segment_no], average_length, k, threshold)
+            candidates.extend(zip(scores.tolist(), [segment_no] * len(docs), docs.tolist()))
+            if len(candidates) >= k:
+                candidates = sorted(candidates, key=lambda item: -item[0])[:k]
+                threshold = max(threshold, candidates[-1][0])
+
+        passages = []
+        for score, segment_no, doc in sorted(candidates, key=lambda item: -item[0])[:k]:
+            segment = segments[segment_no]
+            passages.append(Passage(
+                text=segment.text(doc),
+                source=documents[int(segment.documents[doc])]["source"],
+                page=int(segment.pages[doc]),
+                score=score,
+            ))
+        return passages
+
+
+def select_passages(passages, k=DEFAULT_TOP_K, token_budget=DEFAULT_TOKEN_BUDGET, model="gpt-4"):
+    """
+    검색된 청크 중 토큰 예산 안에서 최대 k개를 점수 순으로 고릅니다.
+    예산을 넘는 청크는 건너뛰고 다음 청크를 확인하며, 본문이 같은 청크는 한 번만 넣습니다.
+    - passages: 점수 순 Passage 목록
+    - k: 최대 청크 수
+    - token_budget: 고른 청크의 토큰 수 합계 상한
+    - model: 토큰 수 계산 기준 모델
+    """
+    selected, seen, used = [], set(), 0
+    for passage in passages:
+        if len(selected) == k:
+            break
+        if passage.text in seen:
+            continue
+        tokens = count_tokens(passage.text, model)
+        if used + tokens > token_budget:
+            continue
+        selected.append(passage)
+        seen.add(passage.text)
+        used += tokens
+    return selected
+
+
+def format_context(passages):
+    """
+    고른 청크를 프롬프트에 넣을 교안 내용 블록으로 만듭니다. 청크가 없으면 빈 문자열입니다.
+    - passages: Passage 목록
+    """
+    if not passages:
+        return ""
+    lines = ["Lecture Material (업로드한 교안에서 관련 내용을 발췌했습니다. 교안에서 다룬 개념을 반영하세요):"]
+    for passage in passages:
+        text = " ".join(passage.text.split())
+        lines.append(f"- [{passage.source} p.{passage.page + 1}] {text}")
+    return "\n".join(lines) + "\n\n"
+
+
+def retrieval_index():
+    """
+    프로세스 전체에서 공유하는 교안 검색 색인을 반환합니다.
+    """
+    return registry.get("retrieval_index", RetrievalIndex)
+
+
+def retrieve_context(query, k=DEFAULT_TOP_K, token_budget=DEFAULT_TOKEN_BUDGET, index=None):
+    """
+    질의와 관련 있는 교안 청크를 토큰 예산 안에서 골라 프롬프트 블록과 함께 반환합니다.
+    - query: 질의 텍스트 (주제, 담당 업무, 역량 정보 등)
+    - k: 최대 청크 수
+    - token_budget: 청크 토큰 수 합계 상한
+    - index: 검색 색인 (None이면 공유 색인)
+    반환값: (프롬프트에 넣을 텍스트, 고른 Passage 목록)
+    """
+    index = retrieval_index() if index is None else index
+    # 예산을 넘는 청크를 건너뛸 수 있도록 후보를 넉넉히 검색
+    passages = select_passages(index.search(query, k * 3), k, token_budget)
+    return format_context(passages), passages
@@ -0,0 +1,4 @@
+"""
+외부 API를 대신하는 로컬 대체 서버 모음입니다.
+네트워크 없이 페이지를 실행하거나 지연 시간을 고정해 성능을 측정할 때 사용합니다.
+"""
@@ -0,0 +1,256 @@
+"""
+OpenAI Chat Completions API(/v1/chat/completions)의 로컬 대체 서버입니다.
+요청 내용(시스템 메시지)으로 용도를 구분해 형식에 맞는 응답을 만들며, 같은 요청에는 항상 같은 응답을 돌려줍니다.
+- 직무/뉴스 키워드 추출 (core.news_pipeline): 키워드 목록
+- 문항 생성 (core.question_prompts): [질문]~해설 구조의 문항 (해설은 여러 문단일 수 있고, 일부는 few-shot 형식을 이어 쓰는 뒤쪽 텍스트 포함)
+- 문항 보완 (core.generation.repair_question): 구역 내용
+- 지문 생성 (core.passage_prompts): 지문
+첫 토큰까지의 지연(latency)과 생성 속도(tokens_per_second)를 정할 수 있고, stream/stop/max_tokens를 OpenAI와 같은 방식으로 따릅니다.
+
+실행 예: python -m core.standins.chat --port 8766 --latency 0.3 --tokens-per-second 50
+이후 OPENAI_API_BASE=http://127.0.0.1:8766/v1 OPENAI_API_KEY=standin 으로 페이지를 실행합니다.
+"""
+import argparse
+import json
+import random
+import re
+import time
+import zlib
+
+from core.standins.server import StandInHandler, StandInServer
+from core.tokens import estimate_tokens
+
+
+# 문항 뒤에 이어 쓰는 텍스트가 붙는 응답의 비율
+DEFAULT_TRAILING_RATE = 0.3
+
+_DEFAULT_KEYWORDS = ["생성형 AI", "데이터 품질", "업무 자동화"]
+
+_SENTENCES = [
+    "{topic} 업무를 맡은 담당자가 데이터 품질 문제를 발견하고 원인을 분석하고 있다.",
+    "팀은 {topic} 과정에서 생성형 AI 서비스를 활용해 반복 업무를 줄이려고 한다.",
+    "담당자는 학습 데이터의 레이블 일관성을 점검하고 개선 방안을 정리했다.",
+    "프로젝트 일정과 비용을 고려해 적합한 AI 서비스를 선정해야 하는 상황이다.",
+    "검토 결과 일부 데이터가 중복되거나 형식이 맞지 않는 것으로 확인되었다.",
+]
+
+_TRAILING_TEXTS = [
+    "\n\nInput: {topic}에 대한 다른 문제를 작성하세요.\nOutput: [질문]\n",
+    "\n\n[질문]\n{topic}와 관련된 다음 상황을 읽고 물음에 답하시오.\n",
+    "\n\n참고로 이 문항은 {topic}의 실무 적용 능력을 평가하기 위해 작성되었습니다. ",
+]
+
+
+def split_tokens(text):
+    """
+    응답을 스트리밍할 토큰 단위로 나눕니다.
+    토큰 수 추정(core.tokens.estimate_tokens)과 맞도록 한글 등은 글자 하나, 영문/숫자는 최대 4글자씩 나눕니다.
+    - text: 응답 텍스트
+    """
+    tokens, pending, ascii_chars = [], "", 0
+    for ch in text:
+        if ord(ch) < 128:
+            pending += ch
+            ascii_chars += 1
+            # 추정값처럼 영문/공백 글자는 문장 전체에서 4글자마다 한 토큰
+            if ascii_chars % 4 == 0:
+                tokens.append(pending)
+                pending = ""
+        else:
+            tokens.append(pending + ch)
+            pending = ""
+    if pending:
+        tokens.append(pending)
+    return tokens
+
+
+def _sentences(topic, count, rng):
+    return " ".join(rng.choice(_SENTENCES).format(topic=topic) for _ in range(count))
+
+
+def _role_keywords(prompt):
+    # 담당 업무 문장에서 두 글자 이상인 단어를 앞에서부터 3개 사용
+    sentence = re.search(r'문장: "([^"]*)"', prompt)
+    words = re.findall(r"[\w]{2,}", sentence.group(1) if sentence else "")
+    keywords = list(dict.fromkeys(words))[:3]
+    return keywords + _DEFAULT_KEYWORDS[len(keywords):]
+
+
+def _news_keywords(prompt):
+    # 기사 제목의 [키워드]를 모아 사용 (core.standins.deepsearch 기사 형식)
+    keywords = list(dict.fromkeys(re.findall(r"제목: \[([^\]]+)\]", prompt)))[:3]
+    return keywords + _DEFAULT_KEYWORDS[len(keywords):]
+
+
+def fake_explanation(topic, answer, rng):
+    """
+    가짜 해설을 만듭니다. 절반 정도는 선지별 설명을 빈 줄로 나눈 여러 문단이며,
+    항상 "따라서 정답은 N번입니다."로 끝나므로 해설이 중간에 잘렸는지 확인할 수 있습니다.
+    - topic: 문항 주제
+    - answer: 정답 번호
+    - rng: random.Random
+    """
+    paragraphs = [_sentences(topic, rng.randint(1, 2), rng)]
+    if rng.random() < 0.5:
+        paragraphs += [
+            f"선지 {i}은 {_sentences(topic, 1, rng)}" for i in rng.sample(range(1, 5), rng.randint(1, 2))
+        ]
+    paragraphs.append(f"따라서 정답은 {answer}번입니다.")
+    return "\n\n".join(paragraphs)
+
+
+def fake_question(topic, rng, trailing_rate=DEFAULT_TRAILING_RATE):
+    """
+    [질문]~해설 구조의 가짜 문항을 만듭니다. trailing_rate 비율로 문항 뒤에 이어 쓰는 텍스트를 붙입니다.
+    - topic: 문항 주제
+    - rng: random.Random
+    - trailing_rate: 뒤쪽 텍스트를 붙일 비율
+    """
+    options = "\n".join(f"선지 {i}) {topic}의 {i}번째 처리 방안을 적용한다." for i in range(1, 5))
+    answer = rng.randint(1, 4)
+    text = (
+        f"[질문]\n{_sentences(topic, rng.randint(2, 4), rng)}\n가장 적절한 조치는 무엇인가?\n[선지]\n{options}\n\n"
+        f"[정답 및 해설]\n정답) {answer}\n해설) {fake_explanation(topic, answer, rng)}"
+    )
+    if rng.random() < trailing_rate:
+        text += rng.choice(_TRAILING_TEXTS).format(topic=topic) + _sentences(topic, 20, rng)
+    return text
+
+
+def fake_reply(messages, trailing_rate=DEFAULT_TRAILING_RATE):
+    """
+    요청 메시지에 맞는 가짜 응답 텍스트를 만듭니다. 같은 메시지에는 같은 응답을 반환합니다.
+    - messages: {"role", "content"} 메시지 목록
+    - trailing_rate: 문항 뒤에 이어 쓰는 텍스트를 붙일 비율
+    """
+    system = " ".join(message["content"] for message in messages if message["role"] == "system")
+    prompt = messages[-1]["content"] if messages else ""
+    rng = random.Random(zlib.crc32(json.dumps(messages, ensure_ascii=False).encode("utf-8")))
+
+    if "extracting keywords" in system:
+        if "반환형식:[" in prompt:
+            return json.dumps(_role_keywords(prompt), ensure_ascii=False)
+        return ", ".join(_news_keywords(prompt))
+    if "형식 오류를 고치는" in system:
+        return str(rng.randint(1, 4)) if "정답)" in prompt.split("\n")[0] else _sentences("문항", 2, rng)
+    if "시험 문제를 생성하는" in system:
+        topic = re.search(r"'([^']*)' 주제", system)
+        return fake_question(topic.group(1) if topic else "업무", rng, trailing_rate)
+    if "역량 평가에 필요한" in system:
+        request = re.findall(r"Input: (.*)", prompt)
+        department = re.search(r"기업의 (.*?) 에서", request[-1]) if request else None
+        topic = department.group(1) if department else "업무"
+        return f"A 기업의 {topic}은 " + _sentences(topic, rng.randint(3, 6), rng) + " 다음 중 가장 적절하지 않은 접근 방법은?"
+    return _sentences("업무", 2, rng)
+
+
+def _apply_stop(text, stop):
+    # OpenAI처럼 가장 먼저 나오는 정지 시퀀스 앞까지만 반환 (정지 시퀀스는 포함하지 않음)
+    if isinstance(stop, str):
+        stop = [stop]
+    positions = [text.find(sequence) for sequence in stop or () if sequence]
+    positions = [position for position in positions if position >= 0]
+    return (text[:min(positions)], "stop") if positions else (text, None)
+
+
+class ChatCompletionsHandler(StandInHandler):
+
+    def handle_post(self):
+        if self.path.rstrip("/") != "/v1/chat/completions":
+            return self.send_json(404, {"error": {"message": "not found"}})
+        if not self.headers.get("Authorization"):
+            return self.send_json(401, {"error": {"message": "api key required"}})
+        request = self.read_json()
+        messages = request.get("messages", [])
+
+        text, finish_reason = _apply_stop(fake_reply(messages, self.server.trailing_rate), request.get("stop"))
+        tokens = split_tokens(text)
+        max_tokens = request.get("max_tokens")
+        if max_tokens is not None and len(tokens) > max_tokens:
+            tokens, finish_reason = tokens[:max_tokens], "length"
+        finish_reason = finish_reason or "stop"
+        prompt_tokens = sum(estimate_tokens(message.get("content", "")) for message in messages)
+        body = {
+            "id": f"chatcmpl-standin-{self.server.request_count}",
+            "created": int(time.time()),
+            "model": request.get("model"),
+        }
+
+        if request.get("stream"):
+            return self._stream(body, tokens, finish_reason)
+
+        time.sleep(len(tokens) / self.server.tokens_per_second)
+        self.send_json(200, {
+            **body,
+            "object": "chat.completion",
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "".join(tokens)},
+                "finish_reason": finish_reason,
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": len(tokens),
+                "total_tokens": prompt_tokens + len(tokens),
+            },
+        })
+
+    def _stream(self, body, tokens, finish_reason):
+        # 서버 전송 이벤트(SSE)로 토큰을 하나씩 보내고, 끝나면 연결을 닫음
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        deltas = [{"role": "assistant"}] + [{"content": token} for token in tokens] + [{}]
+        try:
+            for i, delta in enumerate(deltas):
+                chunk = {
+                    **body,
+                    "object": "chat.completion.chunk",
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason if i == len(deltas) - 1 else None}],
+                }
+                self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+                if "content" in delta:
+                    time.sleep(1 / self.server.tokens_per_second)
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # 클라이언트가 조기 종료로 연결을 닫은 경우
+            pass
+
+
+def chat_standin(host="127.0.0.1", port=0, latency=0.0, tokens_per_second=50.0, trailing_rate=DEFAULT_TRAILING_RATE):
+    """
+    Chat Completions 대체 서버를 만듭니다. start()로 시작하고 base_url로 주소를 확인합니다.
+    - host, port: 주소 (port=0이면 빈 포트 자동 선택)
+    - latency: 첫 토큰까지의 지연 시간 (초)
+    - tokens_per_second: 응답 생성 속도 (토큰/초)
+    - trailing_rate: 문항 뒤에 이어 쓰는 텍스트를 붙일 비율
+    """
+    return StandInServer(
+        ChatCompletionsHandler, host=host, port=port, latency=latency,
+        tokens_per_second=tokens_per_second, trailing_rate=trailing_rate,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI Chat Completions 로컬 대체 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.3, help="첫 토큰까지의 지연 시간 (초)")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0, help="응답 생성 속도 (토큰/초)")
+    parser.add_argument("--trailing-rate", type=float, default=DEFAULT_TRAILING_RATE, help="문항 뒤에 이어 쓰는 텍스트를 붙일 비율")
+    args = parser.parse_args()
+
+    server = chat_standin(args.host, args.port, args.latency, args.tokens_per_second, args.trailing_rate).start()
+    print(f"Chat Completions 대체 서버 실행 중: {server.base_url}/v1")
+    try:
+        server.wait()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
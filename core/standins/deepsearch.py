@@ -0,0 +1,97 @@
+"""
+DeepSearch 뉴스 검색 API(/v1/articles)의 로컬 대체 서버입니다.
+같은 키워드에는 항상 같은 기사를 돌려주므로 결과와 지연 시간이 결정적입니다.
+failures를 주면 처음 요청들에 차례로 그 상태 코드(429, 5xx 등)로 응답해 재시도를 확인할 수 있습니다.
+
+실행 예: python -m core.standins.deepsearch --port 8765 --latency 0.2
+이후 DEEPSEARCH_BASE_URL=http://127.0.0.1:8765 로 페이지를 실행합니다.
+"""
+import argparse
+import hashlib
+import re
+import threading
+from urllib.parse import parse_qs, urlparse
+
+from core.standins.server import StandInHandler, StandInServer
+
+
+ARTICLES_PER_KEYWORD = 4
+
+_SUMMARY_TEMPLATES = [
+    "{keyword} 관련 기업들이 생성형 인공지능 도입을 확대하고 있다.",
+    "{keyword} 분야에서 데이터 품질 관리의 중요성이 커지고 있다.",
+    "{keyword} 업무 자동화를 위한 LLM 파인튜닝 사례가 늘고 있다.",
+    "{keyword} 담당 조직이 AI 서비스 선정 기준을 새로 마련했다.",
+]
+
+
+def fake_articles(keyword):
+    """
+    키워드 하나에 대해 결정적인 가짜 기사 목록을 만듭니다.
+    - keyword: 검색 키워드
+    """
+    articles = []
+    for i in range(ARTICLES_PER_KEYWORD):
+        article_id = hashlib.sha1(f"{keyword}:{i}".encode("utf-8")).hexdigest()[:16]
+        articles.append({
+            "id": article_id,
+            "title": f"[{keyword}] 업계 동향 {i + 1}",
+            "summary": _SUMMARY_TEMPLATES[i % len(_SUMMARY_TEMPLATES)].format(keyword=keyword),
+            "content_url": f"https://news.example.com/{article_id}",
+        })
+    return articles
+
+
+class DeepSearchHandler(StandInHandler):
+
+    def handle_get(self):
+        url = urlparse(self.path)
+        if url.path != "/v1/articles":
+            return self.send_json(404, {"error": "not found"})
+        query = parse_qs(url.query)
+        if not query.get("api_key"):
+            return self.send_json(401, {"error": "api_key required"})
+        with self.server.failures_lock:
+            failure = self.server.failures.pop(0) if self.server.failures else None
+        if failure is not None:
+            # 429는 바로 다시 시도하도록 Retry-After 0을 함께 보냄
+            headers = {"Retry-After": "0"} if failure == 429 else None
+            return self.send_json(failure, {"error": "injected failure"}, headers=headers)
+
+        # "키워드1" OR "키워드2" 형식의 검색어를 키워드별로 분리
+        keyword_query = query.get("keyword", [""])[0]
+        keywords = re.findall(r'"([^"]+)"', keyword_query) or [keyword_query]
+        data = [article for keyword in keywords if keyword for article in fake_articles(keyword)]
+        self.send_json(200, {"data": data, "total_items": len(data)})
+
+
+def deepsearch_standin(host="127.0.0.1", port=0, latency=0.0, failures=()):
+    """
+    DeepSearch 대체 서버를 만듭니다. start()로 시작하고 base_url로 주소를 확인합니다.
+    - host, port: 주소 (port=0이면 빈 포트 자동 선택)
+    - latency: 요청마다 적용할 고정 지연 시간 (초)
+    - failures: 처음 요청들에 차례로 돌려줄 오류 상태 코드 (예: (429, 503))
+    """
+    return StandInServer(
+        DeepSearchHandler, host=host, port=port, latency=latency,
+        failures=list(failures), failures_lock=threading.Lock(),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DeepSearch 로컬 대체 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="요청당 지연 시간 (초)")
+    args = parser.parse_args()
+
+    server = deepsearch_standin(args.host, args.port, args.latency).start()
+    print(f"DeepSearch 대체 서버 실행 중: {server.base_url}")
+    try:
+        server.wait()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
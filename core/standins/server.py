@@ -0,0 +1,98 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    대체 서버 요청 처리기의 공통 부분입니다.
+    하위 클래스는 handle_get/handle_post를 구현합니다.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._dispatch(self.handle_get)
+
+    def do_POST(self):
+        self._dispatch(self.handle_post)
+
+    def _dispatch(self, handler):
+        # 고정 지연 시간 적용 후 처리
+        time.sleep(self.server.latency)
+        self.server.request_count += 1
+        handler()
+
+    def handle_get(self):
+        self.send_json(404, {"error": "not found"})
+
+    def handle_post(self):
+        self.send_json(404, {"error": "not found"})
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def send_json(self, status, body, headers=None):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        # 벤치마크 출력이 섞이지 않도록 접근 로그 생략
+        pass
+
+
+class StandInServer:
+    """
+    백그라운드 스레드에서 실행되는 로컬 HTTP 대체 서버입니다.
+    - handler_class: 요청 처리기 클래스
+    - host, port: 주소 (port=0이면 빈 포트 자동 선택)
+    - latency: 요청마다 적용할 고정 지연 시간 (초)
+    - settings: 처리기가 self.server.<이름>으로 읽는 추가 설정
+    """
+
+    def __init__(self, handler_class, host="127.0.0.1", port=0, latency=0.0, **settings):
+        self._httpd = ThreadingHTTPServer((host, port), handler_class)
+        self._httpd.daemon_threads = True
+        self._httpd.latency = latency
+        self._httpd.request_count = 0
+        for name, value in settings.items():
+            setattr(self._httpd, name, value)
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def request_count(self):
+        return self._httpd.request_count
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="stand-in-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def wait(self):
+        """
+        서버 스레드가 끝날 때까지 기다립니다.
+        """
+        self._thread.join()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,168 @@
+"""
+여러 세션이 동시에 사용하는 파일 저장 기능입니다.
+- AppendWriter: 공유 파일에 줄을 덧붙이는 기록을 백그라운드 스레드 하나로 모아
+  순서대로 묶어 기록하고 fsync 하는 작성기 (동시 기록 시 줄이 섞이거나 사라지지 않음)
+
+업로드 파일은 세션이 끝나도 작업이 사용할 수 있도록 작업 입력 디렉터리에 기록합니다 (core.jobs.JobQueue.submit()의 input).
+
+환경 변수:
+- DTLAB_APPEND_QUEUE_SIZE: 기록 대기열 최대 길이 (가득 차면 기록 요청이 대기)
+"""
+import atexit
+import json
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+
+from core.registry import registry
+
+
+APPEND_QUEUE_SIZE = int(os.environ.get("DTLAB_APPEND_QUEUE_SIZE", "10000"))
+
+# 한 번에 모아 기록할 최대 줄 수
+APPEND_BATCH_SIZE = 512
+
+
+class AppendWriter:
+    """
+    공유 파일에 줄을 덧붙이는 기록을 백그라운드 스레드 하나에서 순서대로 처리합니다.
+    요청 스레드는 대기열에 넣기만 하고, 작성 스레드가 대기 중인 줄을 파일별로 모아
+    한 번에 기록한 뒤 fsync 합니다. 대기열이 가득 차면 append()가 자리가 날 때까지 기다립니다.
+    - max_queue: 대기열 최대 길이
+    - batch_size: 한 번에 모아 기록할 최대 줄 수
+    - fsync: 묶음마다 디스크에 반영할지 여부
+    """
+
+    def __init__(self, max_queue=APPEND_QUEUE_SIZE, batch_size=APPEND_BATCH_SIZE, fsync=True):
+        self.batch_size = batch_size
+        self.fsync = fsync
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._stats_lock = threading.Lock()
+        self._stats = {"lines": 0, "batches": 0, "fsyncs": 0, "max_batch": 0, "errors": 0}
+        # 직전 flush() 이후 기록하지 못한 줄의 오류 (작성 스레드에서만 사용)
+        self._failures = []
+        self._thread = threading.Thread(target=self._run, name="append-writer", daemon=True)
+        self._thread.start()
+        # 종료 시 대기 중인 줄을 모두 기록
+        atexit.register(self.close)
+
+    def append(self, path, line):
+        """
+        파일 끝에 줄 하나를 덧붙이도록 요청합니다.
+        - path: 파일 경로
+        - line: 기록할 문자열 (줄바꿈은 자동으로 붙임)
+        반환값: 디스크에 기록되면 완료되는 Future
+        """
+        if self._closed:
+            raise RuntimeError("이미 닫힌 작성기입니다.")
+        if not line.endswith("\n"):
+            line += "\n"
+        future = Future()
+        self._queue.put((str(Path(path).resolve()), line, future))
+        return future
+
+    def append_json(self, path, record):
+        """
+        레코드를 JSON 한 줄로 덧붙이도록 요청합니다.
+        - path: JSON Lines 파일 경로
+        - record: 기록할 dict
+        """
+        return self.append(path, json.dumps(record, ensure_ascii=False))
+
+    def flush(self, timeout=None):
+        """
+        지금까지 요청한 줄이 모두 기록될 때까지 기다립니다.
+        직전 flush() 이후 요청한 줄 중 기록하지 못한 줄이 있으면 첫 번째 오류를 발생시킵니다.
+        """
+        future = Future()
+        self._queue.put((None, None, future))
+        future.result(timeout)
+
+    def close(self):
+        """
+        남은 줄을 모두 기록하고 작성 스레드를 종료합니다.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def stats(self):
+        """
+        기록한 줄 수, 묶음 수, fsync 횟수, 최대 묶음 크기, 현재 대기열 길이를 반환합니다.
+        """
+        with self._stats_lock:
+            return {**self._stats, "queued": self._queue.qsize()}
+
+    def _run(self):
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                running = False
+                batch = [item for item in batch if item is not None]
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch):
+        # 파일별로 요청 순서를 유지해 모은 뒤 한 번에 기록
+        lines, futures = {}, {}
+        for path, line, future in batch:
+            if path is not None:
+                lines.setdefault(path, []).append(line)
+                futures.setdefault(path, []).append(future)
+
+        written = synced = 0
+        for path, path_lines in lines.items():
+            try:
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                # 묶음마다 한 번 열어 기록하므로 파일이 교체되거나 삭제되어도 다음 묶음은 새 파일에 기록
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write("".join(path_lines))
+                    f.flush()
+                    if self.fsync:
+                        os.fsync(f.fileno())
+                        synced += 1
+            except Exception as e:
+                with self._stats_lock:
+                    self._stats["errors"] += 1
+                for future in futures.pop(path):
+                    future.set_exception(e)
+                continue
+            written += len(path_lines)
+            for future in futures.pop(path):
+                future.set_result(None)
+
+        # flush() 요청은 앞선 기록이 모두 끝난 뒤, 그 사이 실패한 기록이 있으면 오류로 완료
+        for path, line, future in batch:
+            if path is not None:
+                error = future.exception()
+                if error is not None:
+                    self._failures.append(error)
+            elif self._failures:
+                future.set_exception(self._failures[0])
+                self._failures = []
+            else:
+                future.set_result(None)
+
+        with self._stats_lock:
+            self._stats["lines"] += written
+            self._stats["batches"] += 1
+            self._stats["fsyncs"] += synced
+            self._stats["max_batch"] = max(self._stats["max_batch"], len(batch))
+
+
+def append_writer():
+    """
+    프로세스 전체에서 공유하는 줄 덧붙이기 작성기를 반환합니다.
+    """
+    return registry.get("append_writer", AppendWriter)
@@ -0,0 +1,150 @@
+"""
+작업 대기열(core.jobs)에서 실행하는 기본 작업입니다.
+- question: 객관식 문항 생성 (스트리밍 중간 결과 기록, 한 구역만 잘못되면 보완)
+- passage: 지문 생성 (스트리밍 중간 결과 기록)
+- pdf: 업로드한 교안 PDF 처리 (페이지별 분할/키워드 추출 → 처리 결과 캐시 → 교안 검색 색인)
+
+작업 결과는 저장소에 JSON으로 남으므로 PDF 처리 결과처럼 큰 데이터는 캐시에 두고 키만 반환합니다.
+"""
+from collections import Counter
+from pathlib import Path
+
+from core.generation import REPAIR_SETTINGS, repair_question, stream_passage, stream_question
+from core.jobs import job_handler
+from core.pdf_cache import PdfCache
+from core.pdf_pipeline import document_keywords_from_counts, iter_page_results, process_pdf_file
+from core.question_parser import parse_structured
+from core.retrieval import retrieval_index
+from core.tracing import span
+
+
+def _stream_timing(stream):
+    return {
+        "cached": stream.cached,
+        "prompt_tokens": stream.prompt_tokens,
+        "completion_tokens": stream.completion_tokens,
+        "max_tokens": stream.params.get("max_tokens"),
+        "stopped_early": stream.stopped_early,
+        "time_to_first_token": stream.time_to_first_token,
+        "total_seconds": stream.total_seconds,
+    }
+
+
+@job_handler("question")
+def question_job(payload, job):
+    """
+    객관식 문항을 스트리밍 생성하면서 지금까지 받은 텍스트를 중간 결과로 기록합니다.
+    - payload: {"company", "department", "topic", "difficulty", "competency", "context", "bypass_cache"}
+    반환값: {"text", "difficulty", "timing"}
+    """
+    stream = stream_question(
+        payload["company"], payload["department"], payload["topic"], payload["difficulty"],
+        bypass_cache=payload.get("bypass_cache", False), competency=payload["competency"],
+        context=payload.get("context", ""),
+    )
+    job.progress(message="문항 생성 중...", force=True)
+    for _ in stream:
+        job.progress(partial=stream.text)
+    job.progress(partial=stream.text, force=True)
+
+    # 한 구역만 형식이 맞지 않으면 전체 재생성 대신 그 구역만 보완
+    text = stream.text
+    parsed = parse_structured(text)
+    problems = parsed.problems()
+    if problems:
+        job.progress(
+            message="형식이 맞지 않는 구역을 보완 중... ("
+            + ", ".join(REPAIR_SETTINGS[section][0] for section in problems) + ")",
+            force=True,
+        )
+        repaired, _ = repair_question(parsed, payload["topic"], bypass_cache=payload.get("bypass_cache", False))
+        if repaired is not None:
+            text = repaired.to_text()
+    return {"text": text, "difficulty": payload["difficulty"], "timing": _stream_timing(stream)}
+
+
+@job_handler("passage")
+def passage_job(payload, job):
+    """
+    지문을 스트리밍 생성하면서 지금까지 받은 텍스트를 중간 결과로 기록합니다.
+    - payload: {"user_input", "competency", "context", "bypass_cache"}
+    반환값: {"text", "timing"}
+    """
+    stream = stream_passage(
+        payload["user_input"], bypass_cache=payload.get("bypass_cache", False),
+        competency=payload["competency"], context=payload.get("context", ""),
+    )
+    job.progress(message="지문 생성 중...", force=True)
+    for _ in stream:
+        job.progress(partial=stream.text)
+    return {"text": stream.text, "timing": _stream_timing(stream)}
+
+
+def _stream_pdf(path, payload, cache_writer, job):
+    # 한 페이지씩 처리해 캐시에 바로 기록하고, 페이지가 끝날 때마다 진행률과 누적 주요 키워드를 기록
+    chunks, term_counts = [], Counter()
+    for page_result in iter_page_results(
+        str(path), chunk_size=payload["chunk_size"], pipeline=payload["pipeline"], source=payload["source"]
+    ):
+        for chunk, keywords in zip(page_result["chunks"], page_result["chunk_keywords"]):
+            chunks.append(chunk)
+            cache_writer.add_chunk(chunk, keywords)
+        term_counts.update(page_result["term_counts"])
+        done, total = page_result["page"] + 1, page_result["total_pages"]
+        running_keywords = document_keywords_from_counts(term_counts, top_n=10)
+        job.progress(
+            done / total, f"{done}/{total} 페이지 처리 완료",
+            partial=", ".join(word for word, count in running_keywords), force=done == total,
+        )
+    document_keywords = document_keywords_from_counts(term_counts, top_n=30)
+    return chunks, document_keywords
+
+
+@job_handler("pdf")
+def pdf_job(payload, job):
+    """
+    업로드한 PDF를 처리해 처리 결과 캐시에 저장하고 교안 검색 색인에 추가합니다.
+    입력 파일(JobQueue.submit()의 input)은 처리가 끝나면 삭제합니다.
+    - payload: {"path", "cache_key", "source", "chunk_size", "pipeline", "workers"}
+    반환값: {"cache_key", "chunks", "cached"}
+    """
+    path = Path(payload["path"])
+    cache_key = payload["cache_key"]
+    pdf_cache = PdfCache()
+    try:
+        result = pdf_cache.get(cache_key)
+        cached = result is not None
+        if cached:
+            chunks = result["chunks"]
+        elif payload["workers"] > 1:
+            # 페이지 구간 병렬 처리 (작업자 프로세스는 파일 경로만 받아 필요한 페이지만 읽음)
+            job.progress(0.0, f"PDF 처리 중 (작업자 {payload['workers']}개)...", force=True)
+            with span("pdf.process", mode="parallel", workers=payload["workers"]) as s:
+                result = process_pdf_file(
+                    str(path), chunk_size=payload["chunk_size"], pipeline=payload["pipeline"],
+                    workers=payload["workers"], source=payload["source"],
+                )
+                s.set(chunks=len(result["chunks"]))
+            chunks = result["chunks"]
+            with span("pdf.cache_put"):
+                pdf_cache.put(cache_key, chunks, result["chunk_keywords"], result["document_keywords"])
+        else:
+            cache_writer = pdf_cache.open_writer(cache_key)
+            try:
+                with span("pdf.process", mode="stream", workers=1) as s:
+                    chunks, document_keywords = _stream_pdf(path, payload, cache_writer, job)
+                    s.set(chunks=len(chunks))
+            except BaseException:
+                cache_writer.abort()
+                raise
+            cache_writer.commit(document_keywords)
+
+        # 문항 생성 페이지에서 교안 내용을 참고할 수 있도록 검색 색인에 추가 (같은 파일은 한 번만)
+        index = retrieval_index()
+        if cache_key not in index:
+            job.progress(message="교안 검색 색인에 추가 중...", force=True)
+            with span("retrieval.add", chunks=len(chunks)):
+                index.add_document(cache_key, payload["source"], chunks)
+    finally:
+        path.unlink(missing_ok=True)
+    return {"cache_key": cache_key, "chunks": len(chunks), "cached": cached}
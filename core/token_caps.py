@@ -0,0 +1,132 @@
+"""
+저장된 문항(채택/폐기)의 응답 길이 분포로 역량/난이도별 max_tokens 상한을 정합니다.
+max_tokens는 응답이 이보다 길면 잘리는 상한이면서, 속도 제한(core.ratelimit)과 OpenAI가 요청 시점에
+토큰 한도에서 미리 차감하는 양이므로 실제 응답 길이에 가깝게 잡을수록 같은 한도로 더 많이 호출할 수 있습니다.
+
+표본이 CAP_MIN_SAMPLES개 미만이면 프롬프트의 난이도별 기본값(question_prompts.difficulty_settings)을 사용합니다.
+상한에 걸려 잘린 응답도 표본에 들어가지만 여유 배수(CAP_MARGIN) 때문에 상한이 다시 늘어나므로 점점 줄어들지 않습니다.
+저장된 문항을 다시 읽고 토큰 수를 세는 일은 백그라운드 스레드에서 하며 (시작 시 미리 로드할 때 시작),
+생성 요청은 마지막으로 계산한 분포만 읽습니다.
+"""
+import logging
+import math
+import threading
+import time
+
+import numpy as np
+
+from core.registry import registry
+from core.tokens import count_tokens
+
+
+# 상한을 정할 분위수와 여유 배수
+CAP_QUANTILE = 99
+CAP_MARGIN = 1.1
+
+# 학습에 필요한 최소 표본 수
+CAP_MIN_SAMPLES = 20
+
+# 상한 범위와 올림 단위 (토큰). 단위로 올려 두면 표본이 조금 바뀌어도 상한(캐시 키, 클라이언트)이 그대로 유지됨
+CAP_MIN = 300
+CAP_MAX = 1500
+CAP_STEP = 50
+
+# 저장소를 다시 읽는 간격 (초)과 읽을 최근 문항 수
+CAP_REFRESH_SECONDS = 600
+CAP_RECENT_RECORDS = 2000
+
+_log = logging.getLogger(__name__)
+
+
+class TokenCaps:
+    """
+    저장된 문항의 응답 토큰 수를 (역량, 난이도)별로 모아 max_tokens 상한을 계산합니다.
+    - store: QuestionStore
+    - model: 토큰 수 계산 기준 모델
+    """
+
+    def __init__(self, store, model="gpt-4-turbo"):
+        self.store = store
+        self.model = model
+        self._lock = threading.Lock()
+        self._lengths = {}
+        self._loaded_at = None
+        self._stopping = threading.Event()
+
+    def refresh(self):
+        """
+        저장소의 최근 문항 원문을 다시 읽어 응답 토큰 수 분포를 갱신합니다.
+        """
+        lengths = {}
+        for record in self.store.query(limit=CAP_RECENT_RECORDS):
+            if record.get("difficulty") and record.get("raw"):
+                key = (record.get("page"), record["difficulty"])
+                lengths.setdefault(key, []).append(count_tokens(record["raw"], self.model))
+        with self._lock:
+            self._lengths = {key: np.array(values) for key, values in lengths.items()}
+            self._loaded_at = time.monotonic()
+
+    def start(self, interval=CAP_REFRESH_SECONDS):
+        """
+        백그라운드 스레드에서 바로 한 번, 이후 interval초마다 refresh()를 실행합니다.
+        반환값: self
+        """
+        def _run():
+            while not self._stopping.is_set():
+                try:
+                    self.refresh()
+                except Exception:
+                    # 이전 분포를 그대로 사용하고 다음 주기에 다시 시도
+                    _log.exception("max_tokens 상한 분포를 갱신하지 못했습니다.")
+                self._stopping.wait(interval)
+
+        threading.Thread(target=_run, name="token-caps-refresh", daemon=True).start()
+        return self
+
+    def stop(self):
+        """
+        백그라운드 갱신을 멈춥니다.
+        """
+        self._stopping.set()
+
+    def cap(self, competency, difficulty, default):
+        """
+        max_tokens 상한을 반환합니다. 표본이 부족하거나 아직 분포를 읽지 않았으면 default를 반환합니다.
+        저장소는 읽지 않으므로 생성 요청을 늦추지 않습니다.
+        - competency: 역량 코드 (저장된 문항의 page)
+        - difficulty: 난이도
+        - default: 표본이 부족할 때 사용할 값
+        """
+        with self._lock:
+            samples = self._lengths.get((competency, difficulty))
+        if samples is None or len(samples) < CAP_MIN_SAMPLES:
+            return default
+        learned = math.ceil(np.percentile(samples, CAP_QUANTILE) * CAP_MARGIN / CAP_STEP) * CAP_STEP
+        return min(CAP_MAX, max(CAP_MIN, learned))
+
+    def summary(self):
+        """
+        (역량, 난이도)별 표본 수와 응답 토큰 수 p50/p99를 반환합니다.
+        """
+        if self._loaded_at is None:
+            self.refresh()
+        with self._lock:
+            return {
+                key: {
+                    "samples": len(values),
+                    "p50": float(np.percentile(values, 50)),
+                    "p99": float(np.percentile(values, CAP_QUANTILE)),
+                }
+                for key, values in self._lengths.items()
+            }
+
+
+def token_caps():
+    """
+    프로세스 전체에서 공유하는 max_tokens 상한 계산기를 반환합니다 (기본 문항 저장소 사용, 백그라운드 갱신 시작).
+    """
+    def _factory():
+        from core.question_store import question_store
+        return TokenCaps(question_store()).start()
+
+    return registry.get("token_caps", _factory)
@@ -0,0 +1,55 @@
+"""
+프롬프트와 응답의 토큰 수를 계산합니다.
+tiktoken 인코딩을 불러올 수 없으면 (오프라인 등) 글자 수 기반 추정값을 사용합니다.
+"""
+import functools
+
+
+@functools.lru_cache(maxsize=None)
+def _encoding(model):
+    try:
+        import tiktoken
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            # 목록에 없는 최신 모델은 GPT-4 계열 인코딩 사용
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # 인코딩 파일을 내려받지 못하면 이후 호출에서도 다시 시도하지 않음
+        return None
+
+
+def estimate_tokens(text):
+    """
+    tiktoken 없이 토큰 수를 추정합니다.
+    영문/숫자는 약 4글자당 1토큰, 한글 등 그 밖의 글자는 글자당 약 1토큰으로 계산합니다.
+    - text: 텍스트
+    """
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def count_tokens(text, model="gpt-4"):
+    """
+    텍스트의 토큰 수를 반환합니다.
+    - text: 텍스트
+    - model: 토큰화 기준 모델 이름
+    """
+    encoding = _encoding(model)
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text))
+
+
+def count_message_tokens(messages, model="gpt-4"):
+    """
+    ChatCompletion 메시지 목록의 프롬프트 토큰 수를 반환합니다.
+    메시지마다 붙는 역할 표시와 응답 시작 표시 토큰을 포함합니다.
+    - messages: {"role", "content"} dict 또는 langchain 메시지 목록
+    - model: 토큰화 기준 모델 이름
+    """
+    total = 3  # 응답 시작 표시
+    for message in messages:
+        content = message["content"] if isinstance(message, dict) else message.content
+        total += 3 + count_tokens(content, model)
+    return total
@@ -0,0 +1,271 @@
+"""
+외부 호출과 무거운 처리 단계의 소요 시간, 토큰 수, 예상 비용을 기록하는 추적 기능입니다.
+구간(span)은 JSON Lines 로그 파일(크기 기준 교체)에 한 줄씩 기록되며,
+내보내기 함수를 등록하면 같은 기록을 로컬 수집기로도 보낼 수 있습니다.
+
+사용 예:
+    with span("llm.chat", model="gpt-4") as s:
+        response = ...
+        s.set(prompt_tokens=100, completion_tokens=50)
+
+환경 변수:
+- DTLAB_TRACE_DIR: 로그 디렉터리 (기본값 .cache/traces)
+- DTLAB_TRACE_MAX_MB, DTLAB_TRACE_BACKUPS: 로그 파일 최대 크기와 보관 개수
+- DTLAB_TRACE_EXPORT_URL: 설정하면 구간 기록을 이 주소로 POST 전송
+"""
+import contextvars
+import itertools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+
+DEFAULT_TRACE_DIR = Path(os.environ.get("DTLAB_TRACE_DIR", Path(os.environ.get("DTLAB_CACHE_DIR", ".cache")) / "traces"))
+DEFAULT_MAX_BYTES = int(float(os.environ.get("DTLAB_TRACE_MAX_MB", "20")) * 1024 * 1024)
+DEFAULT_BACKUPS = int(os.environ.get("DTLAB_TRACE_BACKUPS", "5"))
+TRACE_FILE_NAME = "spans.jsonl"
+
+# 모델별 1K 토큰당 가격 (USD, 프롬프트/응답). 목록에 없는 모델은 비용을 계산하지 않음
+MODEL_PRICES = {
+    "gpt-4": (0.03, 0.06),
+    "gpt-4-turbo": (0.01, 0.03),
+    "gpt-4o": (0.005, 0.015),
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+}
+
+_current_span = contextvars.ContextVar("dtlab_current_span", default=None)
+_span_ids = itertools.count(1)
+_exporters = []
+_logger_lock = threading.Lock()
+_logger = None
+
+
+def estimate_cost(model, prompt_tokens, completion_tokens):
+    """
+    토큰 수로 예상 비용(USD)을 계산합니다. 가격을 모르는 모델이면 None을 반환합니다.
+    - model: 모델 이름
+    - prompt_tokens, completion_tokens: 프롬프트/응답 토큰 수
+    """
+    prices = MODEL_PRICES.get(model)
+    if prices is None:
+        return None
+    return ((prompt_tokens or 0) * prices[0] + (completion_tokens or 0) * prices[1]) / 1000
+
+
+def _trace_logger():
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            DEFAULT_TRACE_DIR.mkdir(parents=True, exist_ok=True)
+            handler = logging.handlers.RotatingFileHandler(
+                DEFAULT_TRACE_DIR / TRACE_FILE_NAME, maxBytes=DEFAULT_MAX_BYTES,
+                backupCount=DEFAULT_BACKUPS, encoding="utf-8",
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger = logging.getLogger("dtlab.trace")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            logger.addHandler(handler)
+            _logger = logger
+            export_url = os.environ.get("DTLAB_TRACE_EXPORT_URL")
+            if export_url:
+                add_exporter(HttpExporter(export_url))
+        return _logger
+
+
+def add_exporter(exporter):
+    """
+    구간 기록을 받을 내보내기 함수를 등록합니다.
+    - exporter: 구간 기록(dict) 하나를 인자로 받는 함수
+    """
+    _exporters.append(exporter)
+
+
+def remove_exporter(exporter):
+    if exporter in _exporters:
+        _exporters.remove(exporter)
+
+
+class Span:
+    """
+    진행 중인 구간입니다. set()으로 토큰 수, 캐시 여부 등 속성을 추가합니다.
+    """
+
+    def __init__(self, name, attributes):
+        parent = _current_span.get()
+        self.name = name
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex[:16]
+        self.span_id = next(_span_ids)
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = dict(attributes)
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def record(self, started_at, duration, error=None):
+        record = {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "started_at": started_at,
+            "duration_ms": round(duration * 1000, 3),
+            "status": "error" if error else "ok",
+            "error": error,
+            **self.attributes,
+        }
+        if "model" in record and ("prompt_tokens" in record or "completion_tokens" in record):
+            # 캐시된 응답은 모델을 호출하지 않았으므로 비용 없음
+            record["cost_usd"] = 0.0 if record.get("cached") else estimate_cost(
+                record["model"], record.get("prompt_tokens"), record.get("completion_tokens")
+            )
+        return record
+
+
+def emit(record):
+    """
+    구간 기록을 로그 파일과 등록된 내보내기 함수로 보냅니다.
+    기록 실패는 본 처리에 영향을 주지 않도록 무시합니다.
+    """
+    try:
+        _trace_logger().info(json.dumps(record, ensure_ascii=False, default=str))
+    except Exception:
+        pass
+    for exporter in list(_exporters):
+        try:
+            exporter(record)
+        except Exception:
+            pass
+
+
+@contextmanager
+def span(name, **attributes):
+    """
+    with 블록의 실행 시간을 구간으로 기록합니다. 블록 안에서 시작한 구간은 하위 구간이 됩니다.
+    - name: 구간 이름 (예: "llm.chat", "deepsearch.search")
+    - attributes: 구간 속성 (model, prompt_tokens, completion_tokens, cached 등)
+    """
+    current = Span(name, attributes)
+    token = _current_span.set(current)
+    started_at = time.time()
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        emit(current.record(started_at, time.perf_counter() - started, error=f"{type(e).__name__}: {e}"))
+        raise
+    else:
+        emit(current.record(started_at, time.perf_counter() - started))
+    finally:
+        try:
+            _current_span.reset(token)
+        except ValueError:
+            # 제너레이터가 다른 컨텍스트에서 정리되는 경우
+            pass
+
+
+class HttpExporter:
+    """
+    구간 기록을 모아 로컬 수집기로 POST 전송하는 내보내기 함수입니다.
+    전송은 백그라운드 스레드에서 하며, 대기열이 가득 차면 기록을 버립니다.
+    - url: 수집기 주소 (JSON 배열을 받는 엔드포인트)
+    - batch_size: 한 번에 보낼 최대 기록 수
+    - flush_seconds: 기록이 모자라도 전송하는 간격 (초)
+    """
+
+    def __init__(self, url, batch_size=50, flush_seconds=2.0, max_queue=10000):
+        import requests
+
+        self.url = url
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._session = requests.Session()
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def __call__(self, record):
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_seconds
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._session.post(self.url, json=batch, timeout=(1, 5))
+            except Exception:
+                self.dropped += len(batch)
+
+
+def read_spans(directory=DEFAULT_TRACE_DIR, since=None):
+    """
+    로그 파일(교체된 파일 포함)에서 구간 기록을 오래된 순으로 읽습니다.
+    - directory: 로그 디렉터리
+    - since: 이 시각(epoch 초) 이후에 시작한 구간만 반환
+    """
+    directory = Path(directory)
+    paths = sorted(directory.glob(f"{TRACE_FILE_NAME}.*"), key=lambda p: -int(p.suffix[1:]))
+    paths.append(directory / TRACE_FILE_NAME)
+    spans = []
+    for path in paths:
+        if not path.exists():
+            continue
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if since is None or record.get("started_at", 0) >= since:
+                    spans.append(record)
+    return spans
+
+
+def summarize(spans, key="name"):
+    """
+    구간 기록을 key별로 묶어 호출 수, p50/p95 소요 시간, 토큰 수, 비용을 계산합니다.
+    - spans: read_spans() 결과
+    - key: 묶을 기준 ("name" 또는 "model")
+    반환값: 호출 수가 많은 순의 dict 목록
+    """
+    groups = {}
+    for record in spans:
+        if record.get(key) is None:
+            continue
+        groups.setdefault(record[key], []).append(record)
+
+    rows = []
+    for value, records in groups.items():
+        durations = np.array([record["duration_ms"] for record in records])
+        rows.append({
+            key: value,
+            "count": len(records),
+            "errors": sum(record.get("status") == "error" for record in records),
+            "p50_ms": float(np.percentile(durations, 50)),
+            "p95_ms": float(np.percentile(durations, 95)),
+            "prompt_tokens": sum(record.get("prompt_tokens") or 0 for record in records),
+            "completion_tokens": sum(record.get("completion_tokens") or 0 for record in records),
+            "cost_usd": sum(record.get("cost_usd") or 0.0 for record in records),
+        })
+    return sorted(rows, key=lambda row: -row["count"])
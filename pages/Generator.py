@@ -0,0 +1,530 @@
+import asyncio
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from core import passage_prompts, question_prompts
+from core.catalog import card_image, competency_catalog
+from core.dedup import duplicate_index, question_text, save_unique_question
+from core.generation import REPAIR_SETTINGS
+from core.jobs import FINISHED_STATUSES, job_queue
+from core.llm import llm_cache
+from core.news_pipeline import run_keyword_news_pipeline
+from core.question_parser import StreamingQuestionParser, parse_structured
+from core.question_store import question_store
+from core.ratelimit import limiter_stats, rate_limit_session
+from core.retrieval import retrieval_index, retrieve_context
+from core.tracing import span
+
+# Streamlit 페이지 설정
+st.set_page_config(page_title="문항 생성기", layout="wide")
+
+# 역량 카탈로그(data/competencies)의 역량 하나를 골라 문항을 생성하는 공통 페이지입니다.
+# 주소의 ?competency=P4-3-1 로 역량을 지정할 수 있으며, 생성기 종류에 따라
+# 지문 생성(passage) 또는 뉴스 키워드 기반 객관식 문항 생성(question) 화면을 보여줍니다.
+# 입력은 폼으로 묶어 제출할 때만 처리하고, 생성/검수 영역은 fragment로 분리합니다.
+# 생성은 작업 대기열(core.jobs)에서 진행하고 페이지는 진행 상황만 주기적으로 확인합니다.
+
+# 생성 작업의 진행 상황을 확인하는 간격 (초)
+JOB_POLL_SECONDS = 0.5
+
+SECTION_TITLES = {"question": "[질문]", "options": "[선지]", "answer": "[정답]", "explanation": "[해설]"}
+
+
+def render_learning_map(competency):
+    """
+    사이드바에 학습 맵(요인묶음) 정보를 표시합니다 (카드 이미지는 줄인 크기로 한 번만 읽음).
+    """
+    st.sidebar.subheader("학습 맵(요인묶음)")
+    with st.sidebar.expander(f"{competency.code}({competency.area})"):
+        # 이미지 표시
+        image = card_image(competency)
+        if image is not None:
+            st.image(image, use_container_width=True)
+        else:
+            st.write("이미지가 없습니다.")
+
+        # 학습 맵 정보 표시
+        st.write(f"**대요인**: {competency.factor}")
+        st.write(f"**중요인**: {competency.sub_factor}")
+        st.write(f"**중요인 성취기준**: {competency.achievement_standard}")
+        st.write(f"**중요인에 대한 학습목표**: {competency.learning_object}")
+        st.write(f"**중요인의 문항 개발시 측정해야할 부분**: {competency.learning_target_note}")
+
+
+def employee_form(competency, companies, departments, submit_label):
+    """
+    임직원 정보 입력 폼입니다 (입력 중에는 다시 실행하지 않고 버튼을 누를 때 한 번에 제출).
+    반환값: (기업명, 부서명, 담당 업무, 제출 여부)
+    """
+    with st.form(f"{competency.code}:employee_form"):
+        company = st.selectbox("📍현재 재직 중인 기업명을 선택하세요:", companies)
+        department = st.selectbox("📍현재 소속 부서를 선택하세요:", departments)
+        role = st.text_input("📍최근 주요하게 담당하고 계신 업무를 입력하세요:", placeholder="예: 사내 게시판 뉴스레터 작성 및 내용 검수")
+        submitted = st.form_submit_button(submit_label)
+    return company, department, role, submitted
+
+
+def show_duplicates(duplicates):
+    if duplicates:
+        st.warning("이미 저장된 문항과 거의 같은 문항입니다. 새로 생성하는 것을 권장합니다.")
+        st.caption(" / ".join(f"문항 ID {d['id']} (유사도 {d['similarity']:.0%})" for d in duplicates))
+
+
+def show_save_result(question_id, duplicates, message):
+    if question_id is None:
+        st.error(f"거의 같은 문항(문항 ID {duplicates[0]['id']})이 이미 저장되어 있어 저장하지 않았습니다.")
+    else:
+        st.success(f"{message} (문항 ID {question_id})")
+
+
+def lecture_context(state, query, use_lecture):
+    """
+    업로드한 교안에서 질의와 관련 있는 내용을 토큰 예산 안에서 골라 프롬프트 블록으로 반환합니다.
+    고른 내용은 화면에 표시할 수 있도록 상태에 저장합니다.
+    - query: 검색 질의 (담당 업무, 주제, 역량 정보)
+    - use_lecture: False면 검색하지 않음
+    """
+    if not use_lecture:
+        state["lecture_passages"] = []
+        return ""
+    with span("retrieval.search") as s:
+        context, passages = retrieve_context(query)
+        s.set(passages=len(passages))
+    state["lecture_passages"] = passages
+    return context
+
+
+def show_lecture_passages(state):
+    passages = state.get("lecture_passages")
+    if passages:
+        with st.expander(f"참고한 교안 내용 ({len(passages)}개)"):
+            for passage in passages:
+                st.caption(f"{passage.source} {passage.page + 1}페이지 (관련도 {passage.score:.1f})")
+                st.write(passage.text)
+
+
+def session_id():
+    # 모델 호출 속도 제한기가 세션별로 번갈아 허가하도록 현재 Streamlit 세션을 구분
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else None
+
+
+def submit_generation(state, kind, payload):
+    """
+    생성 작업을 대기열에 제출하고 작업 ID를 상태에 저장합니다.
+    페이지는 바로 응답하며, 다른 페이지로 이동했다가 돌아와도 같은 작업을 이어서 확인합니다.
+    - kind: 작업 종류 ("question", "passage")
+    - payload: 작업 요청 내용 (core.tasks 참고)
+    """
+    # 이전 작업이 아직 진행 중이면 취소 (결과를 받을 곳이 없으므로)
+    if state["generation_job"] is not None:
+        job_queue().cancel(state["generation_job"])
+    state["generation_job"] = job_queue().submit(kind, payload, owner=session_id())
+    state["generation_error"] = None
+
+
+def finish_generation(state, job):
+    """
+    끝난 생성 작업의 결과를 상태에 저장합니다.
+    """
+    state["generation_job"] = None
+    if job is None or job["status"] == "error":
+        state["generation_error"] = f"문항 생성 중 오류 발생: {job['error'] if job else '작업을 찾을 수 없습니다.'}"
+        return
+    if job["status"] == "cancelled":
+        state["generation_notice"] = "문항 생성을 취소했습니다."
+        return
+    result = job["result"]
+    state["generated_question"] = result["text"]
+    timing = dict(result["timing"])
+    if "difficulty" in result:
+        state["generated_difficulty"] = result["difficulty"]
+        timing["difficulty"] = result["difficulty"]
+    state["generation_timings"].append(timing)
+    state["generation_notice"] = "문항 생성이 완료되었습니다."
+
+
+def show_generation_status(state):
+    # 직전 생성 결과 안내 (전체 재실행 후 한 번만 표시)
+    if state["generation_notice"]:
+        st.success(state["generation_notice"])
+        state["generation_notice"] = None
+    if state["generation_error"]:
+        st.error(state["generation_error"])
+        state["generation_error"] = None
+
+
+def show_partial(kind, text):
+    if not text:
+        return
+    if kind == "question":
+        # 지금까지 받은 텍스트를 구역별로 나누어 표시
+        for name, content in StreamingQuestionParser().feed(text).items():
+            if content:
+                st.markdown(f"**{SECTION_TITLES[name]}**\n\n{content}")
+    else:
+        st.write(text)
+
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def generation_progress(state):
+    """
+    진행 중인 생성 작업의 중간 결과를 주기적으로 확인해 보여줍니다.
+    작업이 끝나면 결과를 상태에 저장하고 페이지 전체를 다시 실행합니다.
+    """
+    job_id = state["generation_job"]
+    if job_id is None:
+        return
+    job = job_queue().get(job_id)
+    if job is None or job["status"] in FINISHED_STATUSES:
+        finish_generation(state, job)
+        st.rerun()
+    if job["status"] == "queued":
+        st.info(f"[안내] 생성 대기 중... (앞에 {job['ahead']}개 작업)")
+    else:
+        st.warning(f"[안내] {job['message'] or '생성 중...'}")
+        show_partial(job["kind"], job["partial"])
+    if st.button("생성 취소"):
+        job_queue().cancel(job_id)
+
+
+# ----- 지문 생성기 (passage) -----
+
+def passage_generator(competency, state, bypass_cache, use_lecture):
+    st.subheader(":rocket: 문항 생성을 위해 필요한 정보를 입력 후 지문을 생성합니다. ", divider="gray")
+    company, department, role, submitted = employee_form(
+        competency, passage_prompts.companies, passage_prompts.departments, "문항 생성"
+    )
+
+    # 임직원 정보로 요청 문장 구성 (입력이 비어 있으면 None)
+    user_input = passage_prompts.build_passage_input(company, department, role, competency.code)
+    if submitted and user_input:
+        # 담당 업무와 관련 있는 교안 내용을 함께 전달
+        context = lecture_context(state, f"{role} {competency.sub_factor}", use_lecture)
+        # Chat 모델 호출은 작업 대기열에서 진행 (도착한 토큰부터 진행 영역에 표시)
+        submit_generation(state, "passage", {
+            "user_input": user_input,
+            "competency": competency.code,
+            "context": context,
+            "bypass_cache": bypass_cache,
+        })
+
+    show_generation_status(state)
+    if state["generation_job"] is not None:
+        generation_progress(state)
+
+    # 생성된 문항 출력
+    if state["generated_question"]:
+        passage_review(competency, state, company, department, role)
+
+
+@st.fragment
+def passage_review(competency, state, company, department, role):
+    """
+    생성된 지문 확인과 저장 영역입니다. 저장 버튼은 이 영역만 다시 실행합니다.
+    """
+    generated_question = state["generated_question"]
+    st.subheader("생성된 문항:")
+    st.write(generated_question)
+
+    # 이미 저장된 문항과 거의 같은지 확인 (같은 문항이면 저장된 결과 사용)
+    review = state["review"]
+    if review is None or review["text"] != generated_question:
+        with span("question.dedup"):
+            review = {"text": generated_question, "duplicates": duplicate_index().query(generated_question)}
+        state["review"] = review
+    show_duplicates(review["duplicates"])
+
+    # 문항 저장 버튼
+    if st.button("문항 저장"):
+        question_id, duplicates = save_unique_question({
+            "page": competency.code,
+            "company": company,
+            "department": department,
+            "competency": competency.sub_factor,
+            "topic": role,
+            "question": generated_question,  # 상태에 저장된 문항 사용
+            "raw": generated_question,
+        })
+        show_save_result(question_id, duplicates, "문항이 저장되었습니다.")
+
+
+# ----- 객관식 문항 생성기 (question) -----
+
+def question_generator(competency, state, bypass_cache, use_lecture):
+    st.subheader(":rocket: [Step 1] 문항 생성을 위해 필요한 정보를 입력 후 지문을 생성합니다.", divider="gray")
+    company, department, role, submitted = employee_form(
+        competency, question_prompts.companies, question_prompts.departments, "임직원 정보 기반 주요 키워드 추출"
+    )
+
+    # 주요 키워드 추출
+    if submitted:
+        if company and department and role.strip():
+            extract_keywords(state, role, bypass_cache)
+        else:
+            st.warning("모든 입력값을 입력해주세요!")
+
+    generation_step(competency, state, company, department, bypass_cache, use_lecture)
+    if state["generation_job"] is not None:
+        generation_progress(state)
+
+    # 생성된 문항 출력
+    if state["generated_question"]:
+        review_step(competency, state, company, department)
+
+
+def extract_keywords(state, role, bypass_cache):
+    try:
+        # 직무 키워드 추출 → 키워드별 뉴스 동시 검색 → 뉴스 키워드 요약
+        st.warning("[안내] 직무 키워드 추출 중...")
+
+        def show_stage(stage, value):
+            # 단계가 끝날 때마다 중간 결과 표시
+            if stage == "직무 키워드 추출":
+                st.write("✅ 추출된 직무 키워드:")
+                for i, keyword in enumerate(value, start=1):
+                    st.write(f"{i}. {keyword}")
+                st.warning("[안내] 뉴스 검색 중...")
+            elif stage == "뉴스 검색" and value:
+                st.write("🔍 관련 뉴스:")
+                for i, article in enumerate(value, start=1):
+                    st.write(f"{i}. {article.get('title', '제목 없음')}")
+                st.warning("[안내] 뉴스 키워드 요약 중...")
+
+        with rate_limit_session(session_id()):
+            pipeline_result = asyncio.run(run_keyword_news_pipeline(role, on_stage=show_stage, bypass_cache=bypass_cache))
+        for error in pipeline_result["errors"]:
+            st.error(error)
+
+        if pipeline_result["news_keywords"]:
+            state["news_keywords"] = pipeline_result["news_keywords"]
+            st.success("[뉴스 기반 키워드]")
+            st.write(state["news_keywords"])
+        else:
+            # 기사가 없으면 직무 키워드를 그대로 사용
+            state["news_keywords"] = " OR ".join(f'"{kw}"' for kw in pipeline_result["role_keywords"])
+            st.warning("관련 기사를 찾을 수 없습니다.")
+
+        # 단계별 소요 시간
+        st.caption(" / ".join(
+            f"{stage} {seconds:.2f}초" for stage, seconds in pipeline_result["timings"].items()
+        ))
+    except Exception as e:
+        st.error(f"오류 발생: {str(e)}")
+
+
+@st.fragment
+def generation_step(competency, state, company, department, bypass_cache, use_lecture):
+    """
+    [Step 2] 난이도 선택과 문항 생성 영역입니다. 난이도를 바꿔도 이 영역만 다시 실행합니다.
+    생성 작업을 제출하면 진행 영역을 표시하도록 페이지 전체를 한 번 다시 실행합니다.
+    """
+    st.subheader(":rocket:[Step 2] 지문 생성 시 질문 난이도를 선택하세요.")
+    difficulty = st.radio("난이도 선택 : ", question_prompts.difficulties, index=2)
+
+    show_generation_status(state)
+
+    if not st.button("문항 생성", disabled=state["generation_job"] is not None):
+        return
+    if not state["news_keywords"]:
+        st.warning("키워드 추출이 완료되지 않아 문항을 생성할 수 없습니다.")
+        return
+
+    # 난이도와 뉴스 키워드, 주제와 관련 있는 교안 내용을 반영한 프롬프트로 문항 생성 작업 제출
+    context = lecture_context(state, f"{state['news_keywords']} {competency.sub_factor}", use_lecture)
+    submit_generation(state, "question", {
+        "company": company,
+        "department": department,
+        "topic": state["news_keywords"],
+        "difficulty": difficulty,
+        "competency": competency.code,
+        "context": context,
+        "bypass_cache": bypass_cache,
+    })
+    # 진행 영역을 표시하도록 페이지 전체를 다시 실행
+    st.rerun()
+
+
+def current_review(state):
+    """
+    생성된 문항의 구역 분리 결과와 중복 검사 결과를 반환합니다.
+    같은 문항이면 다시 계산하지 않고 저장된 결과를 사용합니다.
+    """
+    generated_content = state["generated_question"]
+    review = state["review"]
+    if review is None or review["text"] != generated_content:
+        # 텍스트를 구역별로 분리하고 형식 검증
+        with span("question.parse"):
+            parsed_question = parse_structured(generated_content)
+        # 이미 저장된 문항과 거의 같은지 확인
+        with span("question.dedup"):
+            duplicates = duplicate_index().query(question_text(parsed_question.to_dict()))
+        review = {"text": generated_content, "parsed": parsed_question, "duplicates": duplicates}
+        state["review"] = review
+    return review
+
+
+@st.fragment
+def review_step(competency, state, company, department):
+    """
+    [Step 3] 문항 검수 영역입니다. 검수 입력과 저장/폐기는 이 영역만 다시 실행합니다.
+    """
+    st.subheader(":rocket:[Step 3] 문항 검수자 역할을 수행합니다.")
+
+    generated_content = state["generated_question"]
+    review = current_review(state)
+    parsed_question = review["parsed"]
+    parsed = parsed_question.to_dict()
+
+    # 분리된 내용 출력
+    if parsed_question.is_valid:
+        st.write(f"**[질문]**\n{parsed['question']}\n")
+        st.write(f"**[선지]**\n{parsed['options']}\n")
+        st.write(f"**[정답]**\n{parsed['answer']}\n")
+        st.write(f"**[해설]**\n{parsed['explanation']}\n")
+    else:
+        st.warning(
+            "문항의 일부가 올바르게 생성되지 않았습니다 ("
+            + ", ".join(REPAIR_SETTINGS[section][0] for section in parsed_question.problems())
+            + "). 원본 문항을 확인하거나 문항을 다시 생성하세요."
+        )
+        st.write(generated_content)  # 원본 출력
+    show_duplicates(review["duplicates"])
+
+    # 생성 당시 입력 정보 (문항 저장 시 함께 기록)
+    question_record = {
+        "page": competency.code,
+        "company": company,
+        "department": department,
+        "competency": competency.sub_factor,
+        "difficulty": state["generated_difficulty"],
+        "topic": state["news_keywords"],
+        "question": parsed["question"],
+        "options": parsed["options"],
+        "answer": parsed["answer"],
+        "explanation": parsed["explanation"],
+        "raw": generated_content,
+    }
+
+    # 문항 검수자 이름 입력과 저장 (저장 버튼을 누를 때 한 번에 제출)
+    with st.form(f"{competency.code}:save_form"):
+        reviewer_name = st.text_input("문항 검수자의 성함을 입력해주세요.", placeholder="예: 이재화")
+        save_question = st.form_submit_button("문항 저장")
+    if save_question:
+        if reviewer_name.strip():  # 검수자 이름이 입력되었는지 확인
+            question_id, duplicates = save_unique_question({**question_record, "reviewer": reviewer_name})
+            show_save_result(question_id, duplicates, "문항과 검수자 정보가 저장되었습니다.")
+        else:
+            st.warning("검수자 이름을 입력해주세요.")
+
+    # 문항 폐기 버튼
+    if st.button("AI resigns"):
+        st.warning("문항 폐기 사유를 선택하고 추가 설명을 작성하세요.")
+        st.caption("AI 는 실수할 수 있는 존재입니다. 학습데이터를 확보합니다.")
+        state["discarded_question"] = True
+
+    # 폐기 상태 활성화 시 폐기 입력 화면 표시
+    if state["discarded_question"]:
+        # 폐기 사유와 추가 설명 입력
+        with st.form(f"{competency.code}:discard_form"):
+            discard_reason = st.radio(
+                "폐기 사유를 선택하세요:",
+                ["질문 오류", "선지 오류", "정답 오류", "해설 오류", "기타"],
+                index=None,
+            )
+            additional_reason = st.text_area(
+                "폐기 사유에 대한 추가 설명을 작성해주세요. 없으면 공란으로 둡니다.",
+                placeholder="예: 질문의 내용이 불명확하고, 선지가 모호합니다.",
+            )
+            reviewer_name = st.text_input("검수자의 성함을 입력해주세요.", placeholder="예: 이재화")
+            save_discarded = st.form_submit_button("학습 데이터 저장")
+
+        # 폐기 문항 저장
+        if save_discarded:
+            if discard_reason and additional_reason.strip() and reviewer_name.strip():
+                question_id, duplicates = save_unique_question({
+                    **question_record,
+                    "status": "discarded",
+                    "discard_reason": discard_reason,
+                    "discard_note": additional_reason,
+                    "reviewer": reviewer_name,
+                })
+                show_save_result(question_id, duplicates, "추가 학습용 문항과 폐기 사유가 저장되었습니다.")
+                state["discarded_question"] = None  # 상태 초기화
+            else:
+                st.warning("검수자 이름과 추가 설명을 모두 작성해주세요!")
+
+
+GENERATORS = {"passage": passage_generator, "question": question_generator}
+
+# 역량 선택 (주소의 ?competency= 값과 동기화)
+catalog = competency_catalog()
+codes = catalog.codes()
+requested = st.query_params.get("competency", question_prompts.DEFAULT_COMPETENCY)
+code = st.sidebar.selectbox("역량", codes, index=codes.index(requested) if requested in codes else 0)
+if st.query_params.get("competency") != code:
+    st.query_params["competency"] = code
+competency = catalog.get(code)
+
+# 역량별 Session State (역량을 바꿔도 다른 역량의 생성 결과와 섞이지 않음)
+state = st.session_state.setdefault(f"generator:{code}", {
+    "generated_question": None,
+    "generated_difficulty": None,
+    "generation_notice": None,
+    "generation_timings": [],
+    "news_keywords": None,
+    "discarded_question": None,
+    "review": None,
+    "lecture_passages": [],
+    "generation_job": None,
+    "generation_error": None,
+})
+
+# Streamlit UI 구성
+st.title(f"DTLAB {competency.area} ({code.replace('-', '_')}) 지문 생성기(내부 PoC용)")
+render_learning_map(competency)
+
+# 같은 입력이라도 새로운 응답을 받고 싶을 때 캐시 우회
+bypass_cache = st.sidebar.checkbox("캐시된 응답 사용 안 함 (새로 생성)")
+
+# Pn-1 페이지에서 처리한 교안 PDF가 있으면 관련 내용을 프롬프트에 참고
+lecture_count = len(retrieval_index().documents)
+use_lecture = lecture_count > 0 and st.sidebar.checkbox(f"업로드한 교안 내용 참고 (교안 {lecture_count}개)", value=True)
+
+GENERATORS[competency.generator](competency, state, bypass_cache, use_lecture)
+show_lecture_passages(state)
+
+# 최근 문항 생성 소요 시간
+if state["generation_timings"]:
+    timing = state["generation_timings"][-1]
+    st.sidebar.caption(
+        f"최근 문항 생성: 프롬프트 {timing['prompt_tokens']}토큰 / 첫 토큰 {timing['time_to_first_token'] or 0:.2f}초 / "
+        f"전체 {timing['total_seconds'] or 0:.2f}초" + (" (캐시)" if timing["cached"] else "")
+    )
+    if timing.get("completion_tokens") is not None and timing.get("max_tokens"):
+        st.sidebar.caption(
+            f"응답 {timing['completion_tokens']} / 상한 {timing['max_tokens']}토큰"
+            + (" (문항 완료 시점에 중단)" if timing.get("stopped_early") else "")
+        )
+
+# 저장된 문항 현황
+store = question_store()
+st.sidebar.caption(
+    f"저장된 문항: 채택 {store.count(status='accepted', page=code)}개 / "
+    f"폐기 {store.count(status='discarded', page=code)}개"
+)
+
+# 모델 호출 속도 제한 현황 (대기 중인 호출이 있거나 429를 받은 적이 있을 때만 표시)
+for model, limiter in limiter_stats().items():
+    if limiter["queued"] or limiter["rate_limited"]:
+        st.sidebar.caption(
+            f"{model} 호출: 진행 {limiter['in_flight']} / 대기 {limiter['queued']} / "
+            f"동시 호출 한도 {limiter['limit']:.0f} / 429 {limiter['rate_limited']}회"
+        )
+
+# LLM 응답 캐시 현황
+cache_stats = llm_cache().stats()
+st.sidebar.caption(
+    f"LLM 캐시 적중 {cache_stats['hits']} / 미스 {cache_stats['misses']} / "
+    f"우회 {cache_stats['bypassed']} (저장된 응답 {cache_stats['entries']}개)"
+)
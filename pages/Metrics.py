@@ -0,0 +1,80 @@
+import time
+
+import pandas as pd
+import streamlit as st
+
+from core.tracing import read_spans, summarize
+
+# Streamlit 페이지 설정
+st.set_page_config(page_title="처리 지표", layout="wide")
+
+st.title("단계별 처리 시간 / 토큰 / 비용")
+st.caption("외부 호출(LLM, DeepSearch)과 무거운 처리 단계의 추적 기록(.cache/traces)을 집계합니다.")
+
+# 집계 기간
+windows = {"최근 1시간": 3600, "최근 24시간": 24 * 3600, "최근 7일": 7 * 24 * 3600, "전체": None}
+window = st.radio("집계 기간", tuple(windows), index=1, horizontal=True)
+
+
+@st.cache_data(ttl=10)
+def load_spans(seconds):
+    # 로그 파일을 매번 다시 읽지 않도록 10초간 재사용
+    return read_spans(since=time.time() - seconds if seconds else None)
+
+
+spans = load_spans(windows[window])
+st.button("새로고침", on_click=load_spans.clear)
+
+if not spans:
+    st.info("아직 기록된 구간이 없습니다. 문항 생성이나 PDF 처리를 실행하면 여기에 표시됩니다.")
+else:
+    stage_rows = summarize(spans, key="name")
+    model_rows = summarize(spans, key="model")
+
+    col_spans, col_errors, col_tokens, col_cost = st.columns(4)
+    col_spans.metric("구간 수", f"{len(spans):,}")
+    col_errors.metric("오류", f"{sum(row['errors'] for row in stage_rows):,}")
+    col_tokens.metric("토큰 (프롬프트+응답)", f"{sum(row['prompt_tokens'] + row['completion_tokens'] for row in model_rows):,}")
+    col_cost.metric("예상 비용 (USD)", f"${sum(row['cost_usd'] for row in model_rows):.4f}")
+
+    column_labels = {
+        "count": "호출 수",
+        "errors": "오류",
+        "p50_ms": "p50 (ms)",
+        "p95_ms": "p95 (ms)",
+        "prompt_tokens": "프롬프트 토큰",
+        "completion_tokens": "응답 토큰",
+        "cost_usd": "예상 비용 (USD)",
+    }
+
+    st.subheader("단계별")
+    st.dataframe(
+        pd.DataFrame(stage_rows).rename(columns={"name": "단계", **column_labels}),
+        hide_index=True, use_container_width=True,
+    )
+
+    st.subheader("모델별")
+    if model_rows:
+        st.dataframe(
+            pd.DataFrame(model_rows).rename(columns={"model": "모델", **column_labels}),
+            hide_index=True, use_container_width=True,
+        )
+    else:
+        st.write("모델 호출 기록이 없습니다.")
+
+    # 최근 오류
+    errors = [record for record in spans if record.get("status") == "error"][-20:]
+    if errors:
+        st.subheader("최근 오류")
+        st.dataframe(
+            pd.DataFrame([
+                {
+                    "시각": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record["started_at"])),
+                    "단계": record["name"],
+                    "소요 시간 (ms)": record["duration_ms"],
+                    "오류": record["error"],
+                }
+                for record in reversed(errors)
+            ]),
+            hide_index=True, use_container_width=True,
+        )
@@ -1,28 +1,104 @@
 import streamlit as st
-from langchain.document_loaders import PyMuPDFLoader
-from langchain.text_splitter import SpacyTextSplitter
-from sklearn.feature_extraction.text import CountVectorizer
-import re
-from collections import Counter
+import os
+from core.jobs import ACTIVE_STATUSES, FINISHED_STATUSES, job_queue
+from core.pdf_cache import PdfCache, make_cache_key
+from core.pdf_pipeline import DEFAULT_WORKERS, reweight
+from core.results_view import filter_results, page_slice, results_table
+from core.retrieval import retrieval_index
+from core.tracing import span
 
 
-# 키워드 추출 함수 (한국어와 영어 지원)
-def extract_keywords(text, top_n=5):
+# 분할기 설정 (캐시 키에 포함)
+CHUNK_SIZE = 350
+SPACY_PIPELINE = "ko_core_news_sm"
+
+
+# 처리 상황을 확인하는 간격 (초)
+JOB_POLL_SECONDS = 1.0
+
+
+def submit_pdf_job(cache_key, pdf_bytes, source, workers):
+    """
+    이 세션에서 업로드한 파일의 처리 작업 ID를 반환합니다. 아직 제출하지 않았으면 작업을 제출합니다
+    (다른 세션이 같은 파일을 처리 중이면 그 작업을 함께 사용하고, 새 작업일 때만 파일을 작업 입력으로 기록).
+    - cache_key: make_cache_key()로 만든 키
+    - pdf_bytes: 업로드된 PDF 파일 바이트
+    - source: 원본 파일 이름
+    - workers: 병렬 처리 작업자 수 (1이면 페이지 단위로 진행 상황 기록)
+    """
+    job = st.session_state.get("pdf_job")
+    if job is None or job["cache_key"] != cache_key:
+        job_id = job_queue().submit("pdf", {
+            "cache_key": cache_key,
+            "source": source,
+            "chunk_size": CHUNK_SIZE,
+            "pipeline": SPACY_PIPELINE,
+            "workers": workers,
+        }, dedupe_key=cache_key, input=(f"{cache_key}.pdf", pdf_bytes))
+        job = {"cache_key": cache_key, "id": job_id}
+        st.session_state["pdf_job"] = job
+    return job["id"]
+
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def pdf_job_progress(job_id):
+    """
+    PDF 처리 작업의 진행 상황을 주기적으로 확인해 보여줍니다.
+    처리는 작업 대기열에서 계속되므로 다른 페이지로 이동했다가 돌아와도 이어서 확인할 수 있으며,
+    작업이 끝나면 결과를 표시하도록 페이지 전체를 다시 실행합니다.
+    - job_id: 작업 ID
+    """
+    job = job_queue().get(job_id)
+    if job is None or job["status"] in FINISHED_STATUSES:
+        st.rerun()
+    if job["status"] == "queued":
+        st.info(f"PDF 처리 대기 중... (앞에 {job['ahead']}개 작업)")
+    else:
+        st.progress(job["progress"], text=job["message"] or "PDF 처리 중...")
+        if job["partial"]:
+            st.write("진행 중 주요 키워드: " + job["partial"])
+    if st.button("처리 취소"):
+        job_queue().cancel(job_id)
+
+
+@st.fragment
+def results_view():
     """
-    텍스트에서 한국어와 영어 키워드를 추출합니다.
-    - text: 텍스트 (문자열)
-    - top_n: 추출할 키워드 개수
+    세션에 저장된 결과 표를 필터링해 보여줍니다.
+    필터나 페이지를 바꾸면 업로드 처리 없이 이 영역만 다시 실행합니다.
     """
-    # 특수문자 제거 및 단어 추출 (한국어, 영어, 숫자만 유지)
-    clean_text = re.sub(r"[^가-힣a-zA-Z0-9\s]", "", text)
-    vectorizer = CountVectorizer(
-        ngram_range=(1, 2),  # 1-그램과 2-그램 추출
-        stop_words="english"  # 영어 불용어 제거
-    )
-    X = vectorizer.fit_transform([clean_text])
-    keywords = vectorizer.get_feature_names_out()
-    return keywords[:top_n]
+    table = st.session_state["results_table"]
+    document_keywords = st.session_state["document_keywords"]
 
+    # 결과 출력
+    st.subheader("키워드 추출 결과")
+    if len(table):
+        # 필터 조건 (서버에서 걸러낸 뒤 보이는 부분만 전송)
+        col_keyword, col_page, col_size = st.columns([2, 1, 1])
+        keyword_filter = col_keyword.text_input("키워드 검색", placeholder="예: 파인튜닝")
+        page_filter = col_page.number_input(
+            "PDF 페이지 (0이면 전체)", min_value=0, max_value=int(table["페이지"].max()), value=0
+        )
+        page_size = col_size.selectbox("표시 개수", [25, 50, 100], index=1)
+
+        filtered = filter_results(table, keyword_filter, page_filter or None)
+        _, total_pages = page_slice(filtered, 1, page_size)
+        page_no = st.number_input(f"결과 페이지 (전체 {total_pages})", min_value=1, max_value=total_pages, value=1)
+        visible, _ = page_slice(filtered, page_no, page_size)
+
+        # 청크별 키워드 출력
+        st.dataframe(visible, hide_index=True, use_container_width=True)
+        st.caption(f"전체 {len(table)}개 청크 중 조건에 맞는 {len(filtered)}개")
+
+        # 문서 전체 키워드 (가중치 합 기준 정렬)
+        st.subheader("문서 전체에서 추출된 주요 키워드")
+        st.write(", ".join(word for word, score in document_keywords))
+    else:
+        st.info("PDF를 처리한 후 키워드가 여기에 표시됩니다.")
+
+
+# 처리 결과 캐시
+pdf_cache = PdfCache()
 
 # Streamlit 앱 제목
 st.title("Codestates & Rocket 느린 학습자를 위한 콘텐츠/문항 생성 APP")
@@ -30,42 +106,66 @@ st.title("Codestates & Rocket 느린 학습자를 위한 콘텐츠/문항 생성
 # PDF 업로드 위젯
 uploaded_file = st.file_uploader("교안을 업로드 해주세요. 확장자는 PDF 만을 지원합니다.", type=["pdf"])
 
+# 키워드 가중치 방식 선택
+weighting_labels = {"빈도": "count", "TF-IDF": "tfidf"}
+weighting = weighting_labels[st.radio("키워드 가중치 : ", tuple(weighting_labels), horizontal=True)]
+
+# 병렬 처리 작업자 수 (1이면 페이지 단위 스트리밍 처리)
+workers = st.sidebar.number_input(
+    "PDF 처리 작업자 수", min_value=1, max_value=os.cpu_count() or 1,
+    value=min(DEFAULT_WORKERS, os.cpu_count() or 1)
+)
+
 if uploaded_file is not None:
     try:
-        # 파일 저장 및 로드
-        with open("uploaded_file.pdf", "wb") as f:
-            f.write(uploaded_file.getbuffer())
-
-        # PyMuPDFLoader로 PDF 로드
-        loader = PyMuPDFLoader("uploaded_file.pdf")
-        doc = loader.load()
-
-        # Text Splitter로 텍스트 분리
-        test_splitter = SpacyTextSplitter(chunk_size=350, pipeline="ko_core_news_sm")
-        split_docs = test_splitter.split_documents(doc)
-
-        # 결과 출력
-        st.subheader("키워드 추출 결과")
-        if split_docs:
-            all_keywords = Counter()  # 전체 키워드를 빈도로 저장
-
-            for idx, split_doc in enumerate(split_docs):
-                try:
-                    # 각 청크에서 키워드 추출
-                    keywords = extract_keywords(split_doc.page_content, top_n=5)
-                    all_keywords.update(keywords)  # 키워드 빈도 누적
-
-                    # 청크별 키워드 출력
-                    st.write(f"청크 {idx + 1} 키워드: {', '.join(keywords)}")
-                except Exception as e:
-                    st.warning(f"청크 {idx + 1}에서 키워드 추출 중 문제가 발생했습니다: {str(e)}")
-
-            # 전체 키워드 통합 및 정렬
-            unique_keywords = [word for word, freq in all_keywords.most_common()]
-            st.subheader("문서 전체에서 추출된 주요 키워드")
-            st.write(", ".join(unique_keywords))
-        else:
-            st.info("PDF를 처리한 후 키워드가 여기에 표시됩니다.")
+        # 같은 파일/설정으로 처리한 결과가 있으면 파싱과 분할을 건너뜀
+        pdf_bytes = uploaded_file.getvalue()
+        cache_key = make_cache_key(pdf_bytes, chunk_size=CHUNK_SIZE, pipeline=SPACY_PIPELINE)
+        view_key = f"{cache_key}:{weighting}"
+
+        # 결과 표는 세션에 한 번만 만들고, 필터/페이지 이동 시에는 재사용
+        if st.session_state.get("results_key") != view_key:
+            with span("pdf.cache_get") as s:
+                result = pdf_cache.get(cache_key)
+                s.set(hit=result is not None)
+            if result is None:
+                # 처리는 작업 대기열에서 진행하고, 이 페이지는 진행 상황만 확인
+                job_id = submit_pdf_job(cache_key, pdf_bytes, uploaded_file.name, workers)
+                job = job_queue().get(job_id)
+                if job is not None and job["status"] in ACTIVE_STATUSES:
+                    pdf_job_progress(job_id)
+                elif job is not None and job["status"] in ("error", "cancelled"):
+                    if job["status"] == "error":
+                        st.error("PDF 파일을 처리하는 중 문제가 발생했습니다. 오류: " + job["error"])
+                    else:
+                        st.warning("PDF 처리를 취소했습니다.")
+                    if st.button("다시 처리"):
+                        del st.session_state["pdf_job"]
+                        st.rerun()
+                else:
+                    # 처리가 끝났지만 캐시에서 지워진 경우 다시 제출
+                    del st.session_state["pdf_job"]
+                    st.rerun()
+                st.stop()
+            elif st.session_state.get("pdf_job", {}).get("cache_key") != cache_key:
+                st.caption("이전에 처리한 동일한 파일의 결과를 불러왔습니다.")
+
+            # 문항 생성 페이지에서 교안 내용을 참고할 수 있도록 검색 색인에 추가 (같은 파일은 한 번만)
+            index = retrieval_index()
+            if cache_key not in index:
+                with span("retrieval.add", chunks=len(result["chunks"])):
+                    index.add_document(cache_key, uploaded_file.name, result["chunks"])
+
+            # 선택한 가중치 방식으로 키워드 계산 (TF-IDF는 전체 청크로 한 번 학습)
+            with span("pdf.reweight", weighting=weighting):
+                result = reweight(result, weighting)
+            st.session_state["results_key"] = view_key
+            with span("pdf.results_table"):
+                st.session_state["results_table"] = results_table(result)
+            st.session_state["document_keywords"] = result["document_keywords"]
+
+        # 필터/페이지 이동은 결과 영역만 다시 실행
+        results_view()
 
     except Exception as e:
         st.error("PDF 파일을 처리하는 중 문제가 발생했습니다. 오류: " + str(e))
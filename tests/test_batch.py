@@ -0,0 +1,48 @@
+"""
+core.batch의 작업 펼치기와 역량 전달을 확인합니다.
+실행: python -m pytest -q tests
+"""
+import pytest
+
+from core import batch
+from core.catalog import CatalogError, get_competency
+
+
+SPEC = {**batch.DEFAULT_SPEC, "companies": ["KCC"], "departments": ["데이터 분석팀"], "difficulties": ["중"]}
+
+
+def test_topics_default_to_competency_sub_factor():
+    for code in ("P4-3-1", "P4-1-1"):
+        [job] = batch.expand_jobs({**SPEC, "competency": code})
+        assert job["competency"] == code
+        assert job["topic"] == get_competency(code).sub_factor
+
+
+def test_job_id_depends_on_competency():
+    ids = batch.job_id("KCC", "데이터 분석팀", "주제", "중", 0)
+    assert batch.job_id("KCC", "데이터 분석팀", "주제", "중", 0, "P4-3-1") == ids
+    assert batch.job_id("KCC", "데이터 분석팀", "주제", "중", 0, "P4-1-1") != ids
+
+
+def test_duplicate_guard_separates_competencies():
+    jobs = [batch.expand_jobs({**SPEC, "competency": code, "topics": ["주제"]})[0] for code in ("P4-3-1", "P4-1-1")]
+    assert batch.DuplicateGuard._prompt(jobs[0]) != batch.DuplicateGuard._prompt(jobs[1])
+
+
+def test_run_job_passes_competency():
+    calls = []
+
+    def generate(*args, **kwargs):
+        calls.append(kwargs)
+        return {"question": "질문"}
+
+    [job] = batch.expand_jobs({**SPEC, "competency": "P4-1-1"})
+    assert batch._run_job(job, generate)["status"] == "ok"
+    assert calls == [{"bypass_cache": True, "competency": "P4-1-1"}]
+
+
+def test_unknown_competency_is_rejected(tmp_path):
+    path = tmp_path / "spec.json"
+    path.write_text('{"competency": "P9-9-9"}', encoding="utf-8")
+    with pytest.raises(CatalogError):
+        batch.load_job_spec(path)
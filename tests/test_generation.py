@@ -0,0 +1,123 @@
+"""
+core.generation의 구역 보완(repair_question)과 max_tokens 상한 기본값 사용을 확인합니다.
+모델 호출은 가짜 응답으로 바꿔 실행합니다.
+실행: python -m pytest -q tests
+"""
+import logging
+import sqlite3
+
+import pytest
+
+from core import generation
+from core.question_parser import parse_structured
+
+
+VALID = (
+    "[질문]\n팀은 보고서 작성에 생성형 AI를 활용하려고 한다.\n"
+    "[선지]\n선지 1) 가\n선지 2) 나\n선지 3) 다\n선지 4) 라\n\n"
+    "[정답 및 해설]\n정답) 2\n해설) 출처를 확인해야 한다."
+)
+NO_ANSWER = VALID.replace("정답) 2", "정답) 없음")
+BAD_OPTIONS = VALID.replace("선지 4) 라\n", "")
+TWO_PROBLEMS = NO_ANSWER.replace("해설) 출처를 확인해야 한다.", "해설)")
+
+
+class FakeCompletion:
+    """chat_completion()을 대신해 정해 둔 응답을 차례로 돌려주고 요청을 기록합니다."""
+
+    def __init__(self, *contents):
+        self.contents = list(contents)
+        self.calls = []
+
+    def __call__(self, **kwargs):
+        self.calls.append(kwargs)
+        return {"choices": [{"message": {"content": self.contents.pop(0)}}]}
+
+
+@pytest.fixture
+def completion(monkeypatch):
+    def install(*contents):
+        fake = FakeCompletion(*contents)
+        monkeypatch.setattr(generation, "chat_completion", fake)
+        return fake
+    return install
+
+
+def test_valid_question_needs_no_repair(completion):
+    fake = completion()
+    repaired, problems = generation.repair_question(parse_structured(VALID), "주제")
+    assert problems == []
+    assert repaired.is_valid
+    assert fake.calls == []
+
+
+@pytest.mark.parametrize("reply", ["3", "정답) 3", "선지 3"])
+def test_repairs_single_answer_section(completion, reply):
+    fake = completion(reply)
+    repaired, problems = generation.repair_question(parse_structured(NO_ANSWER), "주제")
+    assert problems == ["answer"]
+    assert repaired.answer == 3
+    assert repaired.question == parse_structured(VALID).question
+    assert len(fake.calls) == 1
+    assert fake.calls[0]["max_tokens"] == generation.REPAIR_SETTINGS["answer"][2]
+
+
+def test_repairs_single_options_section(completion):
+    completion("선지 1) 가\n선지 2) 나\n선지 3) 다\n선지 4) 마")
+    repaired, problems = generation.repair_question(parse_structured(BAD_OPTIONS), "주제")
+    assert problems == ["options"]
+    assert repaired.options == ["가", "나", "다", "마"]
+
+
+def test_failed_repair_falls_back_to_regeneration(completion):
+    completion("정답을 알 수 없습니다.")
+    repaired, problems = generation.repair_question(parse_structured(NO_ANSWER), "주제")
+    assert repaired is None
+    assert problems == ["answer"]
+
+
+def test_too_many_problems_are_not_repaired(completion):
+    fake = completion()
+    repaired, problems = generation.repair_question(parse_structured(TWO_PROBLEMS), "주제")
+    assert repaired is None
+    assert problems == ["answer", "explanation"]
+    assert fake.calls == []
+
+
+def test_generate_parsed_question_uses_repaired_text(monkeypatch, completion):
+    monkeypatch.setattr(generation, "generate_question", lambda *args, **kwargs: NO_ANSWER)
+    completion("2")
+    result = generation.generate_parsed_question("KCC", "데이터 분석팀", "주제", "중")
+    assert result["repaired"] == ["answer"]
+    assert result["answer"] == "2"
+    assert parse_structured(result["raw"]).is_valid
+
+
+def test_generate_parsed_question_keeps_raw_when_repair_fails(monkeypatch, completion):
+    monkeypatch.setattr(generation, "generate_question", lambda *args, **kwargs: TWO_PROBLEMS)
+    completion()
+    result = generation.generate_parsed_question("KCC", "데이터 분석팀", "주제", "중")
+    assert result["raw"] == TWO_PROBLEMS
+    assert result["repaired"] == []
+
+
+@pytest.mark.parametrize("error", [sqlite3.OperationalError("database is locked"), OSError("read-only")])
+def test_max_tokens_falls_back_when_store_unavailable(monkeypatch, caplog, error):
+    def unavailable():
+        raise error
+
+    monkeypatch.setattr(generation, "token_caps", unavailable)
+    with caplog.at_level(logging.ERROR, logger=generation.__name__):
+        assert generation.question_max_tokens("P4-3-1", "중", 900) == 900
+    assert caplog.records == []
+
+
+def test_max_tokens_logs_unexpected_errors(monkeypatch, caplog):
+    class BrokenCaps:
+        def cap(self, competency, difficulty, default):
+            raise KeyError("bug")
+
+    monkeypatch.setattr(generation, "token_caps", BrokenCaps)
+    with caplog.at_level(logging.ERROR, logger=generation.__name__):
+        assert generation.question_max_tokens("P4-3-1", "중", 900) == 900
+    assert len(caplog.records) == 1
@@ -0,0 +1,144 @@
+"""
+core.jobs의 작업 가져오기, 취소, 재시작 시 다시 대기, 입력 파일 정리를 확인합니다.
+실행: python -m pytest -q tests
+"""
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from core.jobs import JobQueue
+
+
+def noop(payload, job):
+    return payload
+
+
+def make_queue(tmp_path, handlers=None, workers=0):
+    handlers = {"noop": noop} if handlers is None else handlers
+    return JobQueue(tmp_path / "jobs.sqlite3", workers=workers, handlers=handlers, input_dir=tmp_path / "inputs")
+
+
+def wait_for(queue, job_id, statuses=("done", "error", "cancelled")):
+    for _ in range(500):
+        job = queue.get(job_id)
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"작업이 끝나지 않았습니다: {job}")
+
+
+def job_payload_path(queue, job_id):
+    row = queue._conn.execute("SELECT payload FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return Path(json.loads(row["payload"])["path"])
+
+
+def test_claim_takes_oldest_job_once(tmp_path):
+    queue = make_queue(tmp_path).start()
+    first = queue.submit("noop", {"n": 1})
+    second = queue.submit("noop", {"n": 2})
+
+    assert queue._claim()["id"] == first
+    assert queue._claim()["id"] == second
+    assert queue._claim() is None
+    assert queue.counts() == {"running": 2}
+
+
+def test_submit_rejects_unknown_kind(tmp_path):
+    with pytest.raises(ValueError):
+        make_queue(tmp_path).submit("missing", {})
+
+
+def test_dedupe_returns_active_job_without_writing_input(tmp_path):
+    queue = make_queue(tmp_path).start()
+    job_id = queue.submit("noop", {}, dedupe_key="a", input=("a.pdf", b"first"))
+    assert queue.submit("noop", {}, dedupe_key="a", input=("a.pdf", b"second")) == job_id
+    assert [path.read_bytes() for path in (tmp_path / "inputs").iterdir()] == [b"first"]
+
+
+def test_new_job_writes_its_own_input_after_previous_finished(tmp_path):
+    # 같은 키의 작업이 끝나 입력 파일을 지운 뒤에도 새 작업은 존재하는 파일을 받아야 함
+    queue = make_queue(tmp_path).start()
+    first = queue.submit("noop", {}, dedupe_key="a", input=("a.pdf", b"data"))
+    job = queue._claim()
+    path = job_payload_path(queue, first)
+    path.unlink()
+    queue._finish(job["id"], "done")
+
+    second = queue.submit("noop", {}, dedupe_key="a", input=("a.pdf", b"data"))
+    assert second != first
+    assert job_payload_path(queue, second).read_bytes() == b"data"
+
+
+def test_cancel_queued_job_removes_input(tmp_path):
+    queue = make_queue(tmp_path).start()
+    job_id = queue.submit("noop", {}, input=("a.pdf", b"data"))
+    path = job_payload_path(queue, job_id)
+    assert path.exists()
+
+    queue.cancel(job_id)
+    assert queue.get(job_id)["status"] == "cancelled"
+    assert not path.exists()
+    assert queue._claim() is None
+
+
+def test_cancel_running_job_stops_handler(tmp_path):
+    started = threading.Event()
+
+    def slow(payload, job):
+        started.set()
+        while True:
+            job.progress(force=True)
+            time.sleep(0.01)
+
+    queue = make_queue(tmp_path, handlers={"slow": slow}, workers=1).start()
+    try:
+        job_id = queue.submit("slow", {})
+        assert started.wait(5)
+        queue.cancel(job_id)
+        assert wait_for(queue, job_id)["status"] == "cancelled"
+    finally:
+        queue.stop(timeout=5)
+
+
+def test_handler_error_is_recorded(tmp_path):
+    def fail(payload, job):
+        raise RuntimeError("실패")
+
+    queue = make_queue(tmp_path, handlers={"fail": fail}, workers=1).start()
+    try:
+        job = wait_for(queue, queue.submit("fail", {}))
+    finally:
+        queue.stop(timeout=5)
+    assert job["status"] == "error"
+    assert job["error"] == "실패"
+
+
+def test_restart_requeues_running_jobs_and_keeps_their_inputs(tmp_path):
+    queue = make_queue(tmp_path).start()
+    job_id = queue.submit("noop", {}, input=("a.pdf", b"data"))
+    queue._claim()
+    orphan = tmp_path / "inputs" / "orphan.pdf"
+    orphan.write_bytes(b"left behind")
+
+    # 같은 저장소로 다시 시작 (이전 프로세스가 실행 중에 종료된 경우)
+    restarted = make_queue(tmp_path).start()
+    assert restarted.get(job_id)["status"] == "queued"
+    assert job_payload_path(restarted, job_id).exists()
+    assert not orphan.exists()
+    assert restarted._claim()["id"] == job_id
+
+
+def test_retention_purge_removes_inputs(tmp_path):
+    queue = make_queue(tmp_path).start()
+    job_id = queue.submit("noop", {}, input=("a.pdf", b"data"))
+    path = job_payload_path(queue, job_id)
+    queue._claim()
+    queue._finish(job_id, "error", error="실패")
+    queue._conn.execute("UPDATE jobs SET finished_at = 0 WHERE id = ?", (job_id,))
+
+    restarted = make_queue(tmp_path).start()
+    assert restarted.get(job_id) is None
+    assert not path.exists()
@@ -0,0 +1,40 @@
+"""
+core.llm_cache의 캐시 키 정규화를 확인합니다.
+실행: python -m pytest -q tests
+"""
+from types import SimpleNamespace
+
+from core.llm_cache import make_key
+
+
+PARAMS = {"temperature": 0.5, "max_tokens": 500}
+
+
+def key(*contents, role="user"):
+    return make_key("gpt-4", PARAMS, [{"role": role, "content": content} for content in contents])
+
+
+def test_outer_whitespace_is_ignored():
+    assert key("  문항을 만들어 주세요.\n\n") == key("문항을 만들어 주세요.")
+
+
+def test_indentation_inside_content_changes_key():
+    flat = "def f():\nreturn 1"
+    indented = "def f():\n    return 1"
+    assert key(flat) != key(indented)
+    assert key("- 항목\n  - 하위 항목") != key("- 항목\n- 하위 항목")
+
+
+def test_langchain_roles_match_openai_roles():
+    human = SimpleNamespace(type="human", content="질문")
+    ai = SimpleNamespace(type="ai", content="답변")
+    assert make_key("gpt-4", PARAMS, [human, ai]) == make_key("gpt-4", PARAMS, [
+        {"role": "user", "content": "질문"},
+        {"role": "assistant", "content": "답변"},
+    ])
+
+
+def test_role_and_params_change_key():
+    assert key("질문") != key("질문", role="system")
+    assert make_key("gpt-4", PARAMS, [{"role": "user", "content": "질문"}]) != \
+        make_key("gpt-4", {**PARAMS, "temperature": 0.2}, [{"role": "user", "content": "질문"}])
@@ -0,0 +1,122 @@
+"""
+core.news_client를 DeepSearch 대체 서버(core.standins.deepsearch)에 연결해 오프라인으로 확인합니다.
+실행: python -m pytest -q tests
+"""
+import time
+
+import pytest
+import requests
+
+from core.llm_cache import LlmCache
+from core.news_client import NewsClient, NewsSearchError
+from core.standins.deepsearch import ARTICLES_PER_KEYWORD, deepsearch_standin, fake_articles
+
+
+WINDOW = ("2026-01-01", "2026-06-30")
+
+
+@pytest.fixture
+def standin():
+    with deepsearch_standin() as server:
+        yield server
+
+
+def make_client(server, **kwargs):
+    kwargs.setdefault("api_key", "standin")
+    kwargs.setdefault("backoff_factor", 0)
+    return NewsClient(base_url=server.base_url, **kwargs)
+
+
+def test_standin_returns_articles_per_keyword(standin):
+    response = requests.get(
+        f"{standin.base_url}/v1/articles", params={"keyword": '"반도체" OR "물류"', "api_key": "k"}, timeout=5
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["data"] == fake_articles("반도체") + fake_articles("물류")
+    assert body["total_items"] == 2 * ARTICLES_PER_KEYWORD
+
+
+def test_standin_is_deterministic():
+    assert fake_articles("반도체") == fake_articles("반도체")
+    assert fake_articles("반도체") != fake_articles("물류")
+
+
+@pytest.mark.parametrize("path, params, status", [
+    ("/v1/articles", {"keyword": '"반도체"'}, 401),
+    ("/v1/unknown", {"api_key": "k"}, 404),
+])
+def test_standin_rejects_bad_requests(standin, path, params, status):
+    assert requests.get(f"{standin.base_url}{path}", params=params, timeout=5).status_code == status
+
+
+def test_search_returns_standin_articles(standin):
+    assert make_client(standin).search(["반도체"], *WINDOW) == fake_articles("반도체")
+
+
+def test_missing_api_key_fails_clearly(standin, monkeypatch):
+    monkeypatch.delenv("DEEPSEARCH_API_KEY", raising=False)
+    with pytest.raises(NewsSearchError, match="DEEPSEARCH_API_KEY"):
+        NewsClient(base_url=standin.base_url)
+
+
+def test_api_key_is_read_from_environment(standin, monkeypatch):
+    monkeypatch.setenv("DEEPSEARCH_API_KEY", "from-env")
+    assert NewsClient(base_url=standin.base_url).api_key == "from-env"
+
+
+def test_cache_key_ignores_keyword_order_and_whitespace():
+    key = NewsClient.cache_key(["반도체", "물류"], *WINDOW)
+    assert NewsClient.cache_key([" 물류", "반도체 "], *WINDOW) == key
+    assert NewsClient.cache_key(["반도체", "물류", "물류"], *WINDOW) == key
+
+
+@pytest.mark.parametrize("keywords, window", [
+    (["반도체"], WINDOW),
+    (["반도체", "물류", "금융"], WINDOW),
+    (["반도체", "물류"], ("2026-01-02", "2026-06-30")),
+    (["반도체", "물류"], ("2026-01-01", "2026-07-01")),
+])
+def test_cache_key_changes_with_keywords_and_window(keywords, window):
+    assert NewsClient.cache_key(keywords, *window) != NewsClient.cache_key(["반도체", "물류"], *WINDOW)
+
+
+def test_cached_search_skips_server(standin, tmp_path):
+    client = make_client(standin, cache=LlmCache(tmp_path / "news.sqlite3"))
+    first = client.search(["반도체", "물류"], *WINDOW)
+    assert client.search(["물류", "반도체"], *WINDOW) == first
+    assert standin.request_count == 1
+
+    client.search(["반도체", "물류"], "2026-02-01", WINDOW[1])
+    client.search(["반도체", "물류"], *WINDOW, bypass_cache=True)
+    assert standin.request_count == 3
+
+
+@pytest.mark.parametrize("failures", [(429,), (500,), (503, 502), (429, 504)])
+def test_retries_rate_limit_and_server_errors(failures):
+    with deepsearch_standin(failures=failures) as server:
+        assert make_client(server).search(["반도체"], *WINDOW) == fake_articles("반도체")
+        assert server.request_count == len(failures) + 1
+
+
+def test_gives_up_after_max_retries():
+    with deepsearch_standin(failures=(503,) * 3) as server:
+        with pytest.raises(NewsSearchError, match="503"):
+            make_client(server, max_retries=2).search(["반도체"], *WINDOW)
+        assert server.request_count == 3
+
+
+def test_backoff_between_retries():
+    # urllib3는 두 번째 재시도부터 backoff_factor * 2^(n-1)초 대기 (0.1 → 0, 0.2초)
+    with deepsearch_standin(failures=(503, 503)) as server:
+        started = time.perf_counter()
+        make_client(server, backoff_factor=0.1).search(["반도체"], *WINDOW)
+        assert time.perf_counter() - started >= 0.2
+
+
+def test_read_timeout_raises_search_error():
+    with deepsearch_standin(latency=1.0) as server:
+        started = time.perf_counter()
+        with pytest.raises(NewsSearchError):
+            make_client(server, timeout=(1.0, 0.1), max_retries=0).search(["반도체"], *WINDOW)
+        assert time.perf_counter() - started < 1.0
@@ -0,0 +1,116 @@
+"""
+core.pdf_cache의 저장/조회, 캐시 키, 용량 기준 삭제를 확인합니다.
+실행: python -m pytest -q tests
+"""
+import gzip
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from core.pdf_cache import PdfCache, make_cache_key
+
+
+CHUNKS = [
+    {"page_content": "생성형 AI 도입 사례", "metadata": {"page": 0, "source": "lecture.pdf"}},
+    {"page_content": "데이터 전처리 절차", "metadata": {"page": 1, "source": "lecture.pdf"}},
+]
+CHUNK_KEYWORDS = [["생성형", "AI"], ["데이터", "전처리"]]
+DOCUMENT_KEYWORDS = [("데이터", 0.8), ("AI", 0.5)]
+
+
+def put_entry(cache, key, size=0):
+    # size만큼 임의 텍스트를 붙여 압축 후 크기를 키움
+    chunks = [{**CHUNKS[0], "page_content": os.urandom(size).hex()}] if size else CHUNKS
+    cache.put(key, chunks, CHUNK_KEYWORDS[:len(chunks)], DOCUMENT_KEYWORDS)
+
+
+def test_round_trip(tmp_path):
+    cache = PdfCache(tmp_path)
+    cache.put("key", CHUNKS, CHUNK_KEYWORDS, DOCUMENT_KEYWORDS)
+
+    assert cache.get("key") == {
+        "chunks": CHUNKS,
+        "chunk_keywords": CHUNK_KEYWORDS,
+        "document_keywords": DOCUMENT_KEYWORDS,
+    }
+
+
+def test_entry_is_gzip_json_lines(tmp_path):
+    PdfCache(tmp_path).put("key", CHUNKS, CHUNK_KEYWORDS, DOCUMENT_KEYWORDS)
+    with gzip.open(tmp_path / "key.jsonl.gz", "rt", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert len(lines) == len(CHUNKS) + 1
+    assert "생성형 AI 도입 사례" in lines[0]
+
+
+def test_accepts_langchain_documents(tmp_path):
+    cache = PdfCache(tmp_path)
+    documents = [SimpleNamespace(**chunk) for chunk in CHUNKS]
+    cache.put("key", documents, CHUNK_KEYWORDS, DOCUMENT_KEYWORDS)
+    assert cache.get("key")["chunks"] == CHUNKS
+
+
+def test_missing_and_corrupt_entries_are_misses(tmp_path):
+    cache = PdfCache(tmp_path)
+    assert cache.get("missing") is None
+
+    (tmp_path / "broken.jsonl.gz").write_bytes(b"not gzip")
+    assert cache.get("broken") is None
+    assert not (tmp_path / "broken.jsonl.gz").exists()
+
+
+def test_aborted_writer_leaves_no_entry(tmp_path):
+    cache = PdfCache(tmp_path)
+    writer = cache.open_writer("key")
+    writer.add_chunk(CHUNKS[0], CHUNK_KEYWORDS[0])
+    assert cache.get("key") is None
+    writer.abort()
+    assert cache.get("key") is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cache_key_depends_on_content_and_settings():
+    key = make_cache_key(b"pdf", chunk_size=350, pipeline="ko_core_news_sm")
+    assert make_cache_key(b"pdf", pipeline="ko_core_news_sm", chunk_size=350) == key
+    assert make_cache_key(b"pdf2", chunk_size=350, pipeline="ko_core_news_sm") != key
+
+
+@pytest.mark.parametrize("settings", [
+    {"chunk_size": 500, "pipeline": "ko_core_news_sm"},
+    {"chunk_size": 350, "pipeline": "ko_core_news_lg"},
+    {"chunk_size": 350},
+])
+def test_cache_key_changes_with_chunk_size_and_pipeline(settings):
+    assert make_cache_key(b"pdf", **settings) != make_cache_key(b"pdf", chunk_size=350, pipeline="ko_core_news_sm")
+
+
+def test_evicts_least_recently_used_over_max_bytes(tmp_path):
+    cache = PdfCache(tmp_path, max_bytes=10**9)
+    for key in ("old", "used", "new"):
+        put_entry(cache, key, size=2000)
+    sizes = {path.name: path.stat().st_size for path in tmp_path.glob("*.jsonl.gz")}
+
+    # "used"를 가장 오래된 항목으로 둔 뒤 읽어서 가장 최근에 사용한 항목으로 만듦
+    now = time.time()
+    for offset, key in enumerate(("used", "old", "new")):
+        os.utime(tmp_path / f"{key}.jsonl.gz", (now - 100 + offset, now - 100 + offset))
+    assert cache.get("used") is not None
+
+    cache.max_bytes = sizes["new.jsonl.gz"] + sizes["used.jsonl.gz"]
+    cache.evict()
+    assert cache.get("old") is None
+    assert cache.get("used") is not None
+    assert cache.get("new") is not None
+
+
+def test_commit_evicts_to_stay_under_max_bytes(tmp_path):
+    cache = PdfCache(tmp_path, max_bytes=10**9)
+    put_entry(cache, "first", size=2000)
+    cache.max_bytes = (tmp_path / "first.jsonl.gz").stat().st_size + 100
+    os.utime(tmp_path / "first.jsonl.gz", (time.time() - 100, time.time() - 100))
+
+    put_entry(cache, "second", size=2000)
+    assert cache.get("first") is None
+    assert cache.get("second") is not None
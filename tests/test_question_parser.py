@@ -0,0 +1,52 @@
+"""
+core.question_parser의 구역 분리와 스트리밍 완료 감지를 확인합니다.
+실행: python -m pytest -q tests
+"""
+import pytest
+
+from core.question_parser import StreamingQuestionParser
+
+
+QUESTION = (
+    "[질문]\n팀은 보고서 작성에 생성형 AI를 활용하려고 한다.\n가장 적절한 조치는 무엇인가?\n"
+    "[선지]\n선지 1) 가\n선지 2) 나\n선지 3) 다\n선지 4) 라\n\n"
+    "[정답 및 해설]\n정답) 2\n해설) 출처를 확인해야 한다."
+)
+
+MULTI_PARAGRAPH = QUESTION + "\n\n선지 1은 검증 없이 사용한다.\n\n따라서 정답은 2번입니다."
+
+INLINE_OUTPUT = QUESTION + " 함수의 Output: 값은 입력 길이와 같다."
+
+
+def feed_tokens(text, size=3):
+    parser = StreamingQuestionParser()
+    ends = []
+    for i in range(0, len(text), size):
+        parser.feed(text[i:i + size])
+        ends.append(parser.end())
+    return parser, ends
+
+
+@pytest.mark.parametrize("question", [QUESTION, MULTI_PARAGRAPH, INLINE_OUTPUT])
+def test_end_waits_without_trailing_marker(question):
+    parser, ends = feed_tokens(question)
+    assert ends == [None] * len(ends)
+    assert parser.sections()["explanation"].endswith(question.split("해설) ")[1].strip())
+
+
+@pytest.mark.parametrize("trailing", [
+    "\n\nInput: 다른 문항을 만들어 주세요.\nOutput: [질문]\n",
+    "\nOutput: [질문]\n",
+    "\n\n[질문]\n다음 상황을 읽고 물음에 답하시오.",
+])
+@pytest.mark.parametrize("question", [QUESTION, MULTI_PARAGRAPH])
+def test_end_at_trailing_marker(question, trailing):
+    parser, ends = feed_tokens(question + trailing)
+    assert ends[-1] == len(question)
+    assert parser.text[:ends[-1]] == question
+
+
+def test_end_waits_for_explanation_content():
+    parser = StreamingQuestionParser()
+    parser.feed(QUESTION.split("해설)")[0] + "해설)\n\n[질문]")
+    assert parser.end() is None
@@ -0,0 +1,126 @@
+"""
+core.question_store의 스키마 마이그레이션과 이전 CSV 가져오기를 확인합니다.
+실행: python -m pytest -q tests
+"""
+import csv
+import sqlite3
+
+import pytest
+
+from core.question_store import SCHEMA_VERSION, QuestionStore
+
+
+P4_1_1_RAW = (
+    "[질문]\n팀은 보고서 작성에 생성형 AI를 활용하려고 한다.\n"
+    "[선지]\n선지 1) 가\n선지 2) 나\n선지 3) 다\n선지 4) 라\n"
+    "[정답 및 해설]\n정답) 2\n해설) 출처를 확인해야 한다."
+)
+ACCEPTED_ROW = ["질문 A", "선지 1) 가\n선지 2) 나", "2", "해설 A", "검수자1"]
+DISCARDED_ROW = ["질문 B", "선지 1) 가", "1", "해설 B", "정답 오류", "정답이 둘", "검수자2"]
+
+
+def write_csv(path, rows):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        csv.writer(f).writerows(rows)
+    return path
+
+
+def test_new_store_migrates_from_empty_database(tmp_path):
+    path = tmp_path / "questions.sqlite3"
+    # 아무 테이블도 없는 기준 DB (user_version 0)
+    sqlite3.connect(path).close()
+
+    store = QuestionStore(path)
+    assert store.schema_version == SCHEMA_VERSION
+    tables = {row[0] for row in store._conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert {"questions", "imports"} <= tables
+
+
+def test_reopening_keeps_data_and_version(tmp_path):
+    path = tmp_path / "questions.sqlite3"
+    QuestionStore(path).save({"page": "P4-3-1", "question": "질문"})
+
+    store = QuestionStore(path)
+    assert store.schema_version == SCHEMA_VERSION
+    assert [row["question"] for row in store.query()] == ["질문"]
+
+
+def test_newer_schema_is_rejected(tmp_path):
+    path = tmp_path / "questions.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+    conn.close()
+
+    with pytest.raises(RuntimeError):
+        QuestionStore(path)
+
+
+def test_import_one_column_p4_1_1(tmp_path):
+    store = QuestionStore(tmp_path / "questions.sqlite3")
+    result = store.import_csv(write_csv(tmp_path / "generated_questions.csv", [[P4_1_1_RAW]]))
+
+    assert result == {"imported": 1, "skipped": 0, "already_imported": False}
+    [row] = store.query()
+    assert row["page"] == "P4-1-1"
+    assert row["status"] == "accepted"
+    assert row["raw"] == P4_1_1_RAW
+    assert row["question"].startswith("팀은 보고서 작성에")
+    assert row["answer"] == "2"
+    assert row["source"] == "csv:generated_questions.csv"
+
+
+def test_import_unparsed_one_column_keeps_text_as_question(tmp_path):
+    store = QuestionStore(tmp_path / "questions.sqlite3")
+    store.import_csv(write_csv(tmp_path / "generated_questions.csv", [["형식 없는 문항"]]))
+    assert store.query()[0]["question"] == "형식 없는 문항"
+
+
+def test_import_five_column_accepted(tmp_path):
+    store = QuestionStore(tmp_path / "questions.sqlite3")
+    store.import_csv(write_csv(tmp_path / "generated_questions.csv", [ACCEPTED_ROW]))
+
+    [row] = store.query()
+    assert (row["status"], row["page"], row["reviewer"]) == ("accepted", "P4-3-1", "검수자1")
+    assert [row[column] for column in ("question", "options", "answer", "explanation")] == ACCEPTED_ROW[:4]
+
+
+def test_import_seven_column_discarded(tmp_path):
+    store = QuestionStore(tmp_path / "questions.sqlite3")
+    store.import_csv(write_csv(tmp_path / "discarded_questions.csv", [DISCARDED_ROW]))
+
+    [row] = store.query()
+    assert (row["status"], row["page"]) == ("discarded", "P4-3-1")
+    assert (row["discard_reason"], row["discard_note"], row["reviewer"]) == ("정답 오류", "정답이 둘", "검수자2")
+
+
+@pytest.mark.parametrize("bad_row", [["a", "b"], ["a", "b", "c"], ["a"] * 4, ["a"] * 6, ["a"] * 8])
+def test_import_skips_malformed_rows(tmp_path, bad_row):
+    store = QuestionStore(tmp_path / "questions.sqlite3")
+    result = store.import_csv(write_csv(tmp_path / "mixed.csv", [ACCEPTED_ROW, bad_row, DISCARDED_ROW]))
+
+    assert result == {"imported": 2, "skipped": 1, "already_imported": False}
+    assert store.count() == 2
+
+
+def test_import_same_file_only_once(tmp_path):
+    store = QuestionStore(tmp_path / "questions.sqlite3")
+    path = write_csv(tmp_path / "generated_questions.csv", [ACCEPTED_ROW])
+    store.import_csv(path)
+
+    assert store.import_csv(path) == {"imported": 0, "skipped": 0, "already_imported": True}
+    assert store.count() == 1
+
+
+def test_unknown_status_is_rejected(tmp_path):
+    store = QuestionStore(tmp_path / "questions.sqlite3")
+    with pytest.raises(ValueError):
+        store.save({"status": "pending", "question": "질문"})
+    with pytest.raises(ValueError):
+        store.save_many([{"question": "질문"}, {"status": "pending"}])
+    assert store.count() == 0
+
+
+def test_filter_on_unknown_column_is_rejected(tmp_path):
+    store = QuestionStore(tmp_path / "questions.sqlite3")
+    with pytest.raises(ValueError):
+        store.query(question="질문")
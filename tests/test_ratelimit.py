@@ -0,0 +1,60 @@
+"""
+core.ratelimit의 비동기 호출이 취소되어도 허가를 반납하는지 확인합니다.
+"""
+import asyncio
+
+from core.ratelimit import RateLimiter, acall_with_limit, rate_limiter
+from core.registry import registry
+
+
+def use_limiter(model, concurrency):
+    # 등록된 이름은 다시 등록되지 않으므로 테스트마다 다른 모델 이름을 사용
+    limiter = RateLimiter(100000, 100000000, concurrency=concurrency, max_concurrency=concurrency)
+    registry.register(f"rate_limiter:{model}", lambda: limiter)
+    assert rate_limiter(model) is limiter
+    return limiter
+
+
+async def wait_until(condition):
+    for _ in range(200):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("조건을 만족하지 않았습니다.")
+
+
+def test_cancel_while_waiting_returns_permit():
+    model = "test-cancel-while-waiting"
+    limiter = use_limiter(model, 1)
+
+    async def scenario():
+        held = limiter.acquire(10)
+        task = asyncio.create_task(acall_with_limit(model, 10, asyncio.sleep))
+        await wait_until(lambda: limiter.stats()["queued"] == 1)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        # 작업 스레드가 허가를 받은 뒤 바로 반납해야 함
+        held.release()
+        await wait_until(lambda: limiter.stats()["in_flight"] == 0)
+
+    asyncio.run(scenario())
+    limiter.acquire(10, timeout=1).release()
+
+
+def test_cancel_during_call_returns_permit():
+    model = "test-cancel-during-call"
+    limiter = use_limiter(model, 1)
+    started = []
+
+    async def call():
+        started.append(True)
+        await asyncio.sleep(10)
+
+    async def scenario():
+        task = asyncio.create_task(acall_with_limit(model, 10, call))
+        await wait_until(lambda: started)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(scenario())
+    assert limiter.stats()["in_flight"] == 0
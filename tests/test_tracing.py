@@ -0,0 +1,61 @@
+"""
+core.tracing의 구간 부모 관계와 스트림 구간 기록을 확인합니다.
+실행: python -m pytest -q tests
+"""
+import pytest
+
+from core import llm, tracing
+
+
+@pytest.fixture
+def records(monkeypatch):
+    captured = []
+    monkeypatch.setattr(tracing, "_trace_logger", lambda: None)
+    tracing.add_exporter(captured.append)
+    yield captured
+    tracing.remove_exporter(captured.append)
+
+
+def fake_stream(self):
+    for chunk in ("[질문]\n", "본문"):
+        self.text += chunk
+        yield chunk
+
+
+def test_nested_span_is_child(records):
+    with tracing.span("outer"):
+        with tracing.span("inner"):
+            pass
+    inner, outer = records
+    assert inner["parent_id"] == outer["span_id"]
+    assert inner["trace_id"] == outer["trace_id"]
+
+
+def test_spans_opened_while_consuming_stream_are_not_children(monkeypatch, records):
+    monkeypatch.setattr(llm.ChatStream, "_stream", fake_stream)
+    stream = llm.ChatStream("gpt-4", [{"role": "user", "content": "문항"}])
+    with tracing.span("page"):
+        for _ in stream:
+            with tracing.span("parse"):
+                pass
+
+    by_name = {}
+    for record in records:
+        by_name.setdefault(record["name"], []).append(record)
+    [page], [llm_stream] = by_name["page"], by_name["llm.stream"]
+    assert llm_stream["parent_id"] == page["span_id"]
+    assert llm_stream["completion_tokens"] == stream.completion_tokens
+    assert [record["parent_id"] for record in by_name["parse"]] == [page["span_id"]] * 2
+
+
+def test_stream_error_is_recorded(monkeypatch, records):
+    def broken(self):
+        yield "조각"
+        raise RuntimeError("끊김")
+
+    monkeypatch.setattr(llm.ChatStream, "_stream", broken)
+    with pytest.raises(RuntimeError):
+        list(llm.ChatStream("gpt-4", [{"role": "user", "content": "문항"}]))
+    [record] = records
+    assert record["status"] == "error"
+    assert "끊김" in record["error"]